@@ -5,13 +5,14 @@ Compares two pose execution sessions using DTW-based analysis.
 
 from fastapi import APIRouter, HTTPException, Query
 import numpy as np
-from typing import Optional
+from typing import List, Optional
 
-from app.schemas.compare import CompareRequest, CompareResponse
+from app.schemas.compare import CompareRequest, CompareResponse, RankRequest, RankResponse, RankedSession
 from app.db.storage import get_storage
-from app.core.embedding import sequence_to_feature_matrix, temporal_smoothing
+from app.db.feature_cache import get_feature_cache
 from app.core.metrics import (
     run_dtw,
+    rank_by_dtw,
     compute_time_deviation,
     per_joint_deviation,
     detect_stressed_joints,
@@ -23,6 +24,41 @@ from app.core.config import get_dtw_config, DTWPresets
 router = APIRouter()
 
 
+def _session_frames(session: dict) -> List[dict]:
+    """
+    Build DTW frame structures for a session.
+    
+    Uses the recorded per-frame source timestamps when available (required
+    when frames were subsampled), otherwise spreads frames evenly over
+    the session duration.
+    """
+    keypoints = session["keypoints"]
+    timestamps = session.get("frame_timestamps")
+    if timestamps and len(timestamps) == len(keypoints):
+        return [
+            {"keypoints": kp, "time_sec": t}
+            for kp, t in zip(keypoints, timestamps)
+        ]
+    duration = session["duration_seconds"]
+    return [
+        {"keypoints": kp, "time_sec": (i / len(keypoints)) * duration}
+        for i, kp in enumerate(keypoints)
+    ]
+
+
+def resolve_dtw_config(preset: Optional[str]):
+    """DTW config of a named preset, or the global config."""
+    if preset:
+        preset_map = {
+            "precise": DTWPresets.precise(),
+            "balanced": DTWPresets.balanced(),
+            "fast": DTWPresets.fast(),
+            "long_sequences": DTWPresets.long_sequences()
+        }
+        return preset_map.get(preset, get_dtw_config())
+    return get_dtw_config()
+
+
 @router.post("/compare", response_model=CompareResponse)
 async def compare_sessions(
     request: CompareRequest,
@@ -45,16 +81,7 @@ async def compare_sessions(
         CompareResponse with detailed comparison metrics
     """
     # Load configuration
-    if preset:
-        preset_map = {
-            "precise": DTWPresets.precise(),
-            "balanced": DTWPresets.balanced(),
-            "fast": DTWPresets.fast(),
-            "long_sequences": DTWPresets.long_sequences()
-        }
-        config = preset_map.get(preset, get_dtw_config())
-    else:
-        config = get_dtw_config()
+    config = resolve_dtw_config(preset)
     
     storage = get_storage()
     
@@ -74,29 +101,17 @@ async def compare_sessions(
             detail=f"User session not found: {request.session_id_user}"
         )
     
-    # Extract keypoints and prepare frame structures
-    ref_keypoints = ref_session["keypoints"]
-    user_keypoints = user_session["keypoints"]
     ref_duration = ref_session["duration_seconds"]
     user_duration = user_session["duration_seconds"]
     
     # Convert keypoints to frame format for DTW
-    frames_ref = [
-        {"keypoints": kp, "time_sec": (i / len(ref_keypoints)) * ref_duration}
-        for i, kp in enumerate(ref_keypoints)
-    ]
-    frames_user = [
-        {"keypoints": kp, "time_sec": (i / len(user_keypoints)) * user_duration}
-        for i, kp in enumerate(user_keypoints)
-    ]
+    frames_ref = _session_frames(ref_session)
+    frames_user = _session_frames(user_session)
     
-    # Convert to feature matrices (with sampling)
-    X_ref = sequence_to_feature_matrix(frames_ref, sample_rate=config.frame_sample_rate)
-    X_user = sequence_to_feature_matrix(frames_user, sample_rate=config.frame_sample_rate)
-    
-    # Apply temporal smoothing
-    X_ref_smooth = temporal_smoothing(X_ref, window=config.smoothing_window)
-    X_user_smooth = temporal_smoothing(X_user, window=config.smoothing_window)
+    # Sampled, smoothed feature matrices (computed once per session and config)
+    feature_cache = get_feature_cache()
+    X_ref_smooth = feature_cache.get_features(ref_session, config.frame_sample_rate, config.smoothing_window)
+    X_user_smooth = feature_cache.get_features(user_session, config.frame_sample_rate, config.smoothing_window)
     
     # Run DTW alignment with config
     window_size = config.get_window_size(max(X_ref_smooth.shape[0], X_user_smooth.shape[0]))
@@ -104,7 +119,10 @@ async def compare_sessions(
         X_ref_smooth, 
         X_user_smooth, 
         window=window_size,
-        use_fastdtw=config.use_fastdtw
+        use_fastdtw=config.use_fastdtw,
+        fastdtw_threshold=config.fastdtw_threshold,
+        fastdtw_radius=config.fastdtw_radius,
+        banded_cost=True  # Only the path is used
     )
     similarity_score = dtw_result["similarity"]
     
@@ -137,3 +155,64 @@ async def compare_sessions(
         stressed_joints=stressed_joints,
         recommended_improvements=recommendations
     )
+
+
+@router.post("/compare/rank", response_model=RankResponse)
+def rank_sessions(
+    request: RankRequest,
+    preset: Optional[str] = Query(None, description="DTW preset: 'precise', 'balanced', 'fast', or 'long_sequences'")
+):
+    """
+    Rank candidate sessions by DTW similarity to a reference session.
+    
+    Only distances are computed (no warping path or per-joint analysis),
+    and candidates that can no longer make the top_k / min_similarity cut
+    are abandoned early, so many candidates can be ranked per request.
+    A plain def: FastAPI runs it in its threadpool, so the CPU-bound
+    ranking does not block the event loop.
+    
+    Args:
+        request: RankRequest with reference and candidate session IDs
+        
+    Returns:
+        RankResponse with candidates ordered by similarity
+    """
+    config = resolve_dtw_config(preset)
+    storage = get_storage()
+    feature_cache = get_feature_cache()
+    
+    ref_session = storage.get_session(request.session_id_reference)
+    if ref_session is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Reference session not found: {request.session_id_reference}"
+        )
+    X_ref = feature_cache.get_features(ref_session, config.frame_sample_rate, config.smoothing_window)
+    
+    candidates = {}
+    for session_id in dict.fromkeys(request.candidate_session_ids):
+        session = storage.get_session(session_id)
+        if session is None:
+            raise HTTPException(status_code=404, detail=f"Candidate session not found: {session_id}")
+        candidates[session_id] = feature_cache.get_features(session, config.frame_sample_rate, config.smoothing_window)
+    
+    ranked, abandoned = rank_by_dtw(
+        X_ref,
+        candidates,
+        top_k=request.top_k,
+        min_similarity=request.min_similarity,
+        window_for_length=config.get_window_size
+    )
+    
+    return RankResponse(
+        results=[
+            RankedSession(
+                session_id=result["candidate_id"],
+                similarity_score=result["similarity"],
+                normalized_distance=result["normalized_distance"]
+            )
+            for result in ranked
+        ],
+        evaluated=len(candidates),
+        abandoned=abandoned
+    )
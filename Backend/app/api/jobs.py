@@ -0,0 +1,213 @@
+"""
+Processing Job API Endpoints
+Asynchronous video processing: submit an upload, then poll or stream progress.
+"""
+
+from fastapi import APIRouter, UploadFile, File, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from typing import Optional
+import asyncio
+import json
+import os
+
+from app.schemas.job import JobStatusResponse
+from app.core.extraction_service import get_extraction_service, ExtractionBusyError
+from app.core.config import VideoProcessingConfig
+from app.core.jobs import Job, get_job_manager
+from app.api.process_video import (
+    validate_video_filename,
+    resolve_extraction_config,
+    save_upload,
+    lookup_cached_session,
+    create_session_from_extraction
+)
+
+
+router = APIRouter()
+
+
+# Interval between Server-Sent Events progress checks (seconds)
+EVENT_POLL_INTERVAL = 0.5
+
+# Keeps running job tasks referenced until they finish
+_running_tasks = set()
+
+
+def _job_status(job: Job) -> JobStatusResponse:
+    return JobStatusResponse(
+        job_id=job.job_id,
+        status=job.status,
+        filename=job.filename,
+        frames_processed=job.frames_processed,
+        total_frames=job.total_frames,
+        progress=job.progress,
+        result=job.result,
+        error=job.error
+    )
+
+
+async def _run_job(
+    job: Job,
+    future: "asyncio.Future",
+    video_path: str,
+    content_hash: str,
+    config: VideoProcessingConfig
+) -> None:
+    """Wait for extraction, then persist the session and record the result."""
+    try:
+        extraction = await future
+        # Embedding, JSON dump and vector DB insert would otherwise block the loop
+        response = await run_in_threadpool(
+            create_session_from_extraction,
+            extraction, video_path, job.filename, content_hash, config
+        )
+        job.update_progress(len(extraction.keypoints), len(extraction.keypoints))
+        job.complete(response.model_dump())
+    except HTTPException as e:
+        job.fail(str(e.detail))
+    except Exception as e:
+        if os.path.exists(video_path):
+            os.remove(video_path)
+        job.fail(f"Error processing video: {str(e)}")
+
+
+@router.post("/jobs", response_model=JobStatusResponse, status_code=202)
+async def submit_job(
+    video: UploadFile = File(..., description="Video file to process"),
+    model_variant: Optional[str] = Query(None, description="MoveNet variant: 'thunder' or 'lightning'"),
+    preset: Optional[str] = Query(None, description="DTW preset whose paired variant to use (e.g. 'fast' = Lightning)")
+):
+    """
+    Submit a video for asynchronous processing.
+    
+    Returns immediately with a job ID once the upload is stored. Poll
+    GET /api/jobs/{job_id} or stream GET /api/jobs/{job_id}/events for
+    progress; the completed job carries the same ProcessVideoResponse
+    as POST /api/process-video.
+    
+    Args:
+        video: Uploaded video file
+        model_variant: MoveNet variant override for this upload
+        preset: DTW preset name, selects its paired variant when model_variant is unset
+        
+    Returns:
+        JobStatusResponse for the queued job
+    """
+    validate_video_filename(video.filename)
+    config = resolve_extraction_config(model_variant, preset)
+    
+    try:
+        video_path, content_hash = await save_upload(video)
+    finally:
+        await video.close()
+    
+    return await start_job(video_path, video.filename, content_hash, config)
+
+
+async def start_job(
+    video_path: str,
+    filename: str,
+    content_hash: str,
+    config: VideoProcessingConfig
+) -> JobStatusResponse:
+    """
+    Create a job for a saved video and queue its extraction.
+    
+    Args:
+        video_path: Path of the stored video (removed if the job cannot start)
+        filename: Original upload filename
+        content_hash: SHA-256 hex digest of the video
+        config: Extraction config of the request
+        
+    Returns:
+        JobStatusResponse for the queued (or already completed) job
+    """
+    job = get_job_manager().create(filename)
+    
+    # Duplicate upload: the job is complete immediately
+    cached = await run_in_threadpool(lookup_cached_session, content_hash, config)
+    if cached is not None:
+        os.remove(video_path)
+        job.update_progress(len(cached.keypoints), len(cached.keypoints))
+        job.complete(cached.model_dump())
+        return _job_status(job)
+    
+    try:
+        future = get_extraction_service().submit(
+            video_path,
+            job_id=job.job_id,
+            on_progress=job.update_progress,
+            variant=config.model_variant
+        )
+    except ExtractionBusyError as e:
+        # Not admitted: don't leave a failed job behind for clients to find
+        os.remove(video_path)
+        get_job_manager().remove(job.job_id)
+        raise HTTPException(status_code=503, detail=str(e))
+    
+    task = asyncio.create_task(_run_job(job, future, video_path, content_hash, config))
+    _running_tasks.add(task)
+    task.add_done_callback(_running_tasks.discard)
+    
+    return _job_status(job)
+
+
+@router.get("/jobs/{job_id}", response_model=JobStatusResponse)
+async def get_job(job_id: str):
+    """
+    Get status and progress of a processing job.
+    
+    Args:
+        job_id: Job identifier returned by POST /api/jobs
+        
+    Returns:
+        JobStatusResponse (includes the result once completed)
+    """
+    job = get_job_manager().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    return _job_status(job)
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_job_events(job_id: str):
+    """
+    Stream job progress as Server-Sent Events.
+    
+    Emits a `progress` event whenever the processed frame count or status
+    changes, then a final `completed` or `failed` event with the full job
+    status (including the result) and closes the stream.
+    
+    Args:
+        job_id: Job identifier returned by POST /api/jobs
+    """
+    job = get_job_manager().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    
+    async def events():
+        last = None
+        while True:
+            state = (job.status, job.frames_processed, job.total_frames)
+            if job.finished:
+                payload = _job_status(job).model_dump_json()
+                yield f"event: {job.status}\ndata: {payload}\n\n"
+                return
+            if state != last:
+                last = state
+                payload = json.dumps({
+                    "job_id": job.job_id,
+                    "status": job.status,
+                    "frames_processed": job.frames_processed,
+                    "total_frames": job.total_frames,
+                    "progress": job.progress
+                })
+                yield f"event: progress\ndata: {payload}\n\n"
+            await asyncio.sleep(EVENT_POLL_INTERVAL)
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -0,0 +1,171 @@
+"""
+Live Ingestion WebSocket Endpoint
+Streams encoded frames from a station camera through the pose model and
+sends keypoints back per frame; the sequence is saved as a session on close.
+"""
+
+from fastapi import APIRouter, HTTPException, Query, WebSocket
+from fastapi.concurrency import run_in_threadpool
+from starlette.websockets import WebSocketState
+from typing import Optional
+import asyncio
+import time
+
+from app.core.config import VideoProcessingConfig, get_dtw_config
+from app.core.live import LiveIngestSession, get_live_executor, load_live_model
+from app.core.online_dtw import OnlineDTW
+from app.db.storage import get_storage
+from app.db.feature_cache import get_feature_cache
+from app.api.process_video import resolve_extraction_config, create_session_from_extraction
+
+
+router = APIRouter()
+
+
+async def _receive_frames(websocket: WebSocket, live: LiveIngestSession) -> None:
+    """Feed incoming frames into the session until the client ends or disconnects."""
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            if message.get("bytes") is not None:
+                live.offer(message["bytes"])
+            elif message.get("text", "").strip().lower() == "end":
+                break
+    finally:
+        live.close()
+
+
+async def _send(websocket: WebSocket, payload: dict) -> None:
+    """Send a JSON message, ignoring a client that already went away."""
+    if websocket.application_state != WebSocketState.CONNECTED:
+        return
+    try:
+        await websocket.send_json(payload)
+    except Exception:
+        pass
+
+
+async def _finish_stream(
+    websocket: WebSocket,
+    live: LiveIngestSession,
+    config: VideoProcessingConfig,
+    wall_seconds: float
+) -> None:
+    """Save the accumulated sequence as a session, report it and close the socket."""
+    summary = {"frames": len(live.keypoints), "received": live.received, "dropped": live.dropped}
+    print(f"Live stream ended: {summary['frames']} frames inferred, {summary['dropped']} dropped")
+
+    if live.keypoints:
+        try:
+            # Normalizing, embedding and persisting would otherwise block the loop
+            extraction = await run_in_threadpool(live.to_extraction, wall_seconds)
+            response = await run_in_threadpool(
+                create_session_from_extraction,
+                extraction, video_path=None, filename="live_stream", config=config
+            )
+            await _send(websocket, {"type": "session", "session_id": response.session_id, **summary})
+        except Exception as e:
+            print(f"✗ Failed to save live session: {e}")
+            await _send(websocket, {"type": "error", "detail": f"Error saving session: {str(e)}"})
+    else:
+        await _send(websocket, {"type": "session", "session_id": None, **summary})
+
+    if websocket.application_state == WebSocketState.CONNECTED:
+        await websocket.close()
+
+
+@router.websocket("/live")
+async def live_ingest(
+    websocket: WebSocket,
+    model_variant: Optional[str] = Query(None, description="MoveNet variant: 'thunder' or 'lightning'"),
+    preset: Optional[str] = Query(None, description="DTW preset whose paired variant to use"),
+    reference_session_id: Optional[str] = Query(None, description="Session to score the stream against live")
+):
+    """
+    Live pose ingestion over WebSocket.
+
+    Protocol:
+    - Client sends each camera frame as a binary message (JPEG / PNG / WebP)
+    - Server replies per processed frame with
+      {"type": "keypoints", "frame", "timestamp", "keypoints", "latency_ms", "dropped"}
+    - When inference falls behind, only the newest waiting frame is kept
+      (older ones are dropped and counted in "dropped")
+    - With reference_session_id, each keypoints message also carries an
+      "alignment" (online DTW): current reference frame, progress, running
+      similarity and a deviation flag
+    - Client sends the text message "end" to finish; the server replies
+      {"type": "session", "session_id", ...} and closes. A disconnect also
+      saves the session.
+
+    Args:
+        websocket: Client connection
+        model_variant: MoveNet variant override for this stream
+        preset: DTW preset name, selects its paired variant when model_variant is unset
+        reference_session_id: Reference session for live scoring
+    """
+    try:
+        config = resolve_extraction_config(model_variant, preset)
+    except HTTPException as e:
+        await websocket.close(code=1008, reason=str(e.detail))
+        return
+
+    aligner = None
+    if reference_session_id:
+        reference = await run_in_threadpool(get_storage().get_session, reference_session_id)
+        if reference is None or not reference["keypoints"]:
+            await websocket.close(code=1008, reason=f"Reference session not found: {reference_session_id}")
+            return
+        dtw_config = get_dtw_config()
+        aligner = OnlineDTW(
+            await run_in_threadpool(get_feature_cache().get_features, reference),
+            window=dtw_config.online_window,
+            deviation_threshold=dtw_config.online_deviation_threshold
+        )
+
+    await websocket.accept()
+    connected_at = time.perf_counter()
+    loop = asyncio.get_running_loop()
+    executor = get_live_executor()
+
+    # Warmed up at startup; variants outside warm_variants load on first use
+    try:
+        model = await loop.run_in_executor(executor, load_live_model, config.get_model_variant())
+    except Exception as e:
+        print(f"✗ Failed to load live pose model: {e}")
+        await _send(websocket, {"type": "error", "detail": f"Error loading pose model: {str(e)}"})
+        await websocket.close(code=1011)
+        return
+
+    live = LiveIngestSession(model, config, aligner)
+    receiver = asyncio.create_task(_receive_frames(websocket, live))
+
+    try:
+        while True:
+            pending = await live.next_frame()
+            if pending is None:
+                break
+            data, timestamp, received_at = pending
+            keypoints = await loop.run_in_executor(executor, live.process, data, timestamp)
+            if keypoints is None:
+                await _send(websocket, {"type": "error", "detail": "Could not decode frame"})
+                continue
+            message = {
+                "type": "keypoints",
+                "frame": len(live.keypoints) - 1,
+                "timestamp": round(timestamp, 4),
+                "keypoints": keypoints.tolist(),
+                "latency_ms": round((time.perf_counter() - received_at) * 1000, 1),
+                "dropped": live.dropped
+            }
+            if live.alignment is not None:
+                message["alignment"] = live.alignment.as_dict()
+            await _send(websocket, message)
+    except Exception as e:
+        print(f"✗ Live stream failed: {e}")
+        await _send(websocket, {"type": "error", "detail": f"Error processing frame: {str(e)}"})
+    finally:
+        receiver.cancel()
+        # Frames inferred so far are saved however the stream ended
+        await _finish_stream(websocket, live, config, time.perf_counter() - connected_at)
@@ -3,16 +3,23 @@ Process Video API Endpoint
 Handles video upload, pose extraction, and embedding generation.
 """
 
-from fastapi import APIRouter, UploadFile, File, HTTPException
+from fastapi import APIRouter, UploadFile, File, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
 from datetime import datetime
+from typing import Optional, Tuple
+import hashlib
 import os
-import shutil
+import uuid
+
+import aiofiles
 
 from app.schemas.pose import ProcessVideoResponse
-from app.core.pose_model import extract_keypoints
+from app.core.config import VideoProcessingConfig, get_video_config, get_preset_model_variant
+from app.core.extraction_service import get_extraction_service, ExtractionBusyError
 from app.core.embedding import sequence_to_embedding
 from app.db.storage import get_storage
 from app.db.vector_db import get_vector_db
+from app.db.keypoint_cache import get_keypoint_cache
 
 
 router = APIRouter()
@@ -21,96 +28,294 @@ router = APIRouter()
 UPLOAD_DIR = "./uploads"
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
+ALLOWED_EXTENSIONS = ['.mp4', '.avi', '.mov', '.mkv', '.webm']
+
+
+def validate_video_filename(filename: str) -> None:
+    """Raise HTTP 400 if the file extension is not a supported video type."""
+    file_ext = os.path.splitext(filename)[1].lower()
+    
+    if file_ext not in ALLOWED_EXTENSIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid file type. Allowed: {', '.join(ALLOWED_EXTENSIONS)}"
+        )
+
+
+def resolve_extraction_config(
+    model_variant: Optional[str] = None,
+    preset: Optional[str] = None
+) -> VideoProcessingConfig:
+    """
+    Extraction config for a request's model variant choice.
+    
+    An explicit model_variant wins; otherwise a DTW preset selects its
+    paired variant (e.g. "fast" runs Lightning); otherwise the configured
+    variant is used.
+    
+    Args:
+        model_variant: "thunder" or "lightning"
+        preset: DTW preset name
+    
+    Returns:
+        VideoProcessingConfig for the request
+    """
+    variant = model_variant or (get_preset_model_variant(preset) if preset else None)
+    if preset and variant is None:
+        raise HTTPException(status_code=400, detail=f"Unknown preset: {preset}")
+    try:
+        return get_video_config().for_variant(variant)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def _upload_too_large(max_bytes: int) -> HTTPException:
+    return HTTPException(
+        status_code=413,
+        detail=f"Video too large. Maximum upload size is {max_bytes // (1024 * 1024)} MB"
+    )
+
+
+def upload_path(filename: str) -> str:
+    """
+    Unique path in the upload directory for an uploaded file.
+    
+    The random part keeps concurrent uploads with the same name (within the
+    same second) from overwriting, or deleting, a file still being extracted.
+    """
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return os.path.join(UPLOAD_DIR, f"{timestamp}_{uuid.uuid4().hex}_{os.path.basename(filename)}")
+
+
+async def save_upload(video: UploadFile) -> Tuple[str, str]:
+    """
+    Save an uploaded video to the upload directory, hashing it while it is written.
+    
+    Reads and writes happen in chunks without blocking the event loop, so
+    one large upload never stalls other requests. Uploads over
+    max_upload_bytes are rejected with HTTP 413 and the partial file removed.
+    
+    Args:
+        video: Uploaded video file
+    
+    Returns:
+        Tuple of (path of the saved file, SHA-256 hex digest of its content)
+    """
+    config = get_video_config()
+    max_bytes = config.max_upload_bytes
+    
+    # Reject early when the multipart part declared its size
+    if video.size is not None and video.size > max_bytes:
+        raise _upload_too_large(max_bytes)
+    
+    video_path = upload_path(video.filename)
+    
+    digest = hashlib.sha256()
+    written = 0
+    try:
+        async with aiofiles.open(video_path, "wb") as buffer:
+            while True:
+                chunk = await video.read(config.upload_chunk_size)
+                if not chunk:
+                    break
+                written += len(chunk)
+                if written > max_bytes:
+                    raise _upload_too_large(max_bytes)
+                digest.update(chunk)
+                await buffer.write(chunk)
+    except BaseException:
+        if os.path.exists(video_path):
+            os.remove(video_path)
+        raise
+    
+    return video_path, digest.hexdigest()
+
+
+def session_to_response(session_data: dict) -> ProcessVideoResponse:
+    """Build a ProcessVideoResponse from a stored session."""
+    return ProcessVideoResponse(
+        session_id=session_data["session_id"],
+        keypoints=session_data["keypoints"],
+        frame_timestamps=session_data.get("frame_timestamps"),
+        inferred_mask=session_data.get("inferred_mask"),
+        embedding=session_data["embedding"],
+        step_segments=session_data.get("step_segments"),
+        duration_seconds=session_data["duration_seconds"]
+    )
+
+
+def lookup_cached_session(
+    content_hash: str,
+    config: Optional[VideoProcessingConfig] = None
+) -> Optional[ProcessVideoResponse]:
+    """
+    Return the existing session for identical video content, if any.
+    
+    The cache key covers the content hash, model identity and extraction
+    settings, so changing the model or config never returns stale keypoints.
+    
+    Args:
+        content_hash: SHA-256 hex digest of the uploaded file
+        config: Extraction config of the request (defaults to global config)
+    
+    Returns:
+        ProcessVideoResponse of the cached session, or None on a miss
+    """
+    cache = get_keypoint_cache()
+    key = cache.make_key(content_hash, config or get_video_config())
+    session_id = cache.lookup(key)
+    if session_id is None:
+        return None
+    
+    session_data = get_storage().get_session(session_id)
+    if session_data is None:
+        # Session was deleted behind the cache's back
+        cache.invalidate(key)
+        return None
+    return session_to_response(session_data)
+
+
+def create_session_from_extraction(
+    extraction,
+    video_path: str,
+    filename: str,
+    content_hash: Optional[str] = None,
+    config: Optional[VideoProcessingConfig] = None
+) -> ProcessVideoResponse:
+    """
+    Generate the embedding and persist a session for an extraction result.
+    
+    Args:
+        extraction: ExtractionResult from the extraction service
+        video_path: Path of the saved video
+        filename: Original upload filename
+        content_hash: SHA-256 of the video; when given the session is
+                      registered in the keypoint cache
+        config: Extraction config used (defaults to global config)
+    
+    Returns:
+        ProcessVideoResponse for the new session
+    """
+    config = config or get_video_config()
+    # JSON boundary: (N, 17, 3) array -> [frame][joint][x, y, confidence]
+    keypoints = extraction.keypoints.tolist()
+    duration_seconds = extraction.duration_seconds
+    
+    if not keypoints or len(keypoints) == 0:
+        raise HTTPException(
+            status_code=400,
+            detail="No pose detected in video. Please ensure a person is visible."
+        )
+    
+    # Generate embedding
+    embedding = sequence_to_embedding(keypoints)
+    
+    # Only stored when the motion gate actually interpolated frames
+    inferred_mask = extraction.inferred_mask if extraction.skip_ratio > 0 else None
+    
+    # Store in JSON storage
+    storage = get_storage()
+    session_id = storage.create_session(
+        keypoints=keypoints,
+        embedding=embedding,
+        duration_seconds=duration_seconds,
+        video_path=video_path,
+        user_id=None,  # TODO: Add user authentication
+        frame_timestamps=extraction.timestamps,
+        inferred_mask=inferred_mask
+    )
+    
+    # Store in vector database
+    vector_db = get_vector_db()
+    vector_db.insert_embedding(
+        session_id=session_id,
+        embedding=embedding,
+        metadata={
+            "timestamp": datetime.utcnow().isoformat(),
+            "duration_seconds": duration_seconds,
+            "video_filename": filename,
+            "model_variant": config.get_model_variant()
+        }
+    )
+    
+    if content_hash is not None:
+        cache = get_keypoint_cache()
+        cache.store(cache.make_key(content_hash, config), session_id, content_hash)
+    
+    return ProcessVideoResponse(
+        session_id=session_id,
+        keypoints=keypoints,
+        frame_timestamps=extraction.timestamps,
+        inferred_mask=inferred_mask,
+        embedding=embedding,
+        step_segments=None,  # Placeholder
+        duration_seconds=duration_seconds
+    )
+
 
 @router.post("/process-video", response_model=ProcessVideoResponse)
 async def process_video(
-    video: UploadFile = File(..., description="Video file to process")
+    video: UploadFile = File(..., description="Video file to process"),
+    model_variant: Optional[str] = Query(None, description="MoveNet variant: 'thunder' or 'lightning'"),
+    preset: Optional[str] = Query(None, description="DTW preset whose paired variant to use (e.g. 'fast' = Lightning)")
 ):
     """
     Process uploaded video to extract pose keypoints and generate embeddings.
     
     Steps:
-    1. Save uploaded video temporarily
-    2. Extract pose keypoints using MediaPipe
-    3. Generate fixed-length embedding
-    4. Store in both JSON storage and vector database
-    5. Return session data
+    1. Save uploaded video temporarily (hashing its content)
+    2. Return the existing session if identical content was already processed
+    3. Extract pose keypoints using MoveNet
+    4. Generate fixed-length embedding
+    5. Store in both JSON storage and vector database
+    6. Return session data
+    
+    For long videos prefer POST /api/jobs, which returns immediately.
     
     Args:
         video: Uploaded video file
-        
+        model_variant: MoveNet variant override for this upload
+        preset: DTW preset name, selects its paired variant when model_variant is unset
+    
     Returns:
         ProcessVideoResponse with session_id, keypoints, embedding, and metadata
     """
-    # Validate file type
-    allowed_extensions = ['.mp4', '.avi', '.mov', '.mkv', '.webm']
-    file_ext = os.path.splitext(video.filename)[1].lower()
-    
-    if file_ext not in allowed_extensions:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Invalid file type. Allowed: {', '.join(allowed_extensions)}"
-        )
-    
-    # Generate unique filename
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    safe_filename = f"{timestamp}_{video.filename}"
-    video_path = os.path.join(UPLOAD_DIR, safe_filename)
+    # Validate file type and model choice
+    validate_video_filename(video.filename)
+    config = resolve_extraction_config(model_variant, preset)
     
+    video_path = None
     try:
         # Save uploaded file
-        with open(video_path, "wb") as buffer:
-            shutil.copyfileobj(video.file, buffer)
+        video_path, content_hash = await save_upload(video)
         
-        # Extract keypoints
-        keypoints, duration_seconds = extract_keypoints(video_path)
+        # Duplicate upload: reuse the already-extracted session
+        # (session JSON parsing and persistence run off the event loop)
+        cached = await run_in_threadpool(lookup_cached_session, content_hash, config)
+        if cached is not None:
+            os.remove(video_path)
+            return cached
         
-        if not keypoints or len(keypoints) == 0:
-            raise HTTPException(
-                status_code=400,
-                detail="No pose detected in video. Please ensure a person is visible."
+        # Extract keypoints in a worker process (honors target_fps / max_frames)
+        try:
+            extraction = await get_extraction_service().extract(
+                video_path, variant=config.model_variant
             )
+        except ExtractionBusyError as e:
+            os.remove(video_path)
+            raise HTTPException(status_code=503, detail=str(e))
         
-        # Generate embedding
-        embedding = sequence_to_embedding(keypoints)
-        
-        # Store in JSON storage
-        storage = get_storage()
-        session_id = storage.create_session(
-            keypoints=keypoints,
-            embedding=embedding,
-            duration_seconds=duration_seconds,
-            video_path=video_path,
-            user_id=None  # TODO: Add user authentication
-        )
-        
-        # Store in vector database
-        vector_db = get_vector_db()
-        vector_db.insert_embedding(
-            session_id=session_id,
-            embedding=embedding,
-            metadata={
-                "timestamp": datetime.utcnow().isoformat(),
-                "duration_seconds": duration_seconds,
-                "video_filename": video.filename
-            }
-        )
-        
-        # Return response
-        return ProcessVideoResponse(
-            session_id=session_id,
-            keypoints=keypoints,
-            embedding=embedding,
-            step_segments=None,  # Placeholder
-            duration_seconds=duration_seconds
+        return await run_in_threadpool(
+            create_session_from_extraction,
+            extraction, video_path, video.filename, content_hash, config
         )
-        
+    
     except HTTPException:
         # Re-raise HTTP exceptions
         raise
     except Exception as e:
         # Clean up video file on error
-        if os.path.exists(video_path):
+        if video_path and os.path.exists(video_path):
             os.remove(video_path)
         raise HTTPException(
             status_code=500,
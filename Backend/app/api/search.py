@@ -0,0 +1,81 @@
+"""
+Search API Endpoint
+Finds the stored sessions most similar to a given session.
+"""
+
+from fastapi import APIRouter, HTTPException, Query
+from typing import Optional
+
+from app.schemas.compare import RankedSession
+from app.schemas.search import SearchRequest, SearchResponse, SearchStatistics
+from app.db.storage import get_storage
+from app.db.feature_cache import get_feature_cache
+from app.core.search import get_search_index
+from app.api.compare import resolve_dtw_config
+
+
+router = APIRouter()
+
+
+@router.post("/search", response_model=SearchResponse)
+def search_sessions(
+    request: SearchRequest,
+    preset: Optional[str] = Query(None, description="DTW preset: 'precise', 'balanced', 'fast', or 'long_sequences'")
+):
+    """
+    Find the stored sessions most similar to a query session.
+    
+    Every other stored session is a candidate. Candidates pass a cascade of
+    DTW lower bounds (LB_Kim, LB_Keogh) and only the survivors are aligned
+    with early-abandoning DTW; the top_k is still exact. Feature matrices
+    and envelopes stay indexed between searches; the session list is only
+    re-read when the store has changed, and then only new sessions are
+    loaded. A plain def: FastAPI runs it in its threadpool, so the
+    CPU-bound search does not block the event loop.
+    
+    Args:
+        request: SearchRequest with the query session ID
+        
+    Returns:
+        SearchResponse with the most similar sessions and cascade statistics
+    """
+    config = resolve_dtw_config(preset)
+    storage = get_storage()
+    feature_cache = get_feature_cache()
+    
+    query_session = storage.get_session(request.session_id_query)
+    if query_session is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Query session not found: {request.session_id_query}"
+        )
+    
+    def load_features(session_id: str):
+        session = storage.get_session(session_id)
+        if session is None or not session["keypoints"]:
+            return None
+        return feature_cache.get_features(session, config.frame_sample_rate, config.smoothing_window)
+    
+    index = get_search_index(config.frame_sample_rate, config.smoothing_window)
+    index.refresh(storage.revision(), storage.list_session_ids, load_features)
+    
+    query = feature_cache.get_features(query_session, config.frame_sample_rate, config.smoothing_window)
+    results, stats = index.search(
+        query,
+        top_k=request.top_k,
+        min_similarity=request.min_similarity,
+        window_for_length=config.get_window_size,
+        exclude=[request.session_id_query]
+    )
+    
+    return SearchResponse(
+        results=[
+            RankedSession(
+                session_id=result["candidate_id"],
+                similarity_score=result["similarity"],
+                normalized_distance=result["normalized_distance"]
+            )
+            for result in results
+        ],
+        statistics=SearchStatistics(**stats.as_dict())
+    )
@@ -89,4 +89,12 @@ async def delete_session(session_id: str):
     vector_db = get_vector_db()
     vector_db.delete_embedding(session_id)
     
+    # Drop content-hash cache entries pointing at this session
+    from app.db.keypoint_cache import get_keypoint_cache
+    get_keypoint_cache().invalidate_session(session_id)
+    
+    # Drop persisted feature matrices of this session
+    from app.db.feature_cache import get_feature_cache
+    get_feature_cache().invalidate_session(session_id)
+    
     return {"message": f"Session {session_id} deleted successfully"}
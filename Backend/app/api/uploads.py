@@ -0,0 +1,168 @@
+"""
+Resumable Upload API Endpoints
+Chunked uploads for long recordings over unreliable networks: start an
+upload, PUT numbered chunks (in any order, retrying freely), ask which
+ranges arrived, then finalize into a processing job.
+"""
+
+from fastapi import APIRouter, HTTPException, Request
+
+from app.schemas.job import JobStatusResponse
+from app.schemas.upload import CreateUploadRequest, UploadStatusResponse
+from app.core.config import get_video_config
+from app.db.upload_store import UploadError, get_upload_store
+from app.api.process_video import (
+    upload_path,
+    validate_video_filename,
+    resolve_extraction_config
+)
+from app.api.jobs import start_job
+
+
+router = APIRouter()
+
+
+def _get_upload_meta(upload_id: str) -> dict:
+    store = get_upload_store()
+    store.prune()
+    meta = store.get(upload_id)
+    if meta is None:
+        raise HTTPException(status_code=404, detail=f"Upload not found: {upload_id}")
+    return meta
+
+
+def _upload_status(meta: dict) -> UploadStatusResponse:
+    store = get_upload_store()
+    chunks = store.received_chunks(meta["upload_id"])
+    ranges = store.received_ranges(meta, chunks)
+    received = set(chunks)
+    return UploadStatusResponse(
+        upload_id=meta["upload_id"],
+        filename=meta["filename"],
+        total_size=meta["total_size"],
+        chunk_size=meta["chunk_size"],
+        total_chunks=meta["total_chunks"],
+        received_bytes=sum(end - start for start, end in ranges),
+        received_ranges=[[start, end] for start, end in ranges],
+        missing_chunks=[i for i in range(meta["total_chunks"]) if i not in received]
+    )
+
+
+@router.post("/uploads", response_model=UploadStatusResponse, status_code=201)
+async def create_upload(request: CreateUploadRequest):
+    """
+    Start a resumable upload.
+    
+    The model variant / preset are validated now and applied when the
+    upload is finalized.
+    
+    Args:
+        request: Filename, total size and optional chunk size / model choice
+        
+    Returns:
+        UploadStatusResponse with the upload_id and chunk layout
+    """
+    validate_video_filename(request.filename)
+    resolve_extraction_config(request.model_variant, request.preset)
+    
+    config = get_video_config()
+    if request.total_size > config.max_upload_bytes:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Video too large. Maximum upload size is {config.max_upload_bytes // (1024 * 1024)} MB"
+        )
+    
+    meta = get_upload_store().create(
+        filename=request.filename,
+        total_size=request.total_size,
+        chunk_size=request.chunk_size or config.resumable_chunk_size,
+        options={"model_variant": request.model_variant, "preset": request.preset}
+    )
+    return _upload_status(meta)
+
+
+@router.get("/uploads/{upload_id}", response_model=UploadStatusResponse)
+async def get_upload(upload_id: str):
+    """
+    Get the byte ranges received so far (call before resuming).
+    
+    Args:
+        upload_id: Upload identifier returned by POST /api/uploads
+        
+    Returns:
+        UploadStatusResponse with received ranges and missing chunks
+    """
+    return _upload_status(_get_upload_meta(upload_id))
+
+
+@router.put("/uploads/{upload_id}/chunks/{index}", response_model=UploadStatusResponse)
+async def put_chunk(upload_id: str, index: int, request: Request):
+    """
+    Store one chunk; the request body is the raw chunk bytes.
+    
+    Chunk `index` covers bytes [index * chunk_size, (index + 1) * chunk_size)
+    of the file and must have exactly that length (the last one may be
+    shorter). Re-sending a chunk replaces it.
+    
+    Args:
+        upload_id: Upload identifier
+        index: Zero-based chunk number
+        
+    Returns:
+        UploadStatusResponse after storing the chunk
+    """
+    meta = _get_upload_meta(upload_id)
+    try:
+        await get_upload_store().write_chunk(meta, index, request.stream())
+    except UploadError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return _upload_status(meta)
+
+
+@router.post("/uploads/{upload_id}/complete", response_model=JobStatusResponse, status_code=202)
+async def complete_upload(upload_id: str):
+    """
+    Assemble a fully received upload and submit it for processing.
+    
+    Behaves like POST /api/jobs from here on: poll or stream the returned
+    job for progress and the ProcessVideoResponse result.
+    
+    Args:
+        upload_id: Upload identifier
+        
+    Returns:
+        JobStatusResponse for the queued job (409 if chunks are missing)
+    """
+    meta = _get_upload_meta(upload_id)
+    options = meta.get("options", {})
+    config = resolve_extraction_config(options.get("model_variant"), options.get("preset"))
+    
+    video_path = upload_path(meta["filename"])
+    
+    store = get_upload_store()
+    try:
+        content_hash = await store.assemble(meta, video_path)
+    except UploadError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    
+    # Chunks are kept until the job is admitted: on 503 the client can
+    # simply call complete again without re-uploading
+    response = await start_job(video_path, meta["filename"], content_hash, config)
+    store.delete(upload_id)
+    return response
+
+
+@router.delete("/uploads/{upload_id}")
+async def abort_upload(upload_id: str):
+    """
+    Abort an upload and discard its chunks.
+    
+    Args:
+        upload_id: Upload identifier
+        
+    Returns:
+        Success message
+    """
+    if not get_upload_store().delete(upload_id):
+        raise HTTPException(status_code=404, detail=f"Upload not found: {upload_id}")
+    return {"message": f"Upload {upload_id} aborted"}
@@ -0,0 +1,437 @@
+"""
+Pose Extraction and DTW Benchmarks
+Command-line helpers for measuring MoveNet inference and DTW throughput.
+
+Usage:
+    python -m app.core.benchmark batch --sizes 1 2 4 8 16 --frames 256
+    python -m app.core.benchmark --cpu batch --video sample.mp4
+    python -m app.core.benchmark --cpu batch --backend tflite --sizes 1
+    python -m app.core.benchmark batch --variant lightning
+    python -m app.core.benchmark parity --video sample.mp4 --tflite models/movenet_thunder_f16.tflite
+    python -m app.core.benchmark gate --video sample.mp4 --thresholds 1 2 4
+    python -m app.core.benchmark dtw --lengths 500 1000 3000 --window 0.15
+    python -m app.core.benchmark fastdtw --lengths 1000 3000 --radii 1 10 30
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+
+def _load_frames(model, video_path: Optional[str], n_frames: int) -> List[np.ndarray]:
+    """Decode and prepare up to n_frames frames (random noise if no video given)."""
+    if video_path is None:
+        rng = np.random.default_rng(0)
+        return [
+            rng.integers(0, 256, (model.input_size, model.input_size, 3), dtype=np.uint8)
+            for _ in range(n_frames)
+        ]
+
+    import cv2
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        raise ValueError(f"Unable to open video file: {video_path}")
+    frames = []
+    try:
+        while len(frames) < n_frames:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            frames.append(model._prepare_frame(frame))
+    finally:
+        cap.release()
+    return frames
+
+
+def _load_pose_model(
+    backend: Optional[str] = None,
+    tflite_path: Optional[str] = None,
+    variant: Optional[str] = None
+):
+    """Global pose model, or a fresh one on an explicitly chosen backend."""
+    from app.core.pose_model import PoseModel, load_model
+
+    if backend is None and tflite_path is None:
+        return load_model(variant)
+
+    from dataclasses import replace
+    from app.core.config import get_video_config
+
+    config = get_video_config().for_variant(variant)
+    overrides = {}
+    if backend is not None:
+        overrides["inference_backend"] = backend
+    if tflite_path is not None:
+        overrides["tflite_model_path"] = tflite_path
+    return PoseModel(config=replace(config, **overrides))
+
+
+def benchmark_batch_sizes(
+    batch_sizes: Sequence[int] = (1, 2, 4, 8, 16),
+    n_frames: int = 256,
+    video_path: Optional[str] = None,
+    repeats: int = 3,
+    backend: Optional[str] = None,
+    variant: Optional[str] = None
+) -> List[Dict]:
+    """
+    Measure inference throughput (frames/sec) for each batch size.
+
+    Decode and preprocessing are excluded; each batch size gets one
+    untimed warm-up call so graph tracing is not counted.
+
+    Args:
+        batch_sizes: Batch sizes to compare
+        n_frames: Number of frames pushed through per repeat
+        video_path: Optional video to take frames from (default: random frames)
+        repeats: Timed passes per batch size (best pass is reported)
+        backend: Inference backend to measure (default: configured backend)
+        variant: MoveNet variant to measure (default: configured variant)
+
+    Returns:
+        List of {"batch_size", "frames", "seconds", "frames_per_second"}
+    """
+    model = _load_pose_model(backend, variant=variant)
+    frames = _load_frames(model, video_path, n_frames)
+    if not frames:
+        raise ValueError("No frames available for benchmarking")
+
+    results = []
+    for batch_size in batch_sizes:
+        # Warm-up: trace the concrete function for this batch size
+        model._infer_batch(frames[:batch_size], batch_size)
+
+        best = float("inf")
+        for _ in range(repeats):
+            start = time.perf_counter()
+            for i in range(0, len(frames), batch_size):
+                model._infer_batch(frames[i:i + batch_size], batch_size)
+            best = min(best, time.perf_counter() - start)
+
+        results.append({
+            "batch_size": batch_size,
+            "frames": len(frames),
+            "seconds": best,
+            "frames_per_second": len(frames) / best if best > 0 else 0.0
+        })
+    return results
+
+
+def backend_parity(
+    video_path: Optional[str] = None,
+    n_frames: int = 64,
+    tflite_path: Optional[str] = None,
+    min_confidence: float = 0.3
+) -> Dict:
+    """
+    Compare TFLite keypoints against the SavedModel backend on the same frames.
+
+    Only joints that both backends detect with at least `min_confidence`
+    are compared, since low-confidence positions are noise in either model.
+
+    Args:
+        video_path: Video to take frames from (default: random frames)
+        n_frames: Number of frames compared
+        tflite_path: .tflite model (default: config.tflite_model_path)
+        min_confidence: Joint confidence required in both outputs
+
+    Returns:
+        Dict with per-coordinate max/mean absolute differences (image-normalized
+        units), max confidence difference and the number of joints compared
+    """
+    reference = _load_pose_model("saved_model")
+    candidate = _load_pose_model("tflite", tflite_path)
+    frames = _load_frames(reference, video_path, n_frames)
+    if not frames:
+        raise ValueError("No frames available for parity check")
+
+    expected = np.asarray(reference._infer_batch(frames))
+    actual = np.asarray(candidate._infer_batch(frames))
+
+    mask = (expected[..., 2] >= min_confidence) & (actual[..., 2] >= min_confidence)
+    position_diff = np.abs(expected[..., :2] - actual[..., :2])[mask]
+    confidence_diff = np.abs(expected[..., 2] - actual[..., 2])
+
+    return {
+        "frames": len(frames),
+        "joints_compared": int(mask.sum()),
+        "max_position_diff": float(position_diff.max()) if position_diff.size else 0.0,
+        "mean_position_diff": float(position_diff.mean()) if position_diff.size else 0.0,
+        "max_confidence_diff": float(confidence_diff.max()),
+    }
+
+
+def motion_gate_error(
+    video_path: str,
+    thresholds: Sequence[float] = (1.0, 2.0, 4.0),
+    max_skip: Optional[int] = None
+) -> List[Dict]:
+    """
+    Measure motion-gate skip ratio, speed and keypoint error against full inference.
+
+    Errors are Euclidean distances of normalized joint positions (torso
+    lengths) on the interpolated frames, compared with the same frames
+    extracted without the gate.
+
+    Args:
+        video_path: Video to extract
+        thresholds: motion_threshold values to try
+        max_skip: motion_max_skip override (default: configured value)
+
+    Returns:
+        List of {"threshold", "skip_ratio", "seconds", "speedup",
+        "mean_error", "p95_error", "max_error"}
+    """
+    from dataclasses import replace
+    from app.core.config import get_video_config
+
+    model = _load_pose_model()
+    config = replace(get_video_config(), use_motion_gate=False)
+    if max_skip is not None:
+        config = replace(config, motion_max_skip=max_skip)
+
+    start = time.perf_counter()
+    full = model.extract(video_path, config)
+    full_seconds = time.perf_counter() - start
+    reference = np.asarray(full.keypoints, dtype=np.float64)
+
+    rows = []
+    for threshold in thresholds:
+        gated_config = replace(config, use_motion_gate=True, motion_threshold=threshold)
+        start = time.perf_counter()
+        gated = model.extract(video_path, gated_config)
+        seconds = time.perf_counter() - start
+
+        interpolated = ~np.asarray(gated.inferred_mask, dtype=bool)
+        actual = np.asarray(gated.keypoints, dtype=np.float64)
+        errors = np.linalg.norm(actual[..., :2] - reference[..., :2], axis=-1)[interpolated].ravel()
+
+        rows.append({
+            "threshold": float(threshold),
+            "skip_ratio": gated.skip_ratio,
+            "seconds": seconds,
+            "speedup": full_seconds / seconds if seconds > 0 else 0.0,
+            "mean_error": float(errors.mean()) if errors.size else 0.0,
+            "p95_error": float(np.percentile(errors, 95)) if errors.size else 0.0,
+            "max_error": float(errors.max()) if errors.size else 0.0,
+        })
+    return rows
+
+
+def _synthetic_sequences(length: int, rng: np.random.Generator) -> tuple:
+    """Reference feature sequence and a time-warped, noisy copy of it."""
+    reference = np.cumsum(rng.normal(size=(length, 42)), axis=0)
+    warp = np.sort(rng.integers(0, length, length))
+    user = reference[warp] + rng.normal(0.0, 0.3, (length, 42))
+    return reference, user
+
+
+def dtw_engines(
+    lengths: Sequence[int] = (500, 1000, 3000),
+    window_fraction: Optional[float] = 0.15,
+    include_reference: bool = True
+) -> List[Dict]:
+    """
+    Time the DTW engine against the cell-by-cell reference implementation.
+
+    Also times distance-only DTW (no distance matrix, path or cost matrix),
+    whose distance must equal the engine's.
+
+    Args:
+        lengths: Sequence lengths (frames) to test, both sequences equally long
+        window_fraction: Sakoe-Chiba window as a fraction of the length (None = unconstrained)
+        include_reference: Also time the (slow) reference and check identical results
+
+    Returns:
+        List of {"frames", "window", "engine_seconds", "distance_only_seconds",
+        "reference_seconds", "speedup", "identical"}
+    """
+    from app.core.metrics import (
+        dtw_distance_matrix, dtw_distance_matrix_reference, dtw_distance_only, pairwise_distances
+    )
+
+    rng = np.random.default_rng(0)
+    rows = []
+    for length in lengths:
+        reference, user = _synthetic_sequences(length, rng)
+        D = pairwise_distances(reference, user)
+        window = int(window_fraction * length) if window_fraction else None
+
+        start = time.perf_counter()
+        cost, path, matrix = dtw_distance_matrix(D, window)
+        engine_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        distance_only = dtw_distance_only(reference, user, window)
+        distance_only_seconds = time.perf_counter() - start
+
+        row = {"frames": length, "window": window, "engine_seconds": engine_seconds,
+               "distance_only_seconds": distance_only_seconds,
+               "reference_seconds": None, "speedup": None,
+               "identical": distance_only["distance"] == cost and distance_only["path_length"] == len(path)}
+        if include_reference:
+            start = time.perf_counter()
+            ref_cost, ref_path, ref_matrix = dtw_distance_matrix_reference(D, window)
+            row["reference_seconds"] = time.perf_counter() - start
+            row["speedup"] = row["reference_seconds"] / engine_seconds
+            row["identical"] = (
+                row["identical"] and cost == ref_cost and path == ref_path and np.array_equal(matrix, ref_matrix)
+            )
+        rows.append(row)
+    return rows
+
+
+def fastdtw_accuracy(
+    lengths: Sequence[int] = (1000, 3000),
+    radii: Sequence[int] = (1, 10, 30)
+) -> List[Dict]:
+    """
+    Accuracy and speed of the built-in FastDTW against exact DTW.
+
+    Exact DTW is unconstrained (full distance and cost matrix), so keep
+    lengths within memory (~16 * n^2 bytes). The optional `fastdtw` package
+    is timed as well when it is installed.
+
+    Args:
+        lengths: Sequence lengths (frames) to test
+        radii: FastDTW radii to test
+
+    Returns:
+        List of {"frames", "radius", "exact_seconds", "fastdtw_seconds", "speedup",
+        "distance_error_pct", "similarity_error", "package_seconds"}
+    """
+    from app.core.metrics import dtw_distance_matrix, pairwise_distances, run_dtw
+
+    try:
+        from fastdtw import fastdtw as package_fastdtw
+    except ImportError:
+        package_fastdtw = None
+
+    rng = np.random.default_rng(0)
+    rows = []
+    for length in lengths:
+        reference, user = _synthetic_sequences(length, rng)
+
+        start = time.perf_counter()
+        exact_distance, exact_path, _ = dtw_distance_matrix(pairwise_distances(reference, user))
+        exact_seconds = time.perf_counter() - start
+        exact_similarity = 1.0 / (1.0 + exact_distance / len(exact_path))
+
+        package_seconds = None
+        if package_fastdtw is not None:
+            start = time.perf_counter()
+            package_fastdtw(reference, user, dist=lambda x, y: np.linalg.norm(x - y))
+            package_seconds = time.perf_counter() - start
+
+        for radius in radii:
+            start = time.perf_counter()
+            approx = run_dtw(reference, user, use_fastdtw=True, fastdtw_threshold=0, fastdtw_radius=radius)
+            fastdtw_seconds = time.perf_counter() - start
+            rows.append({
+                "frames": length,
+                "radius": radius,
+                "exact_seconds": exact_seconds,
+                "fastdtw_seconds": fastdtw_seconds,
+                "speedup": exact_seconds / fastdtw_seconds,
+                "distance_error_pct": 100 * (approx["distance"] - exact_distance) / exact_distance,
+                "similarity_error": exact_similarity - approx["similarity"],
+                "package_seconds": package_seconds,
+            })
+    return rows
+
+
+def _print_table(rows: List[Dict], columns: Sequence[str]) -> None:
+    print(" | ".join(f"{c:>18}" for c in columns))
+    print("-" * (21 * len(columns)))
+    for row in rows:
+        cells = []
+        for c in columns:
+            v = row[c]
+            cells.append(f"{v:>18.3f}" if isinstance(v, float) else f"{v!s:>18}")
+        print(" | ".join(cells))
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="AssemblyFlow pose extraction benchmarks")
+    parser.add_argument("--cpu", action="store_true", help="Hide GPUs from TensorFlow")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    batch = sub.add_parser("batch", help="Inference frames/sec vs batch size")
+    batch.add_argument("--sizes", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    batch.add_argument("--frames", type=int, default=256)
+    batch.add_argument("--video", default=None, help="Video to sample frames from")
+    batch.add_argument("--repeats", type=int, default=3)
+    batch.add_argument("--backend", choices=["saved_model", "tflite"], default=None)
+    batch.add_argument("--variant", choices=["thunder", "lightning"], default=None)
+
+    parity = sub.add_parser("parity", help="TFLite vs SavedModel keypoint differences")
+    parity.add_argument("--video", default=None, help="Video to sample frames from")
+    parity.add_argument("--frames", type=int, default=64)
+    parity.add_argument("--tflite", default=None, help="TFLite model (default: config)")
+    parity.add_argument("--min-confidence", type=float, default=0.3)
+    parity.add_argument(
+        "--tolerance", type=float, default=0.02,
+        help="Max allowed position difference (fraction of the frame)"
+    )
+
+    gate = sub.add_parser("gate", help="Motion gate skip ratio and error vs full inference")
+    gate.add_argument("--video", required=True)
+    gate.add_argument("--thresholds", type=float, nargs="+", default=[1.0, 2.0, 4.0])
+    gate.add_argument("--max-skip", type=int, default=None)
+
+    dtw = sub.add_parser("dtw", help="DTW engine vs reference implementation")
+    dtw.add_argument("--lengths", type=int, nargs="+", default=[500, 1000, 3000])
+    dtw.add_argument("--window", type=float, default=0.15, help="Window fraction (0 = unconstrained)")
+    dtw.add_argument("--skip-reference", action="store_true", help="Only time the engine")
+
+    fast = sub.add_parser("fastdtw", help="FastDTW accuracy and speed vs exact DTW")
+    fast.add_argument("--lengths", type=int, nargs="+", default=[1000, 3000])
+    fast.add_argument("--radii", type=int, nargs="+", default=[1, 10, 30])
+
+    args = parser.parse_args(argv)
+
+    if args.cpu:
+        # Must be set before TensorFlow is imported
+        os.environ["CUDA_VISIBLE_DEVICES"] = "-1"
+
+    if args.command == "batch":
+        rows = benchmark_batch_sizes(
+            args.sizes, args.frames, args.video, args.repeats, args.backend, args.variant
+        )
+        _print_table(rows, ["batch_size", "frames", "seconds", "frames_per_second"])
+    elif args.command == "parity":
+        report = backend_parity(args.video, args.frames, args.tflite, args.min_confidence)
+        for key, value in report.items():
+            print(f"{key:>20}: {value}")
+        if report["max_position_diff"] > args.tolerance:
+            print(f"✗ Max position difference exceeds tolerance {args.tolerance}")
+            sys.exit(1)
+        print(f"✓ Keypoints within tolerance {args.tolerance}")
+    elif args.command == "gate":
+        rows = motion_gate_error(args.video, args.thresholds, args.max_skip)
+        _print_table(rows, [
+            "threshold", "skip_ratio", "seconds", "speedup", "mean_error", "p95_error", "max_error"
+        ])
+    elif args.command == "dtw":
+        rows = dtw_engines(args.lengths, args.window or None, not args.skip_reference)
+        _print_table(rows, [
+            "frames", "window", "engine_seconds", "distance_only_seconds",
+            "reference_seconds", "speedup", "identical"
+        ])
+        if any(row["identical"] is False for row in rows):
+            print("✗ DTW engine differs from the reference implementation")
+            sys.exit(1)
+    elif args.command == "fastdtw":
+        rows = fastdtw_accuracy(args.lengths, args.radii)
+        _print_table(rows, [
+            "frames", "radius", "exact_seconds", "fastdtw_seconds", "speedup",
+            "distance_error_pct", "similarity_error", "package_seconds"
+        ])
+
+
+if __name__ == "__main__":
+    main()
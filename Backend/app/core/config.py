@@ -3,8 +3,47 @@ Configuration Module for DTW and Motion Comparison
 Centralized tuning parameters for optimal performance.
 """
 
-from typing import Dict
-from dataclasses import dataclass
+from typing import Dict, List
+from dataclasses import dataclass, replace
+import os
+
+
+# Local MoveNet SavedModel directory (falls back to TF Hub if missing)
+MODEL_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+    "models"
+)
+
+# Service roles: "ingest" serves uploads/extraction, "compare" serves comparison
+# and session endpoints without loading the pose model, "all" serves both
+APP_ROLES = ("all", "ingest", "compare")
+
+# MoveNet single-pose model variants: hub handle, input resolution and local files
+MOVENET_VARIANTS = {
+    "thunder": {
+        "name": "movenet/singlepose/thunder/4",
+        "hub_url": "https://tfhub.dev/google/movenet/singlepose/thunder/4",
+        "input_size": 256,
+        "model_dir": MODEL_DIR,
+        "tflite_model_path": os.path.join(MODEL_DIR, "movenet_thunder_f16.tflite"),
+    },
+    "lightning": {
+        "name": "movenet/singlepose/lightning/4",
+        "hub_url": "https://tfhub.dev/google/movenet/singlepose/lightning/4",
+        "input_size": 192,
+        "model_dir": os.path.join(MODEL_DIR, "lightning"),
+        "tflite_model_path": os.path.join(MODEL_DIR, "movenet_lightning_f16.tflite"),
+    },
+}
+DEFAULT_MODEL_VARIANT = "thunder"
+
+# Model variant paired with each DTW preset when a request names only a preset
+PRESET_MODEL_VARIANTS = {
+    "precise": "thunder",
+    "balanced": "thunder",
+    "fast": "lightning",
+    "long_sequences": "lightning",
+}
 
 
 @dataclass
@@ -24,9 +63,14 @@ class DTWConfig:
     window_size: int = None  # Auto-calculate if None (15% for >500 frames)
     window_percentage: float = 0.15  # Window as % of sequence length
     
-    # FastDTW
+    # FastDTW (built-in multiresolution approximation, see metrics.fast_dtw)
     use_fastdtw: bool = False  # Enable FastDTW for sequences >1000 frames
     fastdtw_threshold: int = 1000  # Sequence length to trigger FastDTW
+    fastdtw_radius: int = 10  # Refinement radius per resolution (larger = more accurate, slower)
+    
+    # Online DTW (live alignment against a reference session)
+    online_window: int = 150  # Search band radius in reference frames (None = whole reference)
+    online_deviation_threshold: float = None  # Flag live frames farther than this from the reference (None = off)
     
     # Stressed joints
     stressed_joint_threshold: float = 0.25  # Default threshold (normalized units)
@@ -63,9 +107,27 @@ class VideoProcessingConfig:
     """Configuration for video processing and pose extraction."""
     
     # MoveNet inference
+    model_variant: str = None  # "thunder" or "lightning" (None = chosen by input_size)
     input_size: int = 256  # Model input size (256 for Thunder, 192 for Lightning)
+    warm_variants: List[str] = None  # Extra variants every worker keeps loaded for per-request selection
     confidence_threshold: float = 0.3  # Minimum confidence for keypoint
     
+    # Inference backend
+    inference_backend: str = "saved_model"  # "saved_model" (TensorFlow) or "tflite" (XNNPACK on CPU)
+    tflite_model_path: str = None  # float16 or int8 MoveNet .tflite file (None = variant default)
+    tflite_num_threads: int = None  # Interpreter threads (None = CPU cores / extraction workers)
+    
+    # Smart crop (track the operator with a square region of interest)
+    use_smart_crop: bool = False  # Crop around the previous frame's pose instead of squashing the whole frame
+    crop_min_keypoint_score: float = 0.2  # Keypoint confidence needed to count towards the crop
+    crop_redetect_score: float = 0.3  # Mean confidence in a crop below which the full frame is re-run
+    
+    # Motion gate (skip inference on near-static frames, interpolate their keypoints)
+    use_motion_gate: bool = False  # Gate inference on downscaled frame differencing
+    motion_threshold: float = 2.0  # Mean gray-level change (0-255) vs last inferred frame that counts as motion
+    motion_gate_size: int = 64  # Width of the thumbnail used for differencing
+    motion_max_skip: int = 10  # Max consecutive interpolated frames before inference is forced
+    
     # Video processing
     max_frames: int = None  # Limit frames per video (None = unlimited)
     target_fps: int = None  # Resample to target FPS (None = use original)
@@ -73,6 +135,101 @@ class VideoProcessingConfig:
     # Normalization
     normalize_by_torso: bool = True  # Use torso-based normalization
     min_torso_length: float = 1e-6  # Minimum torso length to avoid division by zero
+    
+    # Extraction pipeline
+    use_pipeline: bool = True  # Overlap decode, preprocess and inference in separate stages
+    decode_queue_size: int = 64  # Max decoded frames buffered ahead of preprocessing
+    inference_queue_size: int = 16  # Max preprocessed frames buffered ahead of inference
+    inference_batch_size: int = 1  # Frames stacked into one MoveNet graph call
+    
+    # Uploads
+    max_upload_bytes: int = 2 * 1024 ** 3  # Uploads larger than this are rejected (413)
+    upload_chunk_size: int = 1024 * 1024  # Bytes per read / write while saving an upload
+    resumable_chunk_size: int = 8 * 1024 * 1024  # Default chunk size of resumable uploads
+    resumable_expiry_hours: float = 24.0  # Incomplete resumable uploads are discarded after this
+    
+    # Live ingestion (WebSocket)
+    live_max_frame_bytes: int = 4 * 1024 * 1024  # Larger encoded frames are dropped
+    
+    # Extraction service
+    warm_up_on_start: bool = True  # Run dummy frames through inference before reporting ready
+    extraction_workers: int = 2  # Worker processes, each with its own model (0 = in-process thread)
+    max_pending_extractions: int = 8  # Uploads running or queued before new ones are rejected (503)
+    parallel_chunks: int = 1  # Split one video into this many frame ranges across workers (1 = off)
+    min_chunk_frames: int = 900  # Don't split into ranges shorter than this (seek + warm-up overhead)
+    
+    def get_model_variant(self) -> str:
+        """Name of the MoveNet variant to run."""
+        if self.model_variant:
+            return self.model_variant
+        for name, variant in MOVENET_VARIANTS.items():
+            if variant["input_size"] == self.input_size:
+                return name
+        return DEFAULT_MODEL_VARIANT
+    
+    def get_input_size(self) -> int:
+        """Model input resolution of the selected variant."""
+        return MOVENET_VARIANTS[self.get_model_variant()]["input_size"]
+    
+    def get_loaded_variants(self) -> List[str]:
+        """Variants loaded by each worker: the selected one plus warm_variants."""
+        variants = [self.get_model_variant()]
+        for name in self.warm_variants or []:
+            if name not in variants:
+                variants.append(name)
+        return variants
+    
+    def for_variant(self, variant: str = None) -> "VideoProcessingConfig":
+        """
+        Copy of this config running a different model variant.
+        
+        Args:
+            variant: Variant name (None = keep the current variant)
+        
+        Returns:
+            VideoProcessingConfig with model_variant and input_size set
+        """
+        if variant is None:
+            return self
+        if variant not in MOVENET_VARIANTS:
+            raise ValueError(
+                f"Unknown model variant '{variant}'. Available: {', '.join(MOVENET_VARIANTS)}"
+            )
+        return replace(self, model_variant=variant, input_size=MOVENET_VARIANTS[variant]["input_size"])
+    
+    def get_tflite_model_path(self) -> str:
+        """TFLite model file for the selected variant."""
+        if self.tflite_model_path:
+            return self.tflite_model_path
+        return MOVENET_VARIANTS[self.get_model_variant()]["tflite_model_path"]
+    
+    def get_tflite_num_threads(self) -> int:
+        """Interpreter threads per worker, splitting the CPU cores between workers by default."""
+        if self.tflite_num_threads:
+            return self.tflite_num_threads
+        return max(1, (os.cpu_count() or 1) // max(1, self.extraction_workers))
+    
+    def extraction_fingerprint(self) -> Dict:
+        """Settings that change extracted keypoints (used in keypoint cache keys)."""
+        model = MOVENET_VARIANTS[self.get_model_variant()]["name"]
+        if self.inference_backend == "tflite":
+            # Quantized models give slightly different keypoints
+            model = os.path.basename(self.get_tflite_model_path())
+        return {
+            "model": model,
+            "backend": self.inference_backend,
+            "input_size": self.get_input_size(),
+            "max_frames": self.max_frames,
+            "target_fps": self.target_fps,
+            "normalize_by_torso": self.normalize_by_torso,
+            "smart_crop": (
+                [self.crop_min_keypoint_score, self.crop_redetect_score] if self.use_smart_crop else False
+            ),
+            "motion_gate": (
+                [self.motion_threshold, self.motion_gate_size, self.motion_max_skip]
+                if self.use_motion_gate else False
+            ),
+        }
 
 
 # Default configurations
@@ -80,6 +237,11 @@ DEFAULT_DTW_CONFIG = DTWConfig()
 DEFAULT_VIDEO_CONFIG = VideoProcessingConfig()
 
 
+def get_preset_model_variant(preset: str) -> str:
+    """Model variant paired with a DTW preset (None for unknown presets)."""
+    return PRESET_MODEL_VARIANTS.get(preset)
+
+
 # Preset configurations for different use cases
 class DTWPresets:
     """Preset configurations for common scenarios."""
@@ -201,6 +363,14 @@ def set_dtw_config(config: DTWConfig):
     _global_dtw_config = config
 
 
+def get_app_role() -> str:
+    """Service role from the APP_ROLE environment variable (default "all")."""
+    role = os.environ.get("APP_ROLE", "all").strip().lower()
+    if role not in APP_ROLES:
+        raise ValueError(f"Invalid APP_ROLE '{role}'. Available: {', '.join(APP_ROLES)}")
+    return role
+
+
 def get_video_config() -> VideoProcessingConfig:
     """Get current video processing configuration."""
     return _global_video_config
@@ -0,0 +1,171 @@
+"""
+Smart Crop Region Tracking
+Follows the operator with a square region of interest so MoveNet sees the
+person at full input resolution instead of a squashed full frame.
+
+Based on the cropping algorithm recommended for MoveNet: the crop for the
+next frame is centered on the hips and sized from the torso and body extent
+of the current frame's keypoints. When the torso is lost the tracker falls
+back to the whole (padded) frame.
+"""
+
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+import cv2
+import numpy as np
+
+
+# MoveNet keypoint indices used for tracking
+LEFT_SHOULDER, RIGHT_SHOULDER, LEFT_HIP, RIGHT_HIP = 5, 6, 11, 12
+TORSO_JOINTS = (LEFT_SHOULDER, RIGHT_SHOULDER, LEFT_HIP, RIGHT_HIP)
+
+# Crop size relative to the torso / body extent around the hip center
+TORSO_EXPANSION_RATIO = 1.9
+BODY_EXPANSION_RATIO = 1.2
+
+
+@dataclass
+class CropRegion:
+    """Square crop in frame-normalized coordinates (may extend past the frame)."""
+
+    y_min: float
+    x_min: float
+    height: float
+    width: float
+
+    @classmethod
+    def full_frame(cls, frame_height: int, frame_width: int) -> "CropRegion":
+        """Whole frame, padded to a square around its center."""
+        if frame_width > frame_height:
+            height = frame_width / frame_height
+            return cls(y_min=(frame_height / 2 - frame_width / 2) / frame_height, x_min=0.0, height=height, width=1.0)
+        width = frame_height / frame_width
+        return cls(y_min=0.0, x_min=(frame_width / 2 - frame_height / 2) / frame_width, height=1.0, width=width)
+
+
+class CropTracker:
+    """
+    Chooses the MoveNet input crop for each frame from the previous frame's keypoints.
+
+    Frames must be fed in order; call reset() at a discontinuity (seek).
+    """
+
+    def __init__(self, input_size: int, min_keypoint_score: float = 0.2, redetect_score: float = 0.3):
+        """
+        Initialize tracker.
+
+        Args:
+            input_size: Model input resolution
+            min_keypoint_score: Confidence for a keypoint to count towards the crop
+            redetect_score: Mean keypoint confidence below which a cropped frame
+                            is re-run on the full frame
+        """
+        self.input_size = input_size
+        self.min_keypoint_score = min_keypoint_score
+        self.redetect_score = redetect_score
+        self.region: Optional[CropRegion] = None
+        self.redetections = 0  # Frames re-run on the full frame after a low-confidence crop
+
+    def reset(self) -> None:
+        """Start over from the full frame."""
+        self.region = None
+
+    def crop(self, frame: np.ndarray, region: CropRegion) -> np.ndarray:
+        """
+        Cut `region` out of a BGR frame as an RGB input_size x input_size image.
+
+        Uses a single affine warp, so only the output pixels are sampled
+        (the full-resolution frame is never resized) and areas outside the
+        frame are zero-padded.
+        """
+        frame_height, frame_width = frame.shape[:2]
+        scale_x = self.input_size / (region.width * frame_width)
+        scale_y = self.input_size / (region.height * frame_height)
+        matrix = np.array([
+            [scale_x, 0.0, -region.x_min * frame_width * scale_x],
+            [0.0, scale_y, -region.y_min * frame_height * scale_y],
+        ], dtype=np.float32)
+        img = cv2.warpAffine(
+            frame, matrix, (self.input_size, self.input_size),
+            flags=cv2.INTER_LINEAR, borderMode=cv2.BORDER_CONSTANT, borderValue=0
+        )
+        return cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+
+    @staticmethod
+    def to_frame_coords(raw: np.ndarray, region: CropRegion) -> np.ndarray:
+        """Map raw (y, x, confidence) keypoints from crop to frame-normalized coordinates."""
+        mapped = np.array(raw, dtype=np.float32, copy=True)
+        mapped[:, 0] = region.y_min + region.height * mapped[:, 0]
+        mapped[:, 1] = region.x_min + region.width * mapped[:, 1]
+        return mapped
+
+    def track(self, frame: np.ndarray, infer: Callable[[np.ndarray], np.ndarray]) -> np.ndarray:
+        """
+        Run pose estimation on the tracked crop of a frame and advance the tracker.
+
+        Args:
+            frame: BGR frame from OpenCV
+            infer: Runs MoveNet on one RGB input image, returns raw (17, 3) (y, x, confidence)
+
+        Returns:
+            Raw keypoints (17, 3) as (y, x, confidence) in frame-normalized coordinates
+        """
+        frame_height, frame_width = frame.shape[:2]
+        full = CropRegion.full_frame(frame_height, frame_width)
+        region = self.region or full
+
+        keypoints = self.to_frame_coords(infer(self.crop(frame, region)), region)
+        if region is not full and keypoints[:, 2].mean() < self.redetect_score:
+            # Lost the operator inside the crop: re-detect on the whole frame
+            self.redetections += 1
+            keypoints = self.to_frame_coords(infer(self.crop(frame, full)), full)
+
+        self.region = self._next_region(keypoints, frame_height, frame_width)
+        return keypoints
+
+    def _torso_visible(self, keypoints: np.ndarray) -> bool:
+        scores = keypoints[:, 2]
+        return bool(
+            (scores[LEFT_HIP] > self.min_keypoint_score or scores[RIGHT_HIP] > self.min_keypoint_score)
+            and (scores[LEFT_SHOULDER] > self.min_keypoint_score or scores[RIGHT_SHOULDER] > self.min_keypoint_score)
+        )
+
+    def _next_region(self, keypoints: np.ndarray, frame_height: int, frame_width: int) -> Optional[CropRegion]:
+        """Crop for the next frame (None = full frame)."""
+        if not self._torso_visible(keypoints):
+            return None
+
+        # Pixel coordinates
+        ys = keypoints[:, 0] * frame_height
+        xs = keypoints[:, 1] * frame_width
+        center_y = (ys[LEFT_HIP] + ys[RIGHT_HIP]) / 2
+        center_x = (xs[LEFT_HIP] + xs[RIGHT_HIP]) / 2
+
+        torso = list(TORSO_JOINTS)
+        torso_range_y = np.max(np.abs(center_y - ys[torso]))
+        torso_range_x = np.max(np.abs(center_x - xs[torso]))
+
+        confident = keypoints[:, 2] > self.min_keypoint_score
+        body_range_y = np.max(np.abs(center_y - ys[confident]))
+        body_range_x = np.max(np.abs(center_x - xs[confident]))
+
+        crop_half = max(
+            torso_range_x * TORSO_EXPANSION_RATIO,
+            torso_range_y * TORSO_EXPANSION_RATIO,
+            body_range_x * BODY_EXPANSION_RATIO,
+            body_range_y * BODY_EXPANSION_RATIO,
+        )
+        # Never extend further than the farthest frame edge from the center
+        crop_half = min(crop_half, max(center_x, frame_width - center_x, center_y, frame_height - center_y))
+
+        if crop_half > max(frame_width, frame_height) / 2 or crop_half <= 0:
+            return None
+
+        crop_length = crop_half * 2
+        return CropRegion(
+            y_min=float((center_y - crop_half) / frame_height),
+            x_min=float((center_x - crop_half) / frame_width),
+            height=float(crop_length / frame_height),
+            width=float(crop_length / frame_width)
+        )
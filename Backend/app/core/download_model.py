@@ -1,13 +1,24 @@
 """
-Download and cache MoveNet Thunder model from TensorFlow Hub
+Download and cache a MoveNet model (Thunder by default) from TensorFlow Hub
+
+Usage:
+    python -m app.core.download_model [thunder|lightning]
 """
 
+import sys
+
 import tensorflow_hub as hub
 
-print("Downloading MoveNet Thunder model from TensorFlow Hub...")
+from app.core.config import MOVENET_VARIANTS, DEFAULT_MODEL_VARIANT
+
+variant = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_MODEL_VARIANT
+if variant not in MOVENET_VARIANTS:
+    sys.exit(f"Unknown model variant '{variant}'. Available: {', '.join(MOVENET_VARIANTS)}")
+
+print(f"Downloading MoveNet {variant.capitalize()} model from TensorFlow Hub...")
 print("This may take a few minutes on first run...")
 
-model = hub.load("https://tfhub.dev/google/movenet/singlepose/thunder/4")
+model = hub.load(MOVENET_VARIANTS[variant]["hub_url"])
 
-print("✅ MoveNet Thunder model downloaded and cached successfully!")
+print(f"✅ MoveNet {variant.capitalize()} model downloaded and cached successfully!")
 print("Model will be loaded from cache on subsequent runs.")
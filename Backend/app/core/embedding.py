@@ -8,6 +8,9 @@ from typing import List, Dict, Tuple
 import numpy as np
 import math
 
+# Bump whenever frame features change, so persisted feature matrices are recomputed
+FEATURE_VERSION = 1
+
 # Indices for MoveNet 17 keypoints
 KP = {
     "nose": 0, "left_eye":1, "right_eye":2, "left_ear":3, "right_ear":4,
@@ -82,6 +85,64 @@ def frame_feature_from_keypoints(keypoints_frame: List[Tuple[float,float,float]]
     feat = np.concatenate([angles, pos_flat])  # 8 + 34 = 42 dims
     return feat
 
+# Joint angles as (a, b, c) keypoint triples, angle at b (same order as compute_joint_angles)
+ANGLE_TRIPLES = np.array([
+    [KP["left_elbow"], KP["left_shoulder"], KP["left_hip"]],
+    [KP["right_elbow"], KP["right_shoulder"], KP["right_hip"]],
+    [KP["left_shoulder"], KP["left_elbow"], KP["left_wrist"]],
+    [KP["right_shoulder"], KP["right_elbow"], KP["right_wrist"]],
+    [KP["left_shoulder"], KP["left_hip"], KP["left_knee"]],
+    [KP["right_shoulder"], KP["right_hip"], KP["right_knee"]],
+    [KP["left_hip"], KP["left_knee"], KP["left_ankle"]],
+    [KP["right_hip"], KP["right_knee"], KP["right_ankle"]],
+])
+
+def _dot_last_axis(u: np.ndarray, v: np.ndarray) -> np.ndarray:
+    """Dot product over the last axis; batched matmul rounds exactly like np.dot / np.linalg.norm."""
+    return (u[..., np.newaxis, :] @ v[..., :, np.newaxis])[..., 0, 0]
+
+def keypoints_to_feature_matrix(keypoints: np.ndarray) -> np.ndarray:
+    """
+    Batch version of frame_feature_from_keypoints for a whole sequence.
+    
+    Torso normalization, the 8 joint angles and the flattened coordinates are
+    computed for all frames at once; the output is bit-identical to stacking
+    frame_feature_from_keypoints per frame.
+    
+    Args:
+        keypoints: Keypoints of shape (N, 17, 3) as [x, y, confidence]
+    
+    Returns:
+        Feature matrix (N, 42): 8 joint angles + 34 normalized coordinates
+    """
+    kp = np.asarray(keypoints, dtype=float)
+    n = kp.shape[0]
+    if n == 0:
+        return np.zeros((0, 42), dtype=float)
+    
+    # Torso normalization (see torso_center_and_scale / normalize_keypoints)
+    xy = kp[:, :, :2]
+    mid_sh = (xy[:, KP["left_shoulder"]] + xy[:, KP["right_shoulder"]]) / 2.0
+    mid_hip = (xy[:, KP["left_hip"]] + xy[:, KP["right_hip"]]) / 2.0
+    center = (mid_sh + mid_hip) / 2.0
+    torso = mid_sh - mid_hip
+    torso_len = np.sqrt(_dot_last_axis(torso, torso))
+    torso_len[torso_len < 1e-6] = 1.0
+    coords = (xy - center[:, np.newaxis]) / torso_len[:, np.newaxis, np.newaxis]  # (N,17,2)
+    
+    # Joint angles (see angle_between); degenerate limbs give 0
+    b = coords[:, ANGLE_TRIPLES[:, 1]]
+    ba = coords[:, ANGLE_TRIPLES[:, 0]] - b
+    bc = coords[:, ANGLE_TRIPLES[:, 2]] - b
+    na = np.sqrt(_dot_last_axis(ba, ba))
+    nb = np.sqrt(_dot_last_axis(bc, bc))
+    valid = (na >= 1e-6) & (nb >= 1e-6)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cosang = np.clip(_dot_last_axis(ba, bc) / (na * nb), -1.0, 1.0)
+    angles = np.where(valid, np.arccos(cosang), 0.0)  # (N,8)
+    
+    return np.concatenate([angles, coords.reshape(n, 34)], axis=1)
+
 def sequence_to_feature_matrix(frames: List[Dict], sample_rate: int = 1) -> np.ndarray:
     """
     Convert list of frames (each with 'keypoints' list) to (n_frames, feature_dim) matrix.
@@ -94,14 +155,11 @@ def sequence_to_feature_matrix(frames: List[Dict], sample_rate: int = 1) -> np.n
     Returns:
         Feature matrix (n_sampled_frames, 42)
     """
-    feats = []
-    for idx, f in enumerate(frames):
-        if idx % sample_rate != 0:
-            continue
-        kp = f.get("keypoints", [])
-        feat = frame_feature_from_keypoints(kp)
-        feats.append(feat)
-    return np.vstack(feats) if feats else np.zeros((0, 42), dtype=float)
+    sampled = frames[::sample_rate]
+    if not sampled:
+        return np.zeros((0, 42), dtype=float)
+    keypoints = np.array([f.get("keypoints", []) for f in sampled], dtype=float)
+    return keypoints_to_feature_matrix(keypoints)
 
 def temporal_smoothing(feat_matrix: np.ndarray, window: int = 3) -> np.ndarray:
     """Apply simple moving average smoothing over frames (axis=0)."""
@@ -0,0 +1,428 @@
+"""
+Extraction Service
+Runs pose extraction in a pool of worker processes so video uploads never
+block the API event loop.
+"""
+
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, List, Optional, Tuple
+
+from app.core.config import VideoProcessingConfig, get_video_config, set_video_config
+from app.core.pipeline import (
+    ChunkBoundaryError,
+    ExtractionResult,
+    FrameSampler,
+    split_frame_range,
+    stitch_results,
+)
+
+
+ProgressCallback = Callable[[int, int], None]
+
+# Worker-side handle to the progress queue (set by the process initializer)
+_progress_queue = None
+
+
+class ExtractionBusyError(RuntimeError):
+    """Raised when the service already has the maximum number of pending jobs."""
+
+
+class _ThrottledProgress:
+    """Forwards (done, total) progress at most every `interval` seconds."""
+
+    def __init__(self, send: ProgressCallback, interval: float = 0.25):
+        self.send = send
+        self.interval = interval
+        self._last = 0.0
+
+    def __call__(self, done: int, total: int) -> None:
+        now = time.monotonic()
+        if done >= total or now - self._last >= self.interval:
+            self._last = now
+            self.send(done, total)
+
+
+def _init_worker(config: VideoProcessingConfig, ready_count, progress_queue) -> None:
+    """Process initializer: apply config, load and warm up each configured MoveNet variant."""
+    global _progress_queue
+    from app.core.pose_model import load_models, warm_up_models
+
+    _progress_queue = progress_queue
+    set_video_config(config)
+    if config.warm_up_on_start:
+        warm_up_models()
+    else:
+        load_models()
+    with ready_count.get_lock():
+        ready_count.value += 1
+
+
+def _worker_ready() -> int:
+    """No-op task used to force worker start-up; returns the worker PID."""
+    return os.getpid()
+
+
+def _worker_progress(job_id: Optional[str]) -> Optional[ProgressCallback]:
+    """Progress callback that posts to the service's progress queue."""
+    if job_id is None or _progress_queue is None:
+        return None
+    queue = _progress_queue
+    return _ThrottledProgress(lambda done, total: queue.put((job_id, done, total)))
+
+
+def _extract_in_worker(video_path: str, job_id: Optional[str] = None, variant: Optional[str] = None):
+    """Run a full extraction with the worker's model instance."""
+    from app.core.pose_model import extract_video
+
+    return extract_video(video_path, progress_callback=_worker_progress(job_id), variant=variant)
+
+
+def _probe_in_worker(video_path: str) -> Tuple[int, float]:
+    """Return (frame_count, fps) of a video."""
+    from app.core.pose_model import probe_video
+
+    return probe_video(video_path)
+
+
+def _extract_range_in_worker(
+    video_path: str,
+    start: int,
+    stop: Optional[int],
+    job_id: Optional[str] = None,
+    variant: Optional[str] = None
+) -> ExtractionResult:
+    """Extract one source frame range with the worker's model instance."""
+    from app.core.pose_model import extract_video_range
+
+    return extract_video_range(
+        video_path, start, stop, progress_callback=_worker_progress(job_id), variant=variant
+    )
+
+
+class ExtractionService:
+    """
+    Dispatches extraction jobs to worker processes.
+
+    Each worker process loads the pose model once (in its initializer) and
+    then serves jobs. Admission is bounded: at most `max_pending` jobs may
+    be running or queued at a time, further submissions are rejected.
+    Progress reported by workers is routed back to per-job callbacks.
+
+    With `parallel_chunks` > 1 a long video is split into contiguous frame
+    ranges that are extracted on several workers at once and stitched back
+    together; this still counts as a single admitted job.
+    """
+
+    def __init__(
+        self,
+        workers: int = 2,
+        max_pending: int = 8,
+        parallel_chunks: int = 1,
+        min_chunk_frames: int = 900
+    ):
+        """
+        Initialize service (workers are started lazily or via start()).
+
+        Args:
+            workers: Number of worker processes (0 = run in a thread of the
+                     API process using the in-process model)
+            max_pending: Max jobs running or waiting for a worker
+            parallel_chunks: Frame ranges one video is split into (1 = off;
+                             capped at the number of workers)
+            min_chunk_frames: Minimum source frames per range
+        """
+        self.workers = max(0, workers)
+        self.max_pending = max(1, max_pending)
+        self.parallel_chunks = max(1, min(parallel_chunks, self.workers))
+        self.min_chunk_frames = max(1, min_chunk_frames)
+        self._executor: Optional[Executor] = None
+        self._ready_count = None  # Shared counter of workers with a loaded model
+        self._progress_queue = None
+        self._progress_callbacks: Dict[str, ProgressCallback] = {}
+        self._pending = 0
+        self.ready = False  # All workers loaded and warmed up
+        self.startup_error: Optional[str] = None
+        self._restart_task: Optional[asyncio.Task] = None
+
+    @property
+    def pending(self) -> int:
+        """Number of jobs currently running or queued."""
+        return self._pending
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.workers == 0:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="extract")
+            else:
+                # "spawn" avoids forking a parent that may hold TF/OpenCV threads
+                context = multiprocessing.get_context("spawn")
+                self._ready_count = context.Value("i", 0)
+                self._progress_queue = context.Queue()
+                threading.Thread(
+                    target=self._drain_progress,
+                    args=(self._progress_queue,),
+                    name="extract-progress",
+                    daemon=True
+                ).start()
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=context,
+                    initializer=_init_worker,
+                    initargs=(get_video_config(), self._ready_count, self._progress_queue)
+                )
+        return self._executor
+
+    def _drain_progress(self, progress_queue) -> None:
+        """Background thread: route worker progress messages to job callbacks."""
+        while True:
+            message = progress_queue.get()
+            if message is None:
+                return
+            job_id, done, total = message
+            callback = self._progress_callbacks.get(job_id)
+            if callback is not None:
+                callback(done, total)
+
+    async def start(self) -> None:
+        """Start all workers and wait until each has loaded and warmed up the model."""
+        try:
+            await self._start_workers()
+        except Exception as e:
+            self.startup_error = str(e)
+            raise
+        self.ready = True
+
+    async def _start_workers(self) -> None:
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        if self.workers == 0:
+            from app.core.pose_model import load_models, warm_up_models
+            config = get_video_config()
+            await loop.run_in_executor(executor, warm_up_models if config.warm_up_on_start else load_models)
+            return
+        # Workers are spawned on demand; one task per worker starts them all
+        await asyncio.gather(*[
+            loop.run_in_executor(executor, _worker_ready)
+            for _ in range(self.workers)
+        ])
+        while self._ready_count.value < self.workers:
+            await asyncio.sleep(0.05)
+        print(f"✓ {self.workers} extraction workers ready")
+
+    def submit(
+        self,
+        video_path: str,
+        job_id: Optional[str] = None,
+        on_progress: Optional[ProgressCallback] = None,
+        variant: Optional[str] = None
+    ) -> "asyncio.Future":
+        """
+        Admit an extraction job and dispatch it to a worker.
+
+        Admission happens synchronously, so callers can reject a request
+        before doing any further work.
+
+        Args:
+            video_path: Path to video file
+            job_id: Identifier used to route progress updates
+            on_progress: Optional (frames_processed, total_frames) callback,
+                         invoked from a background thread
+            variant: MoveNet variant to run (None = configured variant);
+                     variants not in warm_variants are loaded on first use
+
+        Returns:
+            Future resolving to the worker's ExtractionResult
+
+        Raises:
+            ExtractionBusyError: If max_pending jobs are already admitted
+        """
+        if self._pending >= self.max_pending:
+            raise ExtractionBusyError(
+                f"Extraction queue is full ({self.max_pending} jobs pending)"
+            )
+
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+
+        if self.workers == 0:
+            from app.core.pose_model import extract_video
+            future = loop.run_in_executor(executor, extract_video, video_path, on_progress, variant)
+        elif self.parallel_chunks > 1:
+            future = asyncio.ensure_future(self._extract_chunked(video_path, on_progress, variant))
+        else:
+            if job_id is not None and on_progress is not None:
+                self._progress_callbacks[job_id] = on_progress
+            future = loop.run_in_executor(executor, _extract_in_worker, video_path, job_id, variant)
+
+        self._pending += 1
+        future.add_done_callback(lambda f: self._on_done(f, job_id))
+        return future
+
+    def _on_done(self, future: "asyncio.Future", job_id: Optional[str]) -> None:
+        self._pending -= 1
+        if job_id is not None:
+            self._progress_callbacks.pop(job_id, None)
+        if not future.cancelled() and isinstance(future.exception(), BrokenProcessPool) and self.ready:
+            # A worker died (e.g. OOM); bring up a fresh, warmed-up pool
+            self.shutdown()
+            self._restart_task = asyncio.ensure_future(self._restart())
+
+    async def _restart(self) -> None:
+        try:
+            await self.start()
+        except Exception as e:
+            print(f"✗ Failed to restart extraction workers: {e}")
+
+    async def _extract_chunked(
+        self,
+        video_path: str,
+        on_progress: Optional[ProgressCallback] = None,
+        variant: Optional[str] = None
+    ) -> ExtractionResult:
+        """
+        Extract a video as parallel frame ranges and stitch the results.
+
+        Falls back to a single sequential extraction if the video is too
+        short to split or the stitched ranges fail boundary verification.
+        """
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        config = get_video_config()
+        started = time.perf_counter()
+
+        frame_count, fps = await loop.run_in_executor(executor, _probe_in_worker, video_path)
+        sampler = FrameSampler(fps, config.target_fps, config.max_frames)
+        end = sampler.end_frame(frame_count)
+        ranges: List[Tuple[int, Optional[int]]] = list(
+            split_frame_range(end, self.parallel_chunks, self.min_chunk_frames)
+        )
+
+        if len(ranges) <= 1 or fps <= 0:
+            return await self._extract_sequential(video_path, on_progress, variant)
+
+        if end == frame_count:
+            # Frame counts from container metadata can be short; read the tail to EOF
+            ranges[-1] = (ranges[-1][0], None)
+
+        run_id = uuid.uuid4().hex
+        chunk_ids = [f"{run_id}:{k}" for k in range(len(ranges))]
+        if on_progress is not None:
+            total_frames = sampler.expected_frames(frame_count)
+            chunk_done = [0] * len(ranges)
+            lock = threading.Lock()
+
+            def chunk_progress(k: int) -> ProgressCallback:
+                def update(done: int, total: int) -> None:
+                    with lock:
+                        chunk_done[k] = done
+                        processed = sum(chunk_done)
+                    on_progress(processed, max(processed, total_frames))
+                return update
+
+            for k, chunk_id in enumerate(chunk_ids):
+                self._progress_callbacks[chunk_id] = chunk_progress(k)
+
+        try:
+            results = await asyncio.gather(*[
+                loop.run_in_executor(
+                    executor, _extract_range_in_worker, video_path, start, stop, chunk_id, variant
+                )
+                for (start, stop), chunk_id in zip(ranges, chunk_ids)
+            ])
+        finally:
+            for chunk_id in chunk_ids:
+                self._progress_callbacks.pop(chunk_id, None)
+
+        stitched_end = max(result.source_range[1] for result in results)
+        duration_seconds = stitched_end / fps
+        try:
+            result = stitch_results(
+                results, ranges, sampler, duration_seconds, time.perf_counter() - started
+            )
+        except ChunkBoundaryError as e:
+            print(f"⚠ Chunked extraction of {video_path} failed verification ({e}); re-running sequentially")
+            return await self._extract_sequential(video_path, on_progress, variant)
+
+        timings = result.timings
+        print(
+            f"Extracted {timings.frames} frames in {len(ranges)} ranges in "
+            f"{timings.wall_seconds:.2f}s ({timings.frames_per_second:.1f} fps)"
+        )
+        return result
+
+    async def _extract_sequential(
+        self,
+        video_path: str,
+        on_progress: Optional[ProgressCallback] = None,
+        variant: Optional[str] = None
+    ) -> ExtractionResult:
+        """Extract a whole video on one worker (used by the chunked path)."""
+        loop = asyncio.get_running_loop()
+        job_id = uuid.uuid4().hex
+        if on_progress is not None:
+            self._progress_callbacks[job_id] = on_progress
+        try:
+            return await loop.run_in_executor(
+                self._get_executor(), _extract_in_worker, video_path, job_id, variant
+            )
+        finally:
+            self._progress_callbacks.pop(job_id, None)
+
+    async def extract(
+        self,
+        video_path: str,
+        job_id: Optional[str] = None,
+        on_progress: Optional[ProgressCallback] = None,
+        variant: Optional[str] = None
+    ):
+        """
+        Extract keypoints from a video without blocking the event loop.
+
+        Args:
+            video_path: Path to video file
+            job_id: Identifier used to route progress updates
+            on_progress: Optional (frames_processed, total_frames) callback
+            variant: MoveNet variant to run (None = configured variant)
+
+        Returns:
+            ExtractionResult from the worker
+
+        Raises:
+            ExtractionBusyError: If max_pending jobs are already admitted
+        """
+        return await self.submit(video_path, job_id, on_progress, variant)
+
+    def shutdown(self) -> None:
+        """Stop all workers."""
+        self.ready = False
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        if self._progress_queue is not None:
+            self._progress_queue.put(None)
+            self._progress_queue = None
+
+
+# Global service instance
+_extraction_service: Optional[ExtractionService] = None
+
+
+def get_extraction_service() -> ExtractionService:
+    """Get or create the global extraction service."""
+    global _extraction_service
+    if _extraction_service is None:
+        config = get_video_config()
+        _extraction_service = ExtractionService(
+            workers=config.extraction_workers,
+            max_pending=config.max_pending_extractions,
+            parallel_chunks=config.parallel_chunks,
+            min_chunk_frames=config.min_chunk_frames
+        )
+    return _extraction_service
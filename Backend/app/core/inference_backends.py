@@ -0,0 +1,220 @@
+"""
+MoveNet Inference Backends
+Interchangeable runtimes that turn prepared RGB frames into raw MoveNet
+keypoints, selected by VideoProcessingConfig.inference_backend.
+"""
+
+import os
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from app.core.config import MOVENET_VARIANTS, VideoProcessingConfig
+
+
+class InferenceBackend:
+    """
+    Base class for MoveNet runtimes.
+
+    Backends receive frames already resized to `input_size` and converted
+    to RGB, and return raw MoveNet output as (y, x, confidence) rows.
+    """
+
+    name = "base"
+
+    def __init__(self, input_size: int):
+        self.input_size = input_size
+
+    def infer(self, images: List[np.ndarray], batch_size: int = 1) -> np.ndarray:
+        """
+        Run MoveNet on prepared frames.
+
+        Args:
+            images: RGB uint8 frames, each (input_size, input_size, 3)
+            batch_size: Preferred frames per runtime call (backends may ignore it)
+
+        Returns:
+            Raw keypoints, shape (len(images), 17, 3) as (y, x, confidence)
+        """
+        raise NotImplementedError
+
+
+class SavedModelBackend(InferenceBackend):
+    """TensorFlow SavedModel runtime (local model directory, or TF Hub fallback)."""
+
+    name = "saved_model"
+
+    def __init__(self, input_size: int, model_dir: str, hub_url: str):
+        """
+        Load the MoveNet SavedModel.
+
+        Args:
+            input_size: Model input resolution
+            model_dir: Local SavedModel directory
+            hub_url: TF Hub handle used when model_dir does not exist
+        """
+        super().__init__(input_size)
+        import tensorflow as tf
+        self._tf = tf
+
+        if os.path.exists(model_dir):
+            print(f"Loading MoveNet model from {model_dir}")
+            self.model = tf.saved_model.load(model_dir)
+            self.movenet = self.model.signatures['serving_default']
+        else:
+            # Fallback: try to load from TensorFlow Hub
+            print(f"Loading MoveNet model from TensorFlow Hub ({hub_url})...")
+            import tensorflow_hub as hub
+            model = hub.load(hub_url)
+            self.movenet = model.signatures['serving_default']
+
+        # Batched inference functions, keyed by batch size
+        self._batched_fns: Dict[int, object] = {}
+
+    def infer(self, images: List[np.ndarray], batch_size: int = 1) -> np.ndarray:
+        tf = self._tf
+        if batch_size <= 1 and len(images) == 1:
+            # MoveNet output shape: [1, 1, 17, 3] - 17 keypoints with (y, x, confidence)
+            outputs = self.movenet(tf.cast(images[0][np.newaxis], dtype=tf.int32))
+            return outputs['output_0'].numpy()[:, 0, :, :]
+        return self._run_batched(images, batch_size)
+
+    def _run_batched(self, images: List[np.ndarray], batch_size: int) -> np.ndarray:
+        """
+        Run a stack of frames through one batched graph call.
+
+        The batch is padded up to the configured batch size so every call
+        reuses the same concrete function instead of retracing.
+        """
+        batch_size = max(len(images), batch_size)
+        batch = np.zeros((batch_size, self.input_size, self.input_size, 3), dtype=np.int32)
+        batch[:len(images)] = np.stack(images)
+
+        outputs = self._get_batched_fn(batch_size)(self._tf.convert_to_tensor(batch))
+        return outputs.numpy()[:len(images)]
+
+    def _get_batched_fn(self, batch_size: int):
+        """Return (and cache) a concrete tf.function for a fixed batch size."""
+        fn = self._batched_fns.get(batch_size)
+        if fn is not None:
+            return fn
+
+        tf = self._tf
+        movenet = self.movenet
+
+        @tf.function(input_signature=[
+            tf.TensorSpec([batch_size, self.input_size, self.input_size, 3], tf.int32)
+        ])
+        def run_batch(images):
+            # Single-pose MoveNet signatures only accept a batch of one image.
+            # Unrolling inside one graph lets TF schedule the per-frame
+            # subgraphs in parallel and dispatches the whole batch at once.
+            outputs = [
+                movenet(images[i:i + 1])['output_0'][0, 0]
+                for i in range(batch_size)
+            ]
+            return tf.stack(outputs)
+
+        fn = run_batch.get_concrete_function()
+        self._batched_fns[batch_size] = fn
+        return fn
+
+
+def _load_tflite_interpreter_class():
+    """Return a TFLite Interpreter class from whichever runtime is installed."""
+    try:
+        from tflite_runtime.interpreter import Interpreter
+        return Interpreter
+    except ImportError:
+        pass
+    try:
+        from ai_edge_litert.interpreter import Interpreter
+        return Interpreter
+    except ImportError:
+        pass
+    import tensorflow as tf
+    return tf.lite.Interpreter
+
+
+class TFLiteBackend(InferenceBackend):
+    """
+    TFLite runtime for float16 / int8 MoveNet models.
+
+    Float models run through the XNNPACK delegate, which TFLite applies by
+    default on CPU; `num_threads` sets the interpreter's thread pool size.
+    """
+
+    name = "tflite"
+
+    def __init__(self, model_path: str, input_size: int = 256, num_threads: Optional[int] = None):
+        """
+        Load a MoveNet .tflite model.
+
+        Args:
+            model_path: Path to the .tflite file
+            input_size: Model input resolution
+            num_threads: Interpreter threads (None = runtime default)
+        """
+        super().__init__(input_size)
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(f"TFLite model not found: {model_path}")
+
+        print(f"Loading MoveNet TFLite model from {model_path} (threads: {num_threads or 'default'})")
+        Interpreter = _load_tflite_interpreter_class()
+        self.interpreter = Interpreter(model_path=model_path, num_threads=num_threads)
+        self.interpreter.allocate_tensors()
+
+        input_details = self.interpreter.get_input_details()[0]
+        self._input_index = input_details['index']
+        self._input_dtype = input_details['dtype']
+        self._output_index = self.interpreter.get_output_details()[0]['index']
+
+        model_size = int(input_details['shape'][1])
+        if model_size != input_size:
+            raise ValueError(
+                f"TFLite model expects {model_size}x{model_size} input, config has input_size={input_size}"
+            )
+
+    def infer(self, images: List[np.ndarray], batch_size: int = 1) -> np.ndarray:
+        # Single-pose MoveNet TFLite models have a fixed batch of one
+        raw = np.empty((len(images), 17, 3), dtype=np.float32)
+        for i, image in enumerate(images):
+            self.interpreter.set_tensor(
+                self._input_index,
+                image[np.newaxis].astype(self._input_dtype, copy=False)
+            )
+            self.interpreter.invoke()
+            # Output shape: [1, 1, 17, 3]
+            raw[i] = self.interpreter.get_tensor(self._output_index)[0, 0]
+        return raw
+
+
+BACKENDS = ("saved_model", "tflite")
+
+
+def create_backend(config: VideoProcessingConfig, name: Optional[str] = None) -> InferenceBackend:
+    """
+    Build the inference backend selected in config.
+
+    Args:
+        config: Video processing config (model variant and backend)
+        name: Override config.inference_backend
+
+    Returns:
+        Loaded InferenceBackend
+    """
+    name = name or config.inference_backend
+    variant = MOVENET_VARIANTS[config.get_model_variant()]
+    if name == "saved_model":
+        return SavedModelBackend(
+            input_size=variant["input_size"],
+            model_dir=variant["model_dir"],
+            hub_url=variant["hub_url"]
+        )
+    if name == "tflite":
+        return TFLiteBackend(
+            model_path=config.get_tflite_model_path(),
+            input_size=variant["input_size"],
+            num_threads=config.get_tflite_num_threads()
+        )
+    raise ValueError(f"Unknown inference backend '{name}'. Available: {', '.join(BACKENDS)}")
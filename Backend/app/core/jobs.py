@@ -0,0 +1,116 @@
+"""
+Background Job Registry
+Tracks asynchronous video processing jobs and their progress.
+"""
+
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+
+# Job states
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+
+FINISHED_STATES = (JOB_COMPLETED, JOB_FAILED)
+
+
+@dataclass
+class Job:
+    """State of one asynchronous processing job."""
+
+    job_id: str
+    filename: str
+    status: str = JOB_QUEUED
+    frames_processed: int = 0
+    total_frames: Optional[int] = None
+    result: Optional[Dict] = None  # ProcessVideoResponse payload once completed
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    updated_at: float = field(default_factory=time.time)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATES
+
+    @property
+    def progress(self) -> float:
+        """Fraction of frames processed (0-1)."""
+        if self.status == JOB_COMPLETED:
+            return 1.0
+        if not self.total_frames:
+            return 0.0
+        return min(1.0, self.frames_processed / self.total_frames)
+
+    def update_progress(self, frames_processed: int, total_frames: int) -> None:
+        """Record extraction progress (safe to call from a background thread)."""
+        if self.finished:
+            return
+        self.frames_processed = frames_processed
+        self.total_frames = total_frames
+        self.status = JOB_RUNNING
+        self.updated_at = time.time()
+
+    def complete(self, result: Dict) -> None:
+        self.result = result
+        self.status = JOB_COMPLETED
+        self.updated_at = time.time()
+
+    def fail(self, error: str) -> None:
+        self.error = error
+        self.status = JOB_FAILED
+        self.updated_at = time.time()
+
+
+class JobManager:
+    """In-memory registry of processing jobs for this API process."""
+
+    def __init__(self, retention_seconds: float = 3600.0):
+        """
+        Initialize job registry.
+
+        Args:
+            retention_seconds: How long finished jobs stay queryable
+        """
+        self.retention_seconds = retention_seconds
+        self._jobs: Dict[str, Job] = {}
+
+    def create(self, filename: str) -> Job:
+        """Register a new queued job."""
+        self._prune()
+        job = Job(job_id=str(uuid.uuid4()), filename=filename)
+        self._jobs[job.job_id] = job
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Return a job by ID, or None if unknown or expired."""
+        return self._jobs.get(job_id)
+
+    def remove(self, job_id: str) -> bool:
+        """Forget a job (e.g. one that was never admitted); True if it existed."""
+        return self._jobs.pop(job_id, None) is not None
+
+    def _prune(self) -> None:
+        """Drop finished jobs older than the retention period."""
+        cutoff = time.time() - self.retention_seconds
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished and job.updated_at < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+
+# Global job manager instance
+_job_manager: Optional[JobManager] = None
+
+
+def get_job_manager() -> JobManager:
+    """Get or create the global job manager."""
+    global _job_manager
+    if _job_manager is None:
+        _job_manager = JobManager()
+    return _job_manager
@@ -0,0 +1,235 @@
+"""
+Live Pose Ingestion
+Per-connection state for streaming encoded camera frames through the pose
+model one at a time.
+
+Backpressure is latest-frame-wins: while a frame is being inferred, newly
+arriving frames replace the one waiting in a single slot, so a slow model
+drops frames instead of building up latency.
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from app.core.config import VideoProcessingConfig, get_video_config
+from app.core.crop import CropTracker
+from app.core.embedding import frame_feature_from_keypoints
+from app.core.online_dtw import OnlineAlignment, OnlineDTW
+from app.core.pipeline import ExtractionResult, StageTimings
+from app.core.pose_model import PoseModel
+
+
+class LiveIngestSession:
+    """Frame slot and accumulated keypoints of one live stream."""
+
+    def __init__(
+        self,
+        model: PoseModel,
+        config: VideoProcessingConfig,
+        aligner: Optional[OnlineDTW] = None
+    ):
+        """
+        Initialize live stream state.
+
+        Args:
+            model: Loaded pose model
+            config: Extraction config of the stream
+            aligner: Online DTW against a reference session (None = no live scoring)
+        """
+        self.model = model
+        self.config = config
+        self.aligner = aligner
+        self.alignment: Optional[OnlineAlignment] = None  # After the last processed frame
+        self.tracker: Optional[CropTracker] = None
+        if config.use_smart_crop:
+            self.tracker = CropTracker(model.input_size, config.crop_min_keypoint_score, config.crop_redetect_score)
+
+        self.keypoints: List[np.ndarray] = []
+        self.timestamps: List[float] = []
+        self.received = 0
+        self.dropped = 0
+        self.inference_seconds = 0.0
+
+        self._pending: Optional[Tuple[bytes, float, float]] = None
+        self._wakeup = asyncio.Event()
+        self._closed = False
+        self._started: Optional[float] = None
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def offer(self, data: bytes) -> None:
+        """
+        Hand over an encoded frame (called from the receive loop).
+
+        Replaces the frame still waiting for inference, if any.
+
+        Args:
+            data: Encoded image (JPEG / PNG / WebP)
+        """
+        now = time.perf_counter()
+        if self._started is None:
+            self._started = now
+        self.received += 1
+        if len(data) > self.config.live_max_frame_bytes:
+            self.dropped += 1
+            return
+        if self._pending is not None:
+            self.dropped += 1
+        self._pending = (data, now - self._started, now)
+        self._wakeup.set()
+
+    def close(self) -> None:
+        """Mark the end of the stream; the frame still waiting is processed."""
+        self._closed = True
+        self._wakeup.set()
+
+    async def next_frame(self) -> Optional[Tuple[bytes, float, float]]:
+        """
+        Wait for the newest unprocessed frame.
+
+        Returns:
+            (encoded frame, stream timestamp in seconds, receive time), or
+            None once the stream is closed and drained
+        """
+        while self._pending is None:
+            if self._closed:
+                return None
+            self._wakeup.clear()
+            await self._wakeup.wait()
+        pending, self._pending = self._pending, None
+        return pending
+
+    def process(self, data: bytes, timestamp: float) -> Optional[np.ndarray]:
+        """
+        Decode a frame and run pose estimation on it (blocking; run in the live executor).
+
+        Args:
+            data: Encoded image
+            timestamp: Stream time of the frame in seconds
+
+        Returns:
+            Normalized keypoints (17, 3), or None if the frame could not be decoded
+        """
+        frame = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+        if frame is None:
+            return None
+
+        start = time.perf_counter()
+        keypoints = self.model.infer_frame(frame, self.tracker)
+        self.inference_seconds += time.perf_counter() - start
+
+        if self.aligner is not None:
+            self.alignment = self.aligner.update(frame_feature_from_keypoints(keypoints))
+
+        self.keypoints.append(keypoints)
+        self.timestamps.append(timestamp)
+        return keypoints
+
+    def to_extraction(self, wall_seconds: float) -> ExtractionResult:
+        """
+        Accumulated sequence as an ExtractionResult (for the normal session path).
+
+        Args:
+            wall_seconds: Duration of the connection
+
+        Returns:
+            ExtractionResult of every inferred frame
+        """
+        frames = len(self.keypoints)
+        keypoints = np.stack(self.keypoints) if frames else np.zeros((0, 17, 3), dtype=np.float32)
+        return ExtractionResult(
+            keypoints=keypoints,
+            duration_seconds=self.timestamps[-1] if frames else 0.0,
+            timings=StageTimings(
+                inference_seconds=self.inference_seconds,
+                wall_seconds=wall_seconds,
+                frames=frames
+            ),
+            timestamps=[round(t, 4) for t in self.timestamps],
+            frame_indices=list(range(frames)),
+            source_range=(0, self.received)
+        )
+
+
+# Single inference thread shared by all live streams (keeps the model
+# single-threaded and off the event loop)
+_live_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_live_executor() -> ThreadPoolExecutor:
+    """Get or create the live inference executor."""
+    global _live_executor
+    if _live_executor is None:
+        _live_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="live-pose")
+    return _live_executor
+
+
+# Pose models of live streams, separate from pose_model.load_model's: with
+# extraction_workers=0 extraction runs in this process on another thread,
+# and an inference backend (e.g. a TFLite interpreter) is not thread-safe.
+# Only used on the live executor thread, so no lock is needed.
+_live_models: Dict[str, PoseModel] = {}
+
+# Warm-up state of the pose models used by live streams in this process
+_live_models_ready = False
+_live_startup_error: Optional[str] = None
+
+
+def load_live_model(variant: Optional[str] = None) -> PoseModel:
+    """
+    Load (once) and return the live streams' pose model for a variant.
+
+    Must run on the live executor (get_live_executor).
+
+    Args:
+        variant: MoveNet variant name (None = configured variant)
+
+    Returns:
+        PoseModel for the variant
+    """
+    config = get_video_config()
+    variant = variant or config.get_model_variant()
+    model = _live_models.get(variant)
+    if model is None:
+        model = PoseModel(config.for_variant(variant))
+        _live_models[variant] = model
+    return model
+
+
+def warm_up_live_models() -> None:
+    """
+    Load and warm up the configured pose models for live streams (blocking).
+
+    Run in the live executor at startup so the first stream does not pay
+    for loading the model and tracing its graph; /ready waits for it.
+    """
+    global _live_models_ready, _live_startup_error
+    config = get_video_config()
+    try:
+        for variant in config.get_loaded_variants():
+            model = load_live_model(variant)
+            if config.warm_up_on_start:
+                timings = model.warm_up(config)
+                summary = ", ".join(f"{path} {seconds:.2f}s" for path, seconds in timings.items())
+                print(f"✓ Warmed up live MoveNet {model.variant} ({model.backend.name}): {summary}")
+    except Exception as e:
+        _live_startup_error = str(e)
+        raise
+    _live_models_ready = True
+
+
+def live_models_ready() -> bool:
+    """True once warm_up_live_models has finished."""
+    return _live_models_ready
+
+
+def live_startup_error() -> Optional[str]:
+    """Error of a failed live model warm-up, if any."""
+    return _live_startup_error
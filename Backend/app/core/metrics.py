@@ -3,7 +3,9 @@ Metrics Calculation Module with DTW Implementation
 Computes performance metrics, movement deviations, and stressed joints.
 """
 
-from typing import Tuple, List, Dict
+from dataclasses import dataclass
+from typing import Callable, Tuple, List, Dict, Optional
+import heapq
 import numpy as np
 
 def pairwise_distances(A: np.ndarray, B: np.ndarray) -> np.ndarray:
@@ -16,9 +18,11 @@ def pairwise_distances(A: np.ndarray, B: np.ndarray) -> np.ndarray:
         d = np.sum((A[:, None, :] - B[None, :, :])**2, axis=2)
         return np.sqrt(d)
 
-def dtw_distance_matrix(D: np.ndarray, window: int = None) -> Tuple[float, List[Tuple[int,int]], np.ndarray]:
+def dtw_distance_matrix_reference(D: np.ndarray, window: int = None) -> Tuple[float, List[Tuple[int,int]], np.ndarray]:
     """
-    Dynamic time warping with optional Sakoe-Chiba band constraint.
+    Reference (cell-by-cell) DTW with optional Sakoe-Chiba band constraint.
+    
+    Kept as the ground truth for dtw_distance_matrix; too slow for long sequences.
     
     Args:
         D: Distance matrix (n x m)
@@ -60,7 +64,513 @@ def dtw_distance_matrix(D: np.ndarray, window: int = None) -> Tuple[float, List[
     path.reverse()
     return float(total_cost), path, cost[1:,1:]
 
-def run_dtw(A: np.ndarray, B: np.ndarray, window: int = None, use_fastdtw: bool = False) -> Dict:
+def _diagonal(flat: np.ndarray, start: int, count: int, step: int) -> np.ndarray:
+    """View of `count` elements of a flat array starting at `start`, `step` apart."""
+    if count == 1:
+        return flat[start:start + 1]
+    return flat[start:start + (count - 1) * step + 1:step]
+
+def _backtrack(cost: np.ndarray) -> List[Tuple[int,int]]:
+    """Warping path from a padded (n+1, m+1) cost matrix (prefers diagonal, then up, then left)."""
+    i, j = cost.shape[0] - 1, cost.shape[1] - 1
+    path = []
+    while i > 0 and j > 0:
+        path.append((i-1, j-1))
+        neighbors = [(cost[i-1,j-1], i-1,j-1), (cost[i-1,j], i-1,j), (cost[i,j-1], i,j-1)]
+        prev_cost, pi, pj = min(neighbors, key=lambda x: x[0])
+        i, j = pi, pj
+    path.reverse()
+    return path
+
+def dtw_distance_matrix(D: np.ndarray, window: int = None) -> Tuple[float, List[Tuple[int,int]], np.ndarray]:
+    """
+    Dynamic time warping with optional Sakoe-Chiba band constraint.
+    
+    Fills the cost matrix one anti-diagonal (i + j = const) at a time: every
+    cell on an anti-diagonal depends only on the two previous ones, so each
+    is a single vectorized update. On the flattened matrix an anti-diagonal
+    is a strided slice, so no index arrays are built. Cost matrix and path
+    are identical to dtw_distance_matrix_reference.
+    
+    Args:
+        D: Distance matrix (n x m)
+        window: Sakoe-Chiba window width (None = no constraint)
+                Recommended: 10-20% of max(n,m) for long sequences
+    
+    Returns:
+        (total_cost, path, cost_matrix)
+    """
+    D = np.ascontiguousarray(D, dtype=float)
+    n, m = D.shape
+    cost = np.full((n+1, m+1), np.inf, dtype=float)
+    cost[0,0] = 0.0
+    if n == 0 or m == 0:
+        return float(cost[n, m]), [], cost[1:,1:]
+    
+    if window is None:
+        window = max(n, m)  # No constraint
+    
+    cost_flat = cost.ravel()
+    d_flat = D.ravel()
+    row = m + 1  # Row stride of the padded cost matrix
+    
+    # Cell (i, j) of the padded matrix (1-based) lies on anti-diagonal k = i + j
+    for k in range(2, n + m + 1):
+        # Rows on this anti-diagonal inside the matrix and the band |i - j| <= window
+        i_lo = max(1, k - m, -(-(k - window) // 2))
+        i_hi = min(n, k - 1, (k + window) // 2)
+        if i_lo > i_hi:
+            continue
+        count = i_hi - i_lo + 1
+        
+        # Moving along the anti-diagonal (i+1, j-1) is a step of m in the flat cost
+        start = i_lo * row + (k - i_lo)
+        up = _diagonal(cost_flat, start - row, count, m)
+        left = _diagonal(cost_flat, start - 1, count, m)
+        diag = _diagonal(cost_flat, start - row - 1, count, m)
+        local = _diagonal(d_flat, (i_lo - 1) * m + (k - i_lo - 1), count, m - 1)
+        
+        _diagonal(cost_flat, start, count, m)[:] = local + np.minimum(np.minimum(up, left), diag)
+    
+    total_cost = cost[n, m]
+    return float(total_cost), _backtrack(cost), cost[1:,1:]
+
+@dataclass
+class BandedCostMatrix:
+    """
+    Accumulated DTW cost inside a Sakoe-Chiba band, stored in O(n*w).
+    
+    Row i of `band` holds padded cost cells (i, j) for j - i in
+    [-window - 1, window + 1] at column j - i + window + 1; the first and last
+    columns are always inf guards. Row 0 / column 0 are the DTW padding.
+    """
+    band: np.ndarray  # (n+1, 2*window+3)
+    window: int
+    shape: Tuple[int,int]  # (n, m) of the underlying distance matrix
+    
+    def row_bounds(self, i: int) -> Tuple[int,int]:
+        """Columns [lo, hi) of the (unpadded) n x m matrix stored for row i."""
+        n, m = self.shape
+        return max(0, i - self.window), min(m, i + self.window + 1)
+    
+    def padded(self, i: int, j: int) -> float:
+        """Cost of padded cell (i, j); inf outside the band."""
+        c = j - i + self.window + 1
+        if 0 <= c < self.band.shape[1]:
+            return self.band[i, c]
+        return np.inf
+    
+    def to_dense(self) -> np.ndarray:
+        """Full (n, m) cost matrix with inf outside the band (as dtw_distance_matrix returns)."""
+        n, m = self.shape
+        dense = np.full((n, m), np.inf)
+        for i in range(n):
+            lo, hi = self.row_bounds(i)
+            if lo >= hi:
+                continue
+            dense[i, lo:hi] = self.band[i+1, lo - i + self.window + 1:hi - i + self.window + 1]
+        return dense
+
+def banded_pairwise_distances(A: np.ndarray, B: np.ndarray, window: int, block_rows: int = 256) -> np.ndarray:
+    """
+    Euclidean distances of A (n, d) and B (m, d) only inside a Sakoe-Chiba band.
+    
+    Rows are processed in blocks through pairwise_distances (so values are
+    identical to the full matrix) and scattered into band layout.
+    
+    Args:
+        A: Reference sequence (n, d)
+        B: User sequence (m, d)
+        window: Band half-width (|i - j| <= window)
+        block_rows: Rows of A per pairwise_distances call
+    
+    Returns:
+        (n, 2*window+3) array; cell (i, j) at column j - i + window + 1, inf elsewhere
+    """
+    n, m = A.shape[0], B.shape[0]
+    width = 2 * window + 3
+    band = np.full((n, width), np.inf)
+    for r0 in range(0, n, block_rows):
+        r1 = min(n, r0 + block_rows)
+        rows = r1 - r0
+        c0, c1 = max(0, r0 - window), min(m, r1 + window)
+        if c0 >= c1:
+            continue
+        # Columns j in [r0 - window - 1, r1 + window + 1), inf where j is outside B
+        pad_width = rows + 2 * window + 2
+        padded = np.full((rows, pad_width), np.inf)
+        offset = r0 - window - 1
+        padded[:, c0 - offset:c1 - offset] = pairwise_distances(A[r0:r1], B[c0:c1])
+        # Band cell (r, c) is padded[r - r0, (r - r0) + c]: a strided view
+        band[r0:r1] = np.lib.stride_tricks.as_strided(
+            padded, shape=(rows, width),
+            strides=(padded.strides[0] + padded.strides[1], padded.strides[1]),
+            writeable=False
+        )
+    # Guard columns (|i - j| = window + 1) are outside the band
+    band[:, 0] = np.inf
+    band[:, -1] = np.inf
+    return band
+
+def dtw_banded(A: np.ndarray, B: np.ndarray, window: int) -> Tuple[float, List[Tuple[int,int]], BandedCostMatrix]:
+    """
+    Windowed DTW with distances and cost stored only inside the band.
+    
+    Memory is O(n * window) instead of the O(n * m) distance and cost
+    matrices of dtw_distance_matrix; cost, path and tie-breaking are the
+    same. The path is traced back from the banded cost.
+    
+    Args:
+        A: Reference sequence (n, d)
+        B: User sequence (m, d)
+        window: Sakoe-Chiba window width
+    
+    Returns:
+        (total_cost, path, banded_cost_matrix)
+    """
+    n, m = A.shape[0], B.shape[0]
+    width = 2 * window + 3
+    cost = np.full((n+1, width), np.inf)
+    cost[0, window+1] = 0.0
+    result = BandedCostMatrix(band=cost, window=window, shape=(n, m))
+    if n == 0 or m == 0:
+        return float(result.padded(n, m)), [], result
+    
+    d_flat = banded_pairwise_distances(A, B, window).ravel()
+    cost_flat = cost.ravel()
+    step = width - 2  # (i+1, j-1) is two band columns left, one row down
+    
+    for k in range(2, n + m + 1):
+        i_lo = max(1, k - m, -(-(k - window) // 2))
+        i_hi = min(n, k - 1, (k + window) // 2)
+        if i_lo > i_hi:
+            continue
+        count = i_hi - i_lo + 1
+        
+        start = i_lo * width + (k - 2 * i_lo + window + 1)
+        up = _diagonal(cost_flat, start - width + 1, count, step)
+        left = _diagonal(cost_flat, start - 1, count, step)
+        diag = _diagonal(cost_flat, start - width, count, step)
+        local = _diagonal(d_flat, start - width, count, step)
+        
+        _diagonal(cost_flat, start, count, step)[:] = local + np.minimum(np.minimum(up, left), diag)
+    
+    # Backtrack (same neighbor order and tie-breaking as _backtrack)
+    i, j = n, m
+    path = []
+    while i > 0 and j > 0:
+        path.append((i-1, j-1))
+        neighbors = [
+            (result.padded(i-1, j-1), i-1, j-1),
+            (result.padded(i-1, j), i-1, j),
+            (result.padded(i, j-1), i, j-1)
+        ]
+        prev_cost, i, j = min(neighbors, key=lambda x: x[0])
+    path.reverse()
+    return float(result.padded(n, m)), path, result
+
+def dtw_column_ranges(
+    A: np.ndarray,
+    B: np.ndarray,
+    lo: np.ndarray,
+    hi: np.ndarray,
+    block_rows: int = 256
+) -> Tuple[float, List[Tuple[int,int]]]:
+    """
+    DTW restricted to a window of column ranges, one per row.
+    
+    Row i may only use columns [lo[i], hi[i]). Both bounds must be
+    non-decreasing with lo[0] = 0 and hi[-1] = m (as produced by projecting a
+    warping path), so the cells of every anti-diagonal are contiguous and
+    the wavefront applies. Distances and cost are stored per row, shifted
+    by lo[i], so memory is O(n * max(hi - lo)).
+    
+    Args:
+        A: Reference sequence (n, d)
+        B: User sequence (m, d)
+        lo: First allowed column per row (n,)
+        hi: End (exclusive) of the allowed columns per row (n,)
+        block_rows: Rows of A per pairwise_distances call
+    
+    Returns:
+        (total_cost, path) of the best warping path inside the window
+    """
+    n, m = A.shape[0], B.shape[0]
+    lo = np.asarray(lo, dtype=np.int64)
+    hi = np.asarray(hi, dtype=np.int64)
+    width = int((hi - lo).max()) + 2  # Column 0 and width - 1 are inf guards
+    
+    # Padded row I holds padded columns J at J - shift[I]; row 0 only (0, 0)
+    shift = np.concatenate(([-1], lo))
+    dist = np.full((n+1, width), np.inf)
+    offsets = np.arange(width - 2)
+    for r0 in range(0, n, block_rows):
+        r1 = min(n, r0 + block_rows)
+        c0, c1 = int(lo[r0]), int(hi[r1-1])
+        D = pairwise_distances(A[r0:r1], B[c0:c1])
+        columns = lo[r0:r1, None] + offsets[None, :]
+        inside = columns < hi[r0:r1, None]
+        dist[r0+1:r1+1, 1:-1] = np.where(
+            inside,
+            D[np.arange(r1 - r0)[:, None], np.minimum(columns, c1 - 1) - c0],
+            np.inf
+        )
+    
+    cost = np.full((n+1, width), np.inf)
+    cost[0, 1] = 0.0
+    cost_flat = cost.ravel()
+    
+    # Flat indices of every window cell and its neighbors, grouped by
+    # anti-diagonal K = I + J (the cells of one anti-diagonal are independent)
+    counts = hi - lo
+    I = np.repeat(np.arange(1, n+1), counts)
+    J = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts) + np.repeat(lo, counts) + 1
+    order = np.argsort(I + J, kind="stable")
+    I, J = I[order], J[order]
+    here = I * width + (J - shift[I])
+    above = (I - 1) * width
+    up = above + np.minimum(J - shift[I-1], width - 1)
+    diag = above + np.minimum(J - 1 - shift[I-1], width - 1)
+    left = here - 1
+    local = dist.ravel()[here]
+    bounds = np.searchsorted((I + J), np.arange(2, n + m + 2)).tolist()
+    
+    for a, b in zip(bounds[:-1], bounds[1:]):
+        cost_flat[here[a:b]] = local[a:b] + np.minimum(
+            np.minimum(cost_flat[up[a:b]], cost_flat[left[a:b]]), cost_flat[diag[a:b]]
+        )
+    
+    def padded(i: int, j: int) -> float:
+        c = j - shift[i]
+        return cost[i, c] if 0 <= c < width else np.inf
+    
+    # Backtrack (same neighbor order and tie-breaking as _backtrack)
+    i, j = n, m
+    path = []
+    while i > 0 and j > 0:
+        path.append((i-1, j-1))
+        neighbors = [(padded(i-1, j-1), i-1, j-1), (padded(i-1, j), i-1, j), (padded(i, j-1), i, j-1)]
+        prev_cost, i, j = min(neighbors, key=lambda x: x[0])
+    path.reverse()
+    return float(padded(n, m)), path
+
+def _halve(X: np.ndarray) -> np.ndarray:
+    """PAA with segments of two frames (an odd last frame stays on its own)."""
+    n = X.shape[0]
+    half = (X[0:n-1:2] + X[1:n:2]) / 2
+    if n % 2:
+        half = np.concatenate([half, X[-1:]])
+    return half
+
+def _project_window(path: List[Tuple[int,int]], n: int, m: int, radius: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Column ranges at full resolution around a path found at half resolution.
+    
+    The coarse path is widened by `radius` coarse cells in both directions,
+    then every coarse cell is expanded to the 2 x 2 cells it covers.
+    
+    Returns:
+        (lo, hi) column ranges for the n rows of the full-resolution matrix
+    """
+    coarse = np.asarray(path)
+    rows_coarse = -(-n // 2)
+    cols_coarse = -(-m // 2)
+    # Column span of the path on each coarse row (paths are monotone)
+    path_lo = np.full(rows_coarse, cols_coarse)
+    path_hi = np.full(rows_coarse, -1)
+    np.minimum.at(path_lo, coarse[:, 0], coarse[:, 1])
+    np.maximum.at(path_hi, coarse[:, 0], coarse[:, 1])
+    
+    # Widen: row I takes the spans of rows I - radius .. I + radius, +/- radius columns
+    index = np.arange(rows_coarse)
+    lo_coarse = np.maximum(path_lo[np.maximum(index - radius, 0)] - radius, 0)
+    hi_coarse = np.minimum(path_hi[np.minimum(index + radius, rows_coarse - 1)] + radius, cols_coarse - 1)
+    
+    rows = np.arange(n) // 2
+    lo = 2 * lo_coarse[rows]
+    hi = np.minimum(2 * hi_coarse[rows] + 2, m)
+    return lo, hi
+
+def fast_dtw(A: np.ndarray, B: np.ndarray, radius: int = 10) -> Tuple[float, List[Tuple[int,int]]]:
+    """
+    Multiresolution DTW approximation (FastDTW, Salvador & Chan).
+    
+    Both sequences are halved by PAA until they are shorter than
+    radius + 2, aligned exactly there, and the path is then projected one
+    resolution up and refined inside a window of `radius` coarse cells
+    around it. Each refinement uses the vectorized column-range kernel
+    (dtw_column_ranges), so time and memory are O((n + m) * radius).
+    
+    The returned cost belongs to a valid warping path, so it is never below
+    the exact DTW cost; larger radii get closer to it.
+    
+    Args:
+        A: Reference sequence (n, d)
+        B: User sequence (m, d)
+        radius: Refinement window around the projected path, in coarse cells
+    
+    Returns:
+        (total_cost, path)
+    """
+    n, m = A.shape[0], B.shape[0]
+    min_size = radius + 2
+    if n < min_size or m < min_size:
+        total_cost, path, _ = dtw_distance_matrix(pairwise_distances(A, B))
+        return total_cost, path
+    
+    _, coarse_path = fast_dtw(_halve(A), _halve(B), radius)
+    lo, hi = _project_window(coarse_path, n, m, radius)
+    return dtw_column_ranges(A, B, lo, hi)
+
+def dtw_distance_only(
+    A: np.ndarray,
+    B: np.ndarray,
+    window: int = None,
+    max_distance: float = None,
+    max_cells: int = 1 << 20
+) -> Dict:
+    """
+    DTW distance without materializing the distance or cost matrix.
+    
+    A is processed in strips of rows holding at most `max_cells` cells (and no
+    taller than the band is wide, so memory stays O(window) per row): each
+    strip computes its distances through pairwise_distances and fills its
+    cost with the anti-diagonal wavefront, starting from the last cost row
+    of the previous strip. Only that rolling row (and its path lengths) is
+    carried between strips, so memory stays bounded and the result is
+    identical to run_dtw (the path length is tracked with the same
+    tie-breaking as the backtrack).
+    
+    The accumulated cost never decreases along a warping path, and every
+    path crosses every row and one of any two consecutive anti-diagonals.
+    The minimum of a finished row (or, when one strip covers the whole
+    matrix, of two consecutive anti-diagonals) is therefore a lower bound of
+    the final distance; once it exceeds max_distance the alignment is
+    abandoned.
+    
+    Args:
+        A: Reference sequence (n, d)
+        B: User sequence (m, d)
+        window: Sakoe-Chiba window width (None = no constraint)
+        max_distance: Abandon once the distance is certain to exceed this (None = never)
+        max_cells: Cells per strip (bounds memory; sequences that fit run as one strip)
+    
+    Returns:
+        Dict with distance, normalized_distance, similarity, path_length and
+        abandoned (stopped early; distance is then inf and similarity 0)
+    """
+    n, m = A.shape[0], B.shape[0]
+    if window is None:
+        window = max(n, m)  # No constraint
+    
+    # Padded cost row 0 and its path lengths
+    row_cost = np.full(m+1, np.inf)
+    row_cost[0] = 0.0
+    row_length = np.zeros(m+1, dtype=np.int64)
+    abandoned = False
+    # A strip of r rows spans up to r + 2 * window columns: no taller than the
+    # band is wide (taller strips mostly hold cells outside the band), and
+    # sized so rows x columns stays within max_cells
+    band = min(m, 2 * window + 1)
+    block_rows = max(16, min(band, max_cells // (min(m, 2 * band) + 1)))
+    
+    for r0 in range(0, n, block_rows):
+        r1 = min(n, r0 + block_rows)
+        rows = r1 - r0
+        # Columns reachable by this strip's rows inside the band
+        c0, c1 = max(0, r0 - window), min(m, r1 - 1 + window + 1)
+        if c0 >= c1:
+            row_cost[:] = np.inf
+            break
+        cols = c1 - c0
+        
+        # Strip buffer: row 0 is padded row r0, column 0 is padded column c0
+        # (outside the band or the padding for every row below row 0)
+        cost = np.full((rows+1, cols+1), np.inf)
+        cost[0] = row_cost[c0:c1+1]
+        length = np.zeros((rows+1, cols+1), dtype=np.int64)
+        length[0] = row_length[c0:c1+1]
+        
+        d_flat = pairwise_distances(A[r0:r1], B[c0:c1]).ravel()
+        cost_flat = cost.ravel()
+        length_flat = length.ravel()
+        stride = cols + 1
+        offset = r0 - c0  # Padded (i - j) of strip cell (0, 0)
+        check_diagonals = max_distance is not None and rows == n
+        previous_min = np.inf
+        
+        for k in range(2, rows + cols + 1):
+            # |offset + bi - bj| <= window with bj = k - bi
+            i_lo = max(1, k - cols, -(-(k - offset - window) // 2))
+            i_hi = min(rows, k - 1, (k - offset + window) // 2)
+            if i_lo > i_hi:
+                continue
+            count = i_hi - i_lo + 1
+            
+            start = i_lo * stride + (k - i_lo)
+            up = _diagonal(cost_flat, start - stride, count, cols)
+            left = _diagonal(cost_flat, start - 1, count, cols)
+            diag = _diagonal(cost_flat, start - stride - 1, count, cols)
+            local = _diagonal(d_flat, (i_lo - 1) * cols + (k - i_lo - 1), count, cols - 1)
+            
+            best = np.minimum(np.minimum(up, left), diag)
+            updated = local + best
+            _diagonal(cost_flat, start, count, cols)[:] = updated
+            # Predecessor in backtrack order: diagonal, then up, then left
+            _diagonal(length_flat, start, count, cols)[:] = np.where(
+                diag == best,
+                _diagonal(length_flat, start - stride - 1, count, cols),
+                np.where(
+                    up == best,
+                    _diagonal(length_flat, start - stride, count, cols),
+                    _diagonal(length_flat, start - 1, count, cols)
+                )
+            ) + 1
+            
+            if check_diagonals:
+                current_min = float(updated.min())
+                if min(previous_min, current_min) > max_distance:
+                    abandoned = True
+                    break
+                previous_min = current_min
+        
+        if abandoned:
+            break
+        
+        row_cost = np.full(m+1, np.inf)
+        row_cost[c0:c1+1] = cost[rows]
+        row_length = np.zeros(m+1, dtype=np.int64)
+        row_length[c0:c1+1] = length[rows]
+        
+        if max_distance is not None and r1 < n and row_cost.min() > max_distance:
+            abandoned = True
+            break
+    
+    total_cost = float("inf") if abandoned else float(row_cost[m])
+    path_len = int(row_length[m]) if np.isfinite(total_cost) else 0
+    norm_cost = total_cost / max(path_len, 1)
+    similarity = 1.0 / (1.0 + norm_cost)
+    
+    return {
+        "distance": total_cost,
+        "normalized_distance": float(norm_cost),
+        "similarity": float(similarity),
+        "similarity_percentage": float(100 * similarity),
+        "path_length": path_len,
+        "abandoned": abandoned
+    }
+
+def run_dtw(
+    A: np.ndarray,
+    B: np.ndarray,
+    window: int = None,
+    use_fastdtw: bool = False,
+    distance_only: bool = False,
+    max_distance: float = None,
+    fastdtw_threshold: int = 1000,
+    fastdtw_radius: int = 10,
+    banded_cost: bool = False
+) -> Dict:
     """
     Runs DTW between sequences A (n,d) and B (m,d).
     
@@ -69,10 +579,22 @@ def run_dtw(A: np.ndarray, B: np.ndarray, window: int = None, use_fastdtw: bool
         B: User sequence (m, d)
         window: Sakoe-Chiba window width (None = auto-calculate for long sequences)
                 Recommended: 10-20% of max(n,m)
-        use_fastdtw: Try to use FastDTW approximation if available (faster for long sequences)
+        use_fastdtw: Use the multiresolution FastDTW approximation (fast_dtw) for long
+                     sequences; the window is not applied
+        distance_only: Only compute distance and similarity (no path or cost
+                       matrix; see dtw_distance_only)
+        max_distance: With distance_only, abandon once the distance exceeds this
+        fastdtw_threshold: Sequence length above which use_fastdtw applies
+        fastdtw_radius: FastDTW refinement radius (larger = closer to exact DTW)
+        banded_cost: Return cost_matrix as a BandedCostMatrix when the window is
+                     narrower than the sequences, instead of expanding it to a
+                     dense (n, m) array (saves O(n*m) memory for callers that
+                     only need the path)
     
     Returns:
-        Dict with distance, similarity, path, and cost_matrix
+        Dict with distance, similarity, path, and cost_matrix (dense (n, m)
+        unless banded_cost; with distance_only, path_length and abandoned
+        instead of path and cost_matrix)
     """
     if A.size == 0 or B.size == 0:
         return {"distance": float("inf"), "similarity": 0.0, "path": [], "mapping": []}
@@ -83,28 +605,36 @@ def run_dtw(A: np.ndarray, B: np.ndarray, window: int = None, use_fastdtw: bool
     if window is None and max(n, m) > 500:
         window = int(0.15 * max(n, m))  # 15% window for long sequences
     
-    # Try FastDTW for very long sequences
-    if use_fastdtw and max(n, m) > 1000:
-        try:
-            from fastdtw import fastdtw
-            distance, path = fastdtw(A, B, dist=lambda x, y: np.linalg.norm(x - y))
-            path_len = len(path) if len(path) > 0 else 1
-            norm_cost = distance / path_len
-            similarity = 1.0 / (1.0 + norm_cost)
-            return {
-                "distance": float(distance),
-                "normalized_distance": float(norm_cost),
-                "similarity": float(similarity),
-                "path": path,
-                "cost_matrix": None,  # FastDTW doesn't return cost matrix
-                "method": "fastdtw"
-            }
-        except ImportError:
-            pass  # Fall back to standard DTW
-    
-    # Standard DTW with optional window
-    D = pairwise_distances(A, B)  # (n,m)
-    total_cost, path, cost_matrix = dtw_distance_matrix(D, window=window)
+    if distance_only:
+        result = dtw_distance_only(A, B, window=window, max_distance=max_distance)
+        result["method"] = "dtw_distance" if window is None else f"dtw_distance_window_{window}"
+        return result
+    
+    # FastDTW approximation for very long sequences
+    if use_fastdtw and max(n, m) > fastdtw_threshold:
+        distance, path = fast_dtw(A, B, radius=fastdtw_radius)
+        path_len = len(path) if len(path) > 0 else 1
+        norm_cost = distance / path_len
+        similarity = 1.0 / (1.0 + norm_cost)
+        return {
+            "distance": float(distance),
+            "normalized_distance": float(norm_cost),
+            "similarity": float(similarity),
+            "similarity_percentage": float(100 * similarity),
+            "path": path,
+            "cost_matrix": None,  # Only the cells around the path are computed
+            "method": f"fastdtw_radius_{fastdtw_radius}"
+        }
+    
+    if window is not None and 2 * window + 3 < m:
+        # Band narrower than the matrix: keep distances and cost in O(n * window)
+        total_cost, path, cost_matrix = dtw_banded(A, B, window)
+        if not banded_cost:
+            cost_matrix = cost_matrix.to_dense()
+    else:
+        # Standard DTW with optional window
+        D = pairwise_distances(A, B)  # (n,m)
+        total_cost, path, cost_matrix = dtw_distance_matrix(D, window=window)
     path_len = len(path) if len(path) > 0 else 1
     norm_cost = total_cost / path_len
     
@@ -121,6 +651,68 @@ def run_dtw(A: np.ndarray, B: np.ndarray, window: int = None, use_fastdtw: bool
         "method": "dtw" if window is None else f"dtw_window_{window}"
     }
 
+def rank_by_dtw(
+    reference: np.ndarray,
+    candidates: Dict[str, np.ndarray],
+    top_k: int = None,
+    min_similarity: float = None,
+    window_for_length: Callable[[int], Optional[int]] = None
+) -> Tuple[List[Dict], int]:
+    """
+    Rank candidate sequences by DTW similarity to a reference.
+    
+    Uses distance-only DTW. Once top_k results are held, a candidate is
+    abandoned as soon as it can no longer beat the current k-th best
+    (the path length is at most n + m - 1, so a normalized distance bound
+    translates into a cost bound); min_similarity bounds every candidate
+    the same way.
+    
+    Args:
+        reference: Reference sequence (n, d)
+        candidates: Candidate sequences (m_i, d) by ID
+        top_k: Keep only the k most similar candidates (None = all)
+        min_similarity: Drop candidates below this similarity (None = keep all)
+        window_for_length: Window size for the longer sequence length of each
+                           pair (e.g. DTWConfig.get_window_size; None = run_dtw default)
+    
+    Returns:
+        (results sorted by similarity, highest first, each with "candidate_id";
+        number of candidates abandoned early)
+    """
+    max_normalized = np.inf
+    if min_similarity is not None and min_similarity > 0:
+        max_normalized = 1.0 / min_similarity - 1.0
+    
+    kept = []  # Max-heap on normalized distance: (-normalized, order, result)
+    abandoned = 0
+    for order, (candidate_id, sequence) in enumerate(candidates.items()):
+        n, m = reference.shape[0], sequence.shape[0]
+        bound = max_normalized
+        if top_k is not None and len(kept) >= top_k:
+            bound = min(bound, -kept[0][0])
+        window = window_for_length(max(n, m)) if window_for_length is not None else None
+        
+        result = run_dtw(
+            reference,
+            sequence,
+            window=window,
+            distance_only=True,
+            max_distance=bound * (n + m - 1) if np.isfinite(bound) else None
+        )
+        if result.get("abandoned"):
+            abandoned += 1
+            continue
+        if not np.isfinite(result["distance"]) or result["normalized_distance"] > bound:
+            continue
+        
+        result["candidate_id"] = candidate_id
+        heapq.heappush(kept, (-result["normalized_distance"], -order, result))
+        if top_k is not None and len(kept) > top_k:
+            heapq.heappop(kept)
+    
+    ranked = [result for _, _, result in sorted(kept, key=lambda item: (-item[0], -item[1]))]
+    return ranked, abandoned
+
 def compute_time_deviation(frames_meta_A: List[Dict], frames_meta_B: List[Dict], path: List[Tuple[int,int]]) -> Dict:
     """
     Using frame timestamps (time_sec) map aligned frames and compute:
@@ -0,0 +1,118 @@
+"""
+Motion-Gated Inference
+Skips MoveNet on near-static frames and fills their keypoints by
+interpolating between the neighboring inferred frames.
+"""
+
+from typing import Optional, Sequence
+
+import cv2
+import numpy as np
+
+
+class MotionGate:
+    """
+    Decides per frame whether pose inference is needed.
+
+    Each frame is downscaled to a small grayscale thumbnail and compared with
+    the thumbnail of the last frame that was sent to inference. Comparing
+    against the last inferred frame (rather than the previous frame) keeps
+    slow drifts from slipping through as a series of tiny differences.
+    """
+
+    def __init__(self, threshold: float = 2.0, size: int = 64, max_skip: int = 10):
+        """
+        Initialize gate.
+
+        Args:
+            threshold: Mean absolute gray-level difference (0-255) below which
+                       a frame is considered static
+            size: Thumbnail width in pixels (height keeps the aspect ratio)
+            max_skip: Max consecutive skipped frames before inference is forced
+        """
+        self.threshold = threshold
+        self.size = size
+        self.max_skip = max_skip
+        self._reference: Optional[np.ndarray] = None
+        self._skipped_in_row = 0
+        self.frames = 0
+        self.skipped = 0
+
+    @property
+    def skip_ratio(self) -> float:
+        """Fraction of frames that skipped inference."""
+        return self.skipped / self.frames if self.frames else 0.0
+
+    def _thumbnail(self, frame: np.ndarray) -> np.ndarray:
+        height, width = frame.shape[:2]
+        thumb_height = max(1, round(height * self.size / width))
+        small = cv2.resize(frame, (self.size, thumb_height), interpolation=cv2.INTER_AREA)
+        if small.ndim == 3:
+            small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        return small.astype(np.int16)
+
+    def should_infer(self, frame: np.ndarray) -> bool:
+        """
+        Gate one frame (frames must be passed in order).
+
+        Args:
+            frame: BGR frame from OpenCV
+
+        Returns:
+            True if the frame needs inference, False if it can be interpolated
+        """
+        self.frames += 1
+        thumb = self._thumbnail(frame)
+        if (
+            self._reference is not None
+            and self._skipped_in_row < self.max_skip
+            and np.abs(thumb - self._reference).mean() < self.threshold
+        ):
+            self._skipped_in_row += 1
+            self.skipped += 1
+            return False
+
+        self._reference = thumb
+        self._skipped_in_row = 0
+        return True
+
+
+def interpolate_skipped(
+    keypoints: np.ndarray,
+    inferred_mask: np.ndarray,
+    frame_indices: Sequence[int]
+) -> np.ndarray:
+    """
+    Fill frames that skipped inference from their inferred neighbors.
+
+    Positions and confidences are interpolated linearly in source frame
+    index between the previous and next inferred frames. Skipped frames
+    after the last inferred frame repeat it.
+
+    Args:
+        keypoints: Keypoints of shape (N, 17, 3); rows of skipped frames are ignored
+        inferred_mask: Boolean (N,), True where the frame was inferred
+        frame_indices: Source frame index of each frame (for interpolation weights)
+
+    Returns:
+        Keypoints of shape (N, 17, 3) with every frame filled
+    """
+    inferred = np.flatnonzero(inferred_mask)
+    if len(inferred) == 0 or len(inferred) == len(keypoints):
+        return keypoints
+
+    positions = np.asarray(frame_indices, dtype=np.float64)
+    frames = np.arange(len(keypoints))
+    # Nearest inferred frame at or before / at or after each frame
+    prev = inferred[np.maximum(np.searchsorted(inferred, frames, side="right") - 1, 0)]
+    nxt = inferred[np.minimum(np.searchsorted(inferred, frames, side="left"), len(inferred) - 1)]
+    nxt = np.where(nxt < frames, prev, nxt)  # after the last inferred frame: hold
+
+    span = positions[nxt] - positions[prev]
+    weight = np.divide(
+        positions - positions[prev], span,
+        out=np.zeros_like(span), where=span > 0
+    )[:, np.newaxis, np.newaxis]
+
+    filled = (1.0 - weight) * keypoints[prev] + weight * keypoints[nxt]
+    return filled.astype(keypoints.dtype, copy=False)
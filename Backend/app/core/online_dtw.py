@@ -0,0 +1,164 @@
+"""
+Online (Streaming) DTW
+Aligns a growing user sequence against a complete reference one frame at a
+time, for live feedback while the task is being performed.
+
+The reference is known in full, so each new user frame adds one column of
+the DTW cost matrix. Only the previous column is kept, restricted to a
+search band around the current reference position, so memory and time per
+frame are O(band) instead of growing with the user sequence. The alignment
+is open-ended: the user is matched against the best reference *prefix*.
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+
+@dataclass
+class OnlineAlignment:
+    """Alignment state after one user frame."""
+
+    user_index: int  # Index of the user frame just added
+    reference_index: int  # Reference frame the user is currently at
+    progress: float  # reference_index as a fraction of the reference (0-1)
+    distance: float  # Accumulated DTW cost of the best path so far
+    normalized_distance: float  # distance / path length
+    similarity: float  # 1 / (1 + normalized_distance), same mapping as run_dtw
+    frame_distance: float  # Distance between this user frame and the matched reference frame
+    deviating: bool  # frame_distance above the deviation threshold
+
+    def as_dict(self) -> dict:
+        """Return the alignment as a plain dictionary (for JSON)."""
+        return {
+            "user_index": self.user_index,
+            "reference_index": self.reference_index,
+            "progress": round(self.progress, 4),
+            "distance": round(self.distance, 4),
+            "normalized_distance": round(self.normalized_distance, 4),
+            "similarity": round(self.similarity, 4),
+            "frame_distance": round(self.frame_distance, 4),
+            "deviating": self.deviating,
+        }
+
+
+class OnlineDTW:
+    """
+    Incremental open-end DTW of a streaming sequence against a fixed reference.
+
+    Uses the same step pattern (diagonal, vertical, horizontal), Euclidean
+    local distance and similarity mapping as `run_dtw`. Without a band the
+    columns match the offline cost matrix within floating-point tolerance
+    (the prefix-minimum scan sums in a different order), so the similarity
+    at the end of a stream matches an offline alignment of the same frames
+    against the matched reference prefix; compare with np.allclose, not ==.
+    """
+
+    def __init__(
+        self,
+        reference: np.ndarray,
+        window: Optional[int] = None,
+        deviation_threshold: Optional[float] = None
+    ):
+        """
+        Initialize online aligner.
+
+        Args:
+            reference: Reference feature matrix (n, d)
+            window: Search band radius in reference frames around the current
+                    position (None = whole reference every frame)
+            deviation_threshold: frame_distance above which a frame is flagged
+                                 as deviating (None = never flag)
+        """
+        if reference.ndim != 2 or reference.shape[0] == 0:
+            raise ValueError("Reference must be a non-empty (n, d) feature matrix")
+        self.reference = np.asarray(reference, dtype=np.float64)
+        self.window = window
+        self.deviation_threshold = deviation_threshold
+
+        self.user_frames = 0
+        self.position = 0
+        # Previous cost column over reference rows [lo, lo + len(cost))
+        self._lo = 0
+        self._cost: Optional[np.ndarray] = None
+        self._length: Optional[np.ndarray] = None
+
+    def _band(self) -> tuple:
+        n = len(self.reference)
+        if self.window is None:
+            return 0, n
+        return max(0, self.position - self.window), min(n, self.position + self.window + 1)
+
+    def _previous(self, lo: int, hi: int) -> tuple:
+        """Previous column (cost, path length) on rows [lo - 1, hi), inf outside its band."""
+        cost = np.full(hi - lo + 1, np.inf)
+        length = np.zeros(hi - lo + 1, dtype=np.int64)
+        if self._cost is not None:
+            start = max(lo - 1, self._lo)
+            stop = min(hi, self._lo + len(self._cost))
+            if start < stop:
+                cost[start - lo + 1:stop - lo + 1] = self._cost[start - self._lo:stop - self._lo]
+                length[start - lo + 1:stop - lo + 1] = self._length[start - self._lo:stop - self._lo]
+        return cost, length
+
+    def update(self, feature: np.ndarray) -> OnlineAlignment:
+        """
+        Add the next user frame and advance the alignment.
+
+        Args:
+            feature: Feature vector (d,) of the new user frame
+
+        Returns:
+            OnlineAlignment after this frame
+        """
+        lo, hi = self._band()
+        local = np.linalg.norm(self.reference[lo:hi] - np.asarray(feature, dtype=np.float64), axis=1)
+
+        # Best entry into each row from the previous column: diagonal or horizontal
+        if self._cost is None:
+            # First user frame: every path starts at (0, 0)
+            entry = np.full(hi - lo, np.inf)
+            entry_length = np.zeros(hi - lo, dtype=np.int64)
+            if lo == 0:
+                entry[0] = 0.0
+        else:
+            prev_cost, prev_length = self._previous(lo, hi)
+            diagonal, horizontal = prev_cost[:-1], prev_cost[1:]
+            use_diagonal = diagonal <= horizontal
+            entry = np.where(use_diagonal, diagonal, horizontal)
+            entry_length = np.where(use_diagonal, prev_length[:-1], prev_length[1:])
+        entry = entry + local
+
+        # Vertical steps within the column: cost[i] = min over k <= i of
+        # entry[k] + local[k+1..i], evaluated as a prefix-minimum scan
+        cumulative = np.cumsum(local)
+        offset = entry - cumulative
+        best = np.minimum.accumulate(offset)
+        cost = cumulative + best
+        rows = np.arange(hi - lo)
+        origin = np.maximum.accumulate(np.where(offset <= best, rows, 0))
+        length = entry_length[origin] + 1 + (rows - origin)
+
+        self._lo, self._cost, self._length = lo, cost, length
+        self.user_frames += 1
+
+        # Open end: best reference prefix for the user frames so far
+        with np.errstate(invalid="ignore", divide="ignore"):
+            normalized = np.where(np.isfinite(cost), cost / np.maximum(length, 1), np.inf)
+        best_row = int(np.argmin(normalized))
+        self.position = lo + best_row
+
+        normalized_distance = float(normalized[best_row])
+        frame_distance = float(local[best_row])
+        n = len(self.reference)
+        return OnlineAlignment(
+            user_index=self.user_frames - 1,
+            reference_index=self.position,
+            progress=self.position / (n - 1) if n > 1 else 1.0,
+            distance=float(cost[best_row]),
+            normalized_distance=normalized_distance,
+            similarity=1.0 / (1.0 + normalized_distance),
+            frame_distance=frame_distance,
+            deviating=self.deviation_threshold is not None and frame_distance > self.deviation_threshold
+        )
@@ -0,0 +1,461 @@
+"""
+Staged Extraction Pipeline
+Overlaps video decode, frame preprocessing and model inference using
+bounded producer/consumer queues.
+"""
+
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+
+# Marks the end of a stage's output stream
+_END = object()
+
+
+class _StageError:
+    """Carries an exception raised in a worker thread to the consumer."""
+
+    def __init__(self, exc: BaseException):
+        self.exc = exc
+
+
+@dataclass
+class StageTimings:
+    """Per-stage busy time and overall wall time for one pipeline run."""
+
+    decode_seconds: float = 0.0
+    preprocess_seconds: float = 0.0
+    inference_seconds: float = 0.0
+    wall_seconds: float = 0.0
+    frames: int = 0
+
+    @property
+    def frames_per_second(self) -> float:
+        """Frames processed per second of wall time."""
+        if self.wall_seconds <= 0:
+            return 0.0
+        return self.frames / self.wall_seconds
+
+    @property
+    def bottleneck(self) -> str:
+        """Name of the stage with the largest busy time."""
+        stages = {
+            "decode": self.decode_seconds,
+            "preprocess": self.preprocess_seconds,
+            "inference": self.inference_seconds,
+        }
+        return max(stages, key=stages.get)
+
+    def as_dict(self) -> Dict:
+        """Return timings as a plain dictionary (for logging/JSON)."""
+        return {
+            "decode_seconds": round(self.decode_seconds, 4),
+            "preprocess_seconds": round(self.preprocess_seconds, 4),
+            "inference_seconds": round(self.inference_seconds, 4),
+            "wall_seconds": round(self.wall_seconds, 4),
+            "frames": self.frames,
+            "frames_per_second": round(self.frames_per_second, 2),
+            "bottleneck": self.bottleneck,
+        }
+
+
+@dataclass
+class ExtractionResult:
+    """Output of a video extraction run (whole video or one frame range)."""
+
+    keypoints: np.ndarray  # (frames, 17, 3) float32 as [x, y, confidence]
+    duration_seconds: float
+    timings: StageTimings
+    timestamps: List[float] = field(default_factory=list)  # Source time (s) of each frame
+    frame_indices: List[int] = field(default_factory=list)  # Source frame index of each frame
+    source_range: Tuple[int, int] = (0, 0)  # Source frames consumed: [start, stop)
+    # Thumbnails of source frames start - 1 (decoded after seeking) and stop - 1 of a range
+    seam_thumbnails: Tuple[Optional[np.ndarray], Optional[np.ndarray]] = (None, None)
+    inferred_mask: List[bool] = field(default_factory=list)  # False where keypoints were interpolated
+
+    @property
+    def skip_ratio(self) -> float:
+        """Fraction of frames whose keypoints were interpolated instead of inferred."""
+        if not self.inferred_mask:
+            return 0.0
+        return 1.0 - sum(self.inferred_mask) / len(self.inferred_mask)
+
+
+class ChunkBoundaryError(ValueError):
+    """Raised when stitched frame ranges drop or duplicate frames at a seam."""
+
+
+class FrameSampler:
+    """
+    Decides which source frames are kept for a target frame rate.
+
+    Selection depends only on the absolute source frame index, so any
+    split of a video into frame ranges selects exactly the same frames
+    as a single sequential pass.
+    """
+
+    def __init__(self, fps: float, target_fps: Optional[float] = None, max_frames: Optional[int] = None):
+        """
+        Initialize sampler.
+
+        Args:
+            fps: Source video frame rate
+            target_fps: Desired frame rate (None = keep every frame)
+            max_frames: Max frames kept in total (None = unlimited)
+        """
+        self.fps = fps
+        self.max_frames = max_frames
+
+        # Fraction of source frames kept (None = keep every frame)
+        self.keep_ratio = None
+        if target_fps and fps > 0 and target_fps < fps:
+            self.keep_ratio = target_fps / fps
+
+    def is_sampled(self, index: int) -> bool:
+        """Whether the source frame at `index` is kept after subsampling."""
+        if self.keep_ratio is None or index == 0:
+            return True
+        # Keep a frame each time the target-rate sample counter advances
+        return int(index * self.keep_ratio) != int((index - 1) * self.keep_ratio)
+
+    def sampled_before(self, stop: int) -> int:
+        """Number of kept frames among source frames [0, stop), ignoring max_frames."""
+        if stop <= 0:
+            return 0
+        if self.keep_ratio is None:
+            return stop
+        return int((stop - 1) * self.keep_ratio) + 1
+
+    def expected_frames(self, frame_count: int) -> int:
+        """Number of frames kept for a video of frame_count frames."""
+        expected = self.sampled_before(frame_count)
+        if self.max_frames:
+            expected = min(expected, self.max_frames)
+        return expected
+
+    def end_frame(self, frame_count: int) -> int:
+        """Source frames that must be read to collect expected_frames(frame_count) frames."""
+        if not self.max_frames or self.sampled_before(frame_count) <= self.max_frames:
+            return frame_count
+        # Smallest stop with max_frames kept frames before it
+        lo, hi = 0, frame_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.sampled_before(mid) >= self.max_frames:
+                hi = mid
+            else:
+                lo = mid + 1
+        return lo
+
+    def sampled_indices(self, start: int, stop: int) -> List[int]:
+        """Kept source frame indices in [start, stop)."""
+        return [i for i in range(start, stop) if self.is_sampled(i)]
+
+
+def split_frame_range(stop: int, chunks: int, min_chunk_frames: int = 1) -> List[Tuple[int, int]]:
+    """
+    Split source frames [0, stop) into contiguous, non-overlapping ranges.
+
+    Args:
+        stop: Number of source frames to cover
+        chunks: Desired number of ranges
+        min_chunk_frames: Minimum frames per range (fewer ranges if needed)
+
+    Returns:
+        List of (start, stop) ranges covering [0, stop) in order
+    """
+    if stop <= 0:
+        return []
+    chunks = max(1, min(chunks, stop // max(1, min_chunk_frames)))
+    bounds = [round(k * stop / chunks) for k in range(chunks + 1)]
+    return [(bounds[k], bounds[k + 1]) for k in range(chunks)]
+
+
+def stitch_results(
+    results: List[ExtractionResult],
+    ranges: List[Tuple[int, Optional[int]]],
+    sampler: FrameSampler,
+    duration_seconds: float,
+    wall_seconds: float
+) -> ExtractionResult:
+    """
+    Concatenate per-range extraction results into one result.
+
+    Verifies that every range started exactly where it was asked to, that
+    consecutive ranges meet without a gap or overlap, and that the stitched
+    frames are exactly the frames a sequential pass would have selected.
+    A range may only come back short if the stream ended inside it, in
+    which case all later ranges must be empty.
+
+    Frame counters alone cannot show where a seek really landed, so every
+    range after the first decodes the frame before its start right after
+    seeking, and the previous range decodes its last frame: the two
+    thumbnails must be identical.
+
+    Args:
+        results: Range results in source order
+        ranges: Requested (start, stop) range of each result (stop None = to end of stream)
+        sampler: Frame selection used for every range
+        duration_seconds: Duration of the analyzed footage
+        wall_seconds: Overall elapsed time
+
+    Returns:
+        Combined ExtractionResult
+
+    Raises:
+        ChunkBoundaryError: If a seam drops, duplicates or reorders frames
+    """
+    timings = StageTimings(wall_seconds=wall_seconds)
+    stitched = ExtractionResult(
+        keypoints=np.empty((0, 17, 3), dtype=np.float32),
+        duration_seconds=duration_seconds,
+        timings=timings
+    )
+    parts = []
+
+    expected_start = 0
+    stream_ended = False
+    previous_tail = None
+    for result, (requested_start, requested_stop) in zip(results, ranges):
+        start, stop = result.source_range
+        if stream_ended:
+            if result.frame_indices:
+                raise ChunkBoundaryError(
+                    f"Range starting at frame {requested_start} returned frames "
+                    f"after the stream ended at frame {expected_start}"
+                )
+            continue
+        if requested_start != expected_start or start != requested_start:
+            raise ChunkBoundaryError(
+                f"Range starts at frame {start}, expected {expected_start}"
+            )
+        if requested_stop is not None and stop > requested_stop:
+            raise ChunkBoundaryError(
+                f"Range [{start}, {requested_stop}) read past its end (frame {stop})"
+            )
+        if result.frame_indices != sampler.sampled_indices(start, stop):
+            raise ChunkBoundaryError(
+                f"Frames in range [{start}, {stop}) do not match the expected selection"
+            )
+        if len(result.keypoints) != len(result.frame_indices):
+            raise ChunkBoundaryError(
+                f"Range [{start}, {stop}) returned {len(result.keypoints)} keypoint frames "
+                f"for {len(result.frame_indices)} decoded frames"
+            )
+        head, tail = result.seam_thumbnails
+        if start > 0 and stop > start and (
+            head is None or previous_tail is None or not np.array_equal(head, previous_tail)
+        ):
+            raise ChunkBoundaryError(
+                f"Frame {start - 1} decoded after seeking differs from the previous range's; "
+                f"the seek to frame {start} landed off target"
+            )
+        previous_tail = tail
+
+        parts.append(result.keypoints)
+        stitched.timestamps.extend(result.timestamps)
+        stitched.frame_indices.extend(result.frame_indices)
+        stitched.inferred_mask.extend(result.inferred_mask)
+        timings.decode_seconds += result.timings.decode_seconds
+        timings.preprocess_seconds += result.timings.preprocess_seconds
+        timings.inference_seconds += result.timings.inference_seconds
+        timings.frames += result.timings.frames
+
+        expected_start = stop
+        # A short range means the stream ended early (frame count overestimated)
+        stream_ended = requested_stop is None or stop < requested_stop
+
+    if parts:
+        stitched.keypoints = np.concatenate(parts)
+    stitched.source_range = (0, expected_start)
+    return stitched
+
+
+class ExtractionPipeline:
+    """
+    Three-stage producer/consumer pipeline.
+
+    - decode: a thread pulling items from the source iterable
+    - preprocess: a thread applying the preprocess function
+    - inference: runs in the calling thread (keeps TF on one thread)
+
+    Stages are connected by bounded queues so a fast decoder cannot run
+    arbitrarily far ahead of inference and exhaust memory. The inference
+    stage is handed lists of up to `batch_size` prepared items.
+    """
+
+    def __init__(
+        self,
+        decode_queue_size: int = 64,
+        inference_queue_size: int = 16,
+        threaded: bool = True,
+        batch_size: int = 1
+    ):
+        """
+        Initialize pipeline.
+
+        Args:
+            decode_queue_size: Max decoded frames waiting for preprocessing
+            inference_queue_size: Max preprocessed frames waiting for inference
+            threaded: Run decode/preprocess in background threads
+                      (False = run all stages sequentially in caller)
+            batch_size: Max prepared items passed to one inference call
+        """
+        self.batch_size = max(1, batch_size)
+        self.decode_queue_size = max(1, decode_queue_size)
+        # The inference queue must hold at least one full batch
+        self.inference_queue_size = max(self.batch_size, inference_queue_size)
+        self.threaded = threaded
+
+    def run(
+        self,
+        source: Iterable,
+        preprocess: Callable[[Any], Any],
+        infer: Callable[[List[Any]], List[Any]]
+    ) -> Tuple[List[Any], StageTimings]:
+        """
+        Push every item of `source` through preprocess and infer.
+
+        Args:
+            source: Iterable of decoded items (iteration cost = decode time)
+            preprocess: Function mapping a decoded item to model input
+            infer: Function mapping a list of model inputs to a list of
+                   results of the same length
+
+        Returns:
+            Tuple of (results in source order, stage timings)
+        """
+        if self.threaded:
+            return self._run_threaded(source, preprocess, infer)
+        return self._run_sequential(source, preprocess, infer)
+
+    def _run_sequential(self, source, preprocess, infer) -> Tuple[List[Any], StageTimings]:
+        timings = StageTimings()
+        results = []
+        batch = []
+        start = time.perf_counter()
+
+        iterator = iter(source)
+        while True:
+            t0 = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                timings.decode_seconds += time.perf_counter() - t0
+                break
+            t1 = time.perf_counter()
+            batch.append(preprocess(item))
+            t2 = time.perf_counter()
+            timings.decode_seconds += t1 - t0
+            timings.preprocess_seconds += t2 - t1
+
+            if len(batch) == self.batch_size:
+                self._infer_batch(infer, batch, results, timings)
+                batch = []
+
+        if batch:
+            self._infer_batch(infer, batch, results, timings)
+
+        timings.wall_seconds = time.perf_counter() - start
+        return results, timings
+
+    def _run_threaded(self, source, preprocess, infer) -> Tuple[List[Any], StageTimings]:
+        timings = StageTimings()
+        decoded: queue.Queue = queue.Queue(maxsize=self.decode_queue_size)
+        prepared: queue.Queue = queue.Queue(maxsize=self.inference_queue_size)
+        stop = threading.Event()
+
+        def put(q: queue.Queue, item) -> bool:
+            # Blocking put that gives up once the consumer has stopped
+            while not stop.is_set():
+                try:
+                    q.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def decode_worker():
+            try:
+                iterator = iter(source)
+                while not stop.is_set():
+                    t0 = time.perf_counter()
+                    try:
+                        item = next(iterator)
+                    except StopIteration:
+                        timings.decode_seconds += time.perf_counter() - t0
+                        break
+                    timings.decode_seconds += time.perf_counter() - t0
+                    if not put(decoded, item):
+                        return
+                put(decoded, _END)
+            except BaseException as exc:
+                put(decoded, _StageError(exc))
+
+        def preprocess_worker():
+            try:
+                while not stop.is_set():
+                    try:
+                        item = decoded.get(timeout=0.1)
+                    except queue.Empty:
+                        continue
+                    if item is _END or isinstance(item, _StageError):
+                        put(prepared, item)
+                        return
+                    t0 = time.perf_counter()
+                    out = preprocess(item)
+                    timings.preprocess_seconds += time.perf_counter() - t0
+                    if not put(prepared, out):
+                        return
+            except BaseException as exc:
+                put(prepared, _StageError(exc))
+
+        threads = [
+            threading.Thread(target=decode_worker, name="pose-decode", daemon=True),
+            threading.Thread(target=preprocess_worker, name="pose-preprocess", daemon=True),
+        ]
+
+        results = []
+        start = time.perf_counter()
+        for t in threads:
+            t.start()
+
+        try:
+            finished = False
+            while not finished:
+                batch = []
+                while len(batch) < self.batch_size:
+                    item = prepared.get()
+                    if item is _END:
+                        finished = True
+                        break
+                    if isinstance(item, _StageError):
+                        raise item.exc
+                    batch.append(item)
+                if batch:
+                    self._infer_batch(infer, batch, results, timings)
+        finally:
+            # Unblock producers if inference stopped early
+            stop.set()
+            for t in threads:
+                t.join()
+
+        timings.wall_seconds = time.perf_counter() - start
+        return results, timings
+
+    @staticmethod
+    def _infer_batch(infer, batch: List[Any], results: List[Any], timings: StageTimings) -> None:
+        t0 = time.perf_counter()
+        outputs = infer(batch)
+        timings.inference_seconds += time.perf_counter() - t0
+        if len(outputs) != len(batch):
+            raise ValueError(
+                f"Inference returned {len(outputs)} results for a batch of {len(batch)}"
+            )
+        results.extend(outputs)
+        timings.frames += len(batch)
@@ -1,51 +1,195 @@
 """
-Pose Estimation Model Handler using MoveNet Thunder
+Pose Estimation Model Handler using MoveNet (Thunder or Lightning)
 Extracts keypoints from video frames and normalizes them.
+Inference runs on a backend from app.core.inference_backends.
 """
 
 import cv2
 import numpy as np
-import tensorflow as tf
-from typing import List, Tuple, Optional
-import os
+import threading
+import time
+from typing import Callable, Dict, Iterator, List, Tuple, Optional
 
+from app.core.config import VideoProcessingConfig, get_video_config
+from app.core.crop import CropTracker
+from app.core.motion_gate import MotionGate, interpolate_skipped
+from app.core.inference_backends import InferenceBackend, create_backend
+from app.core.pipeline import ExtractionPipeline, ExtractionResult, FrameSampler
 
-class PoseModel:
-    """Wrapper for MoveNet Thunder pose estimation model."""
-    
-    def __init__(self):
-        """Initialize MoveNet Thunder model."""
-        # Load MoveNet model from local SavedModel
-        model_path = os.path.join(
-            os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
-            "models"
-        )
+
+def _thumbnail(frame: np.ndarray) -> np.ndarray:
+    """Small grayscale copy of a frame, for checking that two decodes are the same frame."""
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    return cv2.resize(gray, (32, 32), interpolation=cv2.INTER_AREA)
+
+
+class _FrameReader:
+    """
+    Decode stage source: yields the BGR frames selected for inference.
+    
+    Frames dropped by target_fps subsampling are only grabbed (demuxed,
+    never decoded or converted), and reading stops after max_frames or at
+    the end of the requested frame range. The source index and decoded
+    timestamp of every yielded frame are recorded in order. The last frame of a
+    range is always decoded and kept as a thumbnail for the seam check.
+    """
+    
+    def __init__(
+        self,
+        cap: "cv2.VideoCapture",
+        fps: float,
+        sampler: FrameSampler,
+        start: int = 0,
+        stop: Optional[int] = None
+    ):
+        self.cap = cap
+        self.fps = fps
+        self.sampler = sampler
+        self.max_frames = sampler.max_frames
+        self.start = start
+        self.stop = stop
         
-        if os.path.exists(model_path):
-            print(f"Loading MoveNet model from {model_path}")
-            self.model = tf.saved_model.load(model_path)
-            self.movenet = self.model.signatures['serving_default']
-        else:
-            # Fallback: try to load from TensorFlow Hub
-            print("Loading MoveNet model from TensorFlow Hub...")
-            import tensorflow_hub as hub
-            model = hub.load("https://tfhub.dev/google/movenet/singlepose/thunder/4")
-            self.movenet = model.signatures['serving_default']
+        self.timestamps: List[float] = []
+        self.frame_indices: List[int] = []
+        self.frames_read = start  # Source frames consumed (decoded or grabbed)
+        self.truncated = False  # Stopped early because of max_frames
+        self.last_thumbnail: Optional[np.ndarray] = None  # Frame stop - 1 of a range
+    
+    def expected_frames(self, frame_count: int) -> int:
+        """Number of frames that will be yielded for a video of frame_count frames."""
+        if self.start == 0 and self.stop is None:
+            return self.sampler.expected_frames(frame_count)
+        stop = frame_count if self.stop is None else min(self.stop, frame_count)
+        return len(self.sampler.sampled_indices(self.start, stop))
+    
+    def __iter__(self) -> Iterator[np.ndarray]:
+        while self.cap.isOpened():
+            if self.max_frames and len(self.timestamps) >= self.max_frames:
+                self.truncated = True
+                break
+            
+            index = self.frames_read
+            if self.stop is not None and index >= self.stop:
+                break
+            is_last = self.stop is not None and index == self.stop - 1
+            if not self.sampler.is_sampled(index):
+                if is_last:
+                    # Decoded anyway: the next range compares it with its seek
+                    ret, frame = self.cap.read()
+                    if not ret:
+                        break
+                    self.last_thumbnail = _thumbnail(frame)
+                elif not self.cap.grab():
+                    break
+                self.frames_read += 1
+                continue
+            
+            ret, frame = self.cap.read()
+            if not ret:
+                break
+            self.frames_read += 1
+            if is_last:
+                self.last_thumbnail = _thumbnail(frame)
+            
+            # Presentation time of the decoded frame, which stays correct for
+            # variable-frame-rate footage; backends that cannot report it return 0
+            timestamp = self.cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+            if timestamp <= 0 and self.fps > 0:
+                timestamp = index / self.fps
+            self.timestamps.append(timestamp)
+            self.frame_indices.append(index)
+            yield frame
+
+
+def _passthrough(frame: np.ndarray) -> np.ndarray:
+    """Preprocess stage for smart crop: frames reach inference unchanged."""
+    return frame
+
+
+def _gated(gate: MotionGate, prepare: Callable[[np.ndarray], np.ndarray]) -> Callable:
+    """Preprocess stage behind a motion gate: static frames become None."""
+    def prepare_gated(frame: np.ndarray) -> Optional[np.ndarray]:
+        if not gate.should_infer(frame):
+            return None
+        return prepare(frame)
+    return prepare_gated
+
+
+def _seek_to_frame(
+    video_path: str,
+    cap: "cv2.VideoCapture",
+    start: int
+) -> Tuple["cv2.VideoCapture", Optional[np.ndarray]]:
+    """
+    Position a capture so the next read returns source frame `start`.
+    
+    Seeks with CAP_PROP_POS_FRAMES to frame start - 1 and decodes it. Many
+    backends simply echo the requested position, and a keyframe seek can
+    land elsewhere, so the decoded frame is returned as a thumbnail:
+    stitch_results compares it with the same frame decoded sequentially by
+    the previous range. If the backend already reports a different
+    position, the video is reopened and frames are grabbed forward instead
+    (slower, but frame-accurate).
+    
+    Returns:
+        (capture positioned at `start` (may be a new capture object),
+        thumbnail of frame start - 1, or None at the start or if it could not be read)
+    """
+    if start <= 0:
+        return cap, None
+    
+    overlap = start - 1
+    if not (cap.set(cv2.CAP_PROP_POS_FRAMES, overlap) and int(cap.get(cv2.CAP_PROP_POS_FRAMES)) == overlap):
+        print(f"⚠ Inexact seek to frame {start} in {video_path}, grabbing forward instead")
+        cap.release()
+        cap = cv2.VideoCapture(video_path)
+        for _ in range(overlap):
+            if not cap.grab():
+                break
+    
+    ret, frame = cap.read()
+    return cap, _thumbnail(frame) if ret else None
+
+
+class PoseModel:
+    """Wrapper for MoveNet pose estimation on a pluggable inference backend."""
+    
+    def __init__(self, config: Optional[VideoProcessingConfig] = None, backend: Optional[InferenceBackend] = None):
+        """
+        Initialize MoveNet on the configured backend.
         
-        self.input_size = 256  # MoveNet Thunder uses 256x256 input
+        Args:
+            config: Video processing config (defaults to global config)
+            backend: Already-loaded backend (overrides config.inference_backend)
+        """
+        config = config or get_video_config()
+        self.variant = config.get_model_variant()
+        self.backend = backend or create_backend(config)
+        self.input_size = self.backend.input_size
         
-    def extract_keypoints(self, video_path: str) -> Tuple[List[List[List[float]]], float]:
+    def extract(
+        self,
+        video_path: str,
+        config: Optional[VideoProcessingConfig] = None,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        frame_range: Optional[Tuple[int, Optional[int]]] = None
+    ) -> ExtractionResult:
         """
-        Extract pose keypoints from video using MoveNet.
+        Extract pose keypoints from video using a staged decode/preprocess/inference pipeline.
         
         Args:
             video_path: Path to the input video file
+            config: Video processing config (defaults to global config)
+            progress_callback: Called after each inference batch with
+                               (frames_processed, expected_total_frames)
+            frame_range: Optional (start, stop) source frame range to extract
+                         (stop None = to end of video). Frame selection matches
+                         a full pass; max_frames is left to the caller.
             
         Returns:
-            Tuple of (keypoints, duration_seconds)
-            keypoints: List[frame][joint][x, y, confidence]
-            duration_seconds: Video duration in seconds
+            ExtractionResult with normalized keypoints, duration and stage timings
         """
+        config = config or get_video_config()
         cap = cv2.VideoCapture(video_path)
         
         if not cap.isOpened():
@@ -55,105 +199,242 @@ class PoseModel:
         frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
         duration_seconds = frame_count / fps if fps > 0 else 0.0
         
-        all_keypoints = []
+        if frame_range is None:
+            sampler = FrameSampler(fps, config.target_fps, config.max_frames)
+            reader = _FrameReader(cap, fps, sampler)
+            head_thumbnail = None
+        else:
+            start, stop = frame_range
+            cap, head_thumbnail = _seek_to_frame(video_path, cap, start)
+            sampler = FrameSampler(fps, config.target_fps)
+            reader = _FrameReader(cap, fps, sampler, start, stop)
         
-        while cap.isOpened():
-            ret, frame = cap.read()
-            if not ret:
-                break
-            
-            # Preprocess frame for MoveNet
-            input_image = self._preprocess_frame(frame)
-            
-            # Run inference
-            outputs = self.movenet(input_image)
-            
-            # Extract keypoints from output
-            # MoveNet output shape: [1, 1, 17, 3] - 17 keypoints with (y, x, confidence)
-            keypoints = outputs['output_0'].numpy()[0, 0, :, :]
-            
-            # Convert to format: [joint][x, y, confidence]
-            frame_keypoints = []
-            for i in range(17):
-                y, x, conf = keypoints[i]
-                frame_keypoints.append([float(x), float(y), float(conf)])
+        tracker = None
+        prepare = self._prepare_frame
+        batch_size = config.inference_batch_size
+        if config.use_smart_crop:
+            # Each crop depends on the previous frame's keypoints, so cropping
+            # happens in the inference stage one frame at a time
+            tracker = CropTracker(self.input_size, config.crop_min_keypoint_score, config.crop_redetect_score)
+            prepare = _passthrough
+            batch_size = 1
+        
+        gate = None
+        if config.use_motion_gate:
+            # Static frames leave the preprocess stage as None and skip inference
+            gate = MotionGate(config.motion_threshold, config.motion_gate_size, config.motion_max_skip)
+            prepare = _gated(gate, prepare)
+        
+        pipeline = ExtractionPipeline(
+            decode_queue_size=config.decode_queue_size,
+            inference_queue_size=config.inference_queue_size,
+            threaded=config.use_pipeline,
+            batch_size=batch_size
+        )
+        
+        expected_frames = reader.expected_frames(frame_count)
+        processed = 0
+        
+        def infer(items: List[Optional[np.ndarray]]) -> List[Optional[np.ndarray]]:
+            nonlocal processed
+            images = [image for image in items if image is not None]
+            if not images:
+                inferred = []
+            elif tracker is not None:
+                inferred = [self._infer_tracked(frame, tracker) for frame in images]
+            else:
+                inferred = self._infer_batch(images, batch_size)
             
-            all_keypoints.append(frame_keypoints)
+            # Skipped (gated) frames stay None until interpolation
+            inferred_iter = iter(inferred)
+            batch_keypoints = [next(inferred_iter) if image is not None else None for image in items]
+            processed += len(batch_keypoints)
+            if progress_callback is not None:
+                progress_callback(processed, max(processed, expected_frames))
+            return batch_keypoints
         
-        cap.release()
+        try:
+            all_keypoints, timings = pipeline.run(reader, prepare, infer)
+        finally:
+            cap.release()
+        
+        print(
+            f"Extracted {timings.frames} frames in {timings.wall_seconds:.2f}s "
+            f"({timings.frames_per_second:.1f} fps, bottleneck: {timings.bottleneck})"
+        )
+        if tracker is not None and tracker.redetections:
+            print(f"Smart crop: {tracker.redetections} frames re-detected on the full frame")
+        
+        inferred_mask = np.array([keypoints is not None for keypoints in all_keypoints], dtype=bool)
+        keypoints = np.zeros((len(all_keypoints), 17, 3), dtype=np.float32)
+        if inferred_mask.any():
+            keypoints[inferred_mask] = np.stack([k for k in all_keypoints if k is not None])
+        if gate is not None:
+            print(f"Motion gate: skipped {gate.skipped}/{gate.frames} frames ({gate.skip_ratio:.1%})")
+            keypoints = interpolate_skipped(keypoints, inferred_mask, reader.frame_indices)
+        
+        if frame_range is not None and fps > 0:
+            duration_seconds = (reader.frames_read - reader.start) / fps
+        elif reader.truncated and fps > 0:
+            # Only the analyzed part of the video counts towards duration
+            duration_seconds = min(duration_seconds, reader.frames_read / fps)
         
         # Normalize keypoints relative to torso distance
-        normalized_keypoints = self._normalize_keypoints(all_keypoints)
+        normalized_keypoints = self._normalize_keypoints(keypoints)
         
-        return normalized_keypoints, duration_seconds
+        return ExtractionResult(
+            keypoints=normalized_keypoints,
+            duration_seconds=duration_seconds,
+            timings=timings,
+            timestamps=reader.timestamps,
+            frame_indices=reader.frame_indices,
+            source_range=(reader.start, reader.frames_read),
+            seam_thumbnails=(head_thumbnail, reader.last_thumbnail),
+            inferred_mask=inferred_mask.tolist()
+        )
     
-    def _preprocess_frame(self, frame: np.ndarray) -> tf.Tensor:
+    def warm_up(self, config: Optional[VideoProcessingConfig] = None) -> Dict[str, float]:
         """
-        Preprocess frame for MoveNet input.
+        Run dummy frames through the inference path used by extract().
+        
+        Traces the graph (or allocates interpreter tensors) and initializes
+        kernels for every batch size extraction will use, so the first real
+        request does not pay for it.
         
         Args:
-            frame: BGR image from OpenCV
+            config: Video processing config (defaults to global config)
             
         Returns:
-            Preprocessed tensor ready for MoveNet
+            Seconds spent per warmed path, e.g. {"batch_1": 0.8, "batch_8": 2.1}
         """
-        # Resize to model input size
-        img = cv2.resize(frame, (self.input_size, self.input_size))
+        config = config or get_video_config()
+        image = np.zeros((self.input_size, self.input_size, 3), dtype=np.uint8)
         
-        # Convert BGR to RGB
-        img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+        batch_sizes = {1}
+        if not config.use_smart_crop:
+            batch_sizes.add(max(1, config.inference_batch_size))
+        
+        timings = {}
+        for batch_size in sorted(batch_sizes):
+            start = time.perf_counter()
+            self._infer_batch([image] * batch_size, batch_size)
+            timings[f"batch_{batch_size}"] = time.perf_counter() - start
         
-        # Convert to tensor and add batch dimension
-        img = tf.cast(img, dtype=tf.int32)
-        img = tf.expand_dims(img, axis=0)
+        if config.use_smart_crop:
+            # Crop path: affine warp from a full-size frame, then single-frame inference
+            tracker = CropTracker(self.input_size, config.crop_min_keypoint_score, config.crop_redetect_score)
+            start = time.perf_counter()
+            self._infer_tracked(np.zeros((720, 1280, 3), dtype=np.uint8), tracker)
+            timings["smart_crop"] = time.perf_counter() - start
         
-        return img
+        return timings
     
-    def _normalize_keypoints(self, keypoints: List[List[List[float]]]) -> List[List[List[float]]]:
+    def extract_keypoints(self, video_path: str) -> Tuple[List[List[List[float]]], float]:
         """
-        Normalize keypoints relative to torso distance to handle different body sizes.
+        Extract pose keypoints from video using MoveNet.
         
         Args:
-            keypoints: Raw keypoints from MoveNet (17 keypoints)
+            video_path: Path to the input video file
             
         Returns:
-            Normalized keypoints
+            Tuple of (keypoints, duration_seconds)
+            keypoints: List[frame][joint][x, y, confidence]
+            duration_seconds: Video duration in seconds
         """
-        normalized = []
+        result = self.extract(video_path)
+        return result.keypoints.tolist(), result.duration_seconds
+    
+    def infer_frame(self, frame: np.ndarray, tracker: Optional[CropTracker] = None) -> np.ndarray:
+        """
+        Run pose estimation on a single frame (live ingestion).
         
-        # MoveNet keypoint indices:
-        # 5: left shoulder, 6: right shoulder, 11: left hip, 12: right hip
-        for frame_kpts in keypoints:
-            if len(frame_kpts) < 13:
-                # If not enough keypoints, return as-is
-                normalized.append(frame_kpts)
-                continue
+        Args:
+            frame: BGR frame from OpenCV
+            tracker: Crop tracker of the stream when smart crop is enabled
             
-            left_shoulder = np.array(frame_kpts[5][:2])
-            right_shoulder = np.array(frame_kpts[6][:2])
-            left_hip = np.array(frame_kpts[11][:2])
-            right_hip = np.array(frame_kpts[12][:2])
+        Returns:
+            Normalized keypoints of shape (17, 3) as (x, y, confidence), float32
+        """
+        if tracker is not None:
+            keypoints = self._infer_tracked(frame, tracker)
+        else:
+            keypoints = self._infer_batch([self._prepare_frame(frame)])[0]
+        return self._normalize_keypoints(keypoints[np.newaxis])[0]
+    
+    def _infer_batch(self, images: List[np.ndarray], batch_size: int = 1) -> np.ndarray:
+        """
+        Inference stage: run MoveNet on a batch of prepared frames.
+        
+        Args:
+            images: RGB frames from _prepare_frame, each (input_size, input_size, 3)
+            batch_size: Preferred frames per backend call
             
-            # Calculate torso center and length
-            shoulder_center = (left_shoulder + right_shoulder) / 2
-            hip_center = (left_hip + right_hip) / 2
-            torso_length = np.linalg.norm(shoulder_center - hip_center)
+        Returns:
+            Keypoints of shape (len(images), 17, 3) as (x, y, confidence), float32
+        """
+        # Raw backend output rows are (y, x, confidence)
+        raw = self.backend.infer(images, batch_size)
+        return self._to_xy(raw)
+    
+    def _infer_tracked(self, frame: np.ndarray, tracker: CropTracker) -> np.ndarray:
+        """
+        Inference stage with smart crop: run MoveNet on the tracked region of a frame.
+        
+        Args:
+            frame: BGR frame from OpenCV (full resolution)
+            tracker: Crop tracker carrying the region from the previous frame
             
-            # Avoid division by zero
-            if torso_length < 0.01:
-                torso_length = 1.0
+        Returns:
+            Keypoints of shape (17, 3) as (x, y, confidence) in frame-normalized coordinates
+        """
+        raw = tracker.track(frame, lambda image: self.backend.infer([image])[0])
+        return self._to_xy(raw)
+    
+    @staticmethod
+    def _to_xy(raw: np.ndarray) -> np.ndarray:
+        """Reorder raw MoveNet (y, x, confidence) rows to (x, y, confidence) float32."""
+        return np.asarray(raw, dtype=np.float32)[..., [1, 0, 2]]
+    
+    def _prepare_frame(self, frame: np.ndarray) -> np.ndarray:
+        """
+        Resize and color-convert a frame for MoveNet (without batch dimension).
+        
+        Args:
+            frame: BGR image from OpenCV
             
-            # Normalize all keypoints
-            normalized_frame = []
-            for kpt in frame_kpts:
-                x, y, conf = kpt
-                # Normalize relative to shoulder center and torso length
-                norm_x = (x - shoulder_center[0]) / torso_length
-                norm_y = (y - shoulder_center[1]) / torso_length
-                normalized_frame.append([norm_x, norm_y, conf])
+        Returns:
+            RGB uint8 image of shape (input_size, input_size, 3)
+        """
+        # Resize to model input size
+        img = cv2.resize(frame, (self.input_size, self.input_size))
+        
+        # Convert BGR to RGB
+        return cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+    
+    def _normalize_keypoints(self, keypoints: np.ndarray) -> np.ndarray:
+        """
+        Normalize keypoints relative to torso distance to handle different body sizes.
+        
+        Args:
+            keypoints: Raw keypoints from MoveNet, shape (N, 17, 3) as (x, y, confidence)
             
-            normalized.append(normalized_frame)
+        Returns:
+            Normalized keypoints, shape (N, 17, 3) float32 (confidence unchanged)
+        """
+        # MoveNet keypoint indices:
+        # 5: left shoulder, 6: right shoulder, 11: left hip, 12: right hip
+        xy = keypoints[:, :, :2]
+        shoulder_center = (xy[:, 5] + xy[:, 6]) / 2
+        hip_center = (xy[:, 11] + xy[:, 12]) / 2
+        torso_length = np.linalg.norm(shoulder_center - hip_center, axis=1)
+        
+        # Avoid division by zero
+        torso_length[torso_length < 0.01] = 1.0
         
+        # Normalize relative to shoulder center and torso length
+        normalized = np.empty_like(keypoints, dtype=np.float32)
+        normalized[:, :, :2] = (xy - shoulder_center[:, np.newaxis]) / torso_length[:, np.newaxis, np.newaxis]
+        normalized[:, :, 2] = keypoints[:, :, 2]
         return normalized
     
     def get_joint_names(self) -> List[str]:
@@ -179,16 +460,107 @@ class PoseModel:
         ]
 
 
-# Global model instance
-_pose_model: Optional[PoseModel] = None
+# Global model instances, keyed by variant name ("thunder", "lightning")
+_pose_models: Dict[str, PoseModel] = {}
+_pose_models_lock = threading.Lock()
+
+
+def load_model(variant: Optional[str] = None) -> PoseModel:
+    """
+    Load (once) and return the global pose model for a variant.
+    
+    Loading is thread-safe, but inference backends are not: threads that
+    run inference concurrently with extraction need their own PoseModel
+    (live streams use app.core.live.load_live_model).
+    
+    Args:
+        variant: MoveNet variant name (None = configured variant)
+        
+    Returns:
+        PoseModel for the variant
+    """
+    config = get_video_config()
+    variant = variant or config.get_model_variant()
+    with _pose_models_lock:
+        model = _pose_models.get(variant)
+        if model is None:
+            model = PoseModel(config.for_variant(variant))
+            _pose_models[variant] = model
+    return model
+
+
+def load_models() -> List[PoseModel]:
+    """Load the configured variant and every variant listed in warm_variants."""
+    return [load_model(variant) for variant in get_video_config().get_loaded_variants()]
+
 
+def warm_up_models() -> None:
+    """Load every configured variant and warm up its inference path."""
+    config = get_video_config()
+    for model in load_models():
+        timings = model.warm_up(config)
+        summary = ", ".join(f"{path} {seconds:.2f}s" for path, seconds in timings.items())
+        print(f"✓ Warmed up MoveNet {model.variant} ({model.backend.name}): {summary}")
 
-def load_model() -> PoseModel:
-    """Load and return the global pose model instance."""
-    global _pose_model
-    if _pose_model is None:
-        _pose_model = PoseModel()
-    return _pose_model
+
+def extract_video(
+    video_path: str,
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+    variant: Optional[str] = None
+) -> ExtractionResult:
+    """
+    Convenience function to run a full extraction with the global model.
+    
+    Args:
+        video_path: Path to video file
+        progress_callback: Optional (frames_processed, total_frames) callback
+        variant: MoveNet variant name (None = configured variant)
+        
+    Returns:
+        ExtractionResult with keypoints, duration, per-frame timestamps and timings
+    """
+    model = load_model(variant)
+    return model.extract(video_path, progress_callback=progress_callback)
+
+
+def extract_video_range(
+    video_path: str,
+    start: int,
+    stop: Optional[int],
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+    variant: Optional[str] = None
+) -> ExtractionResult:
+    """
+    Extract one source frame range of a video with the global model.
+    
+    Args:
+        video_path: Path to video file
+        start: First source frame of the range
+        stop: End of the range, exclusive (None = end of video)
+        progress_callback: Optional (frames_processed, total_frames) callback
+        variant: MoveNet variant name (None = configured variant)
+        
+    Returns:
+        ExtractionResult for the range (frame_indices/source_range are absolute)
+    """
+    model = load_model(variant)
+    return model.extract(video_path, progress_callback=progress_callback, frame_range=(start, stop))
+
+
+def probe_video(video_path: str) -> Tuple[int, float]:
+    """
+    Read frame count and frame rate from a video's container metadata.
+    
+    Returns:
+        Tuple of (frame_count, fps)
+    """
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        raise ValueError(f"Unable to open video file: {video_path}")
+    try:
+        return int(cap.get(cv2.CAP_PROP_FRAME_COUNT)), cap.get(cv2.CAP_PROP_FPS)
+    finally:
+        cap.release()
 
 
 def extract_keypoints(video_path: str) -> Tuple[List[List[List[float]]], float]:
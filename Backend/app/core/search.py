@@ -0,0 +1,418 @@
+"""
+One-vs-Many DTW Search
+Finds the stored sequences most similar to a query without running full DTW
+against every one of them.
+
+Each candidate passes a cascade of lower bounds of its DTW cost, cheapest
+first, and is dropped as soon as one of them shows it cannot enter the
+current top k:
+
+1. LB_Kim: distances of the first and of the last frames (every warping
+   path starts and ends there), computed for all candidates at once
+2. LB_Keogh, two-sided: distance of each query frame to the candidate's
+   per-dimension min/max envelope over the Sakoe-Chiba window (precomputed
+   per candidate) and of each candidate frame to the query's envelope
+3. Distance-only DTW, abandoned once its partial cost is out of the top k
+
+Ranking is by normalized distance (similarity), like run_dtw, and every
+bound is a bound of the normalized distance, so the top k is exact. LB_Kim
+only knows two cells of a path of up to n + m - 1, so it mostly orders the
+candidates; LB_Keogh knows a cost for every frame and accounts for how many
+cells each path length needs (see lb_keogh_normalized).
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from scipy.ndimage import maximum_filter1d, minimum_filter1d
+
+from app.core.metrics import run_dtw
+
+
+@dataclass
+class SearchStats:
+    """Where candidates left the cascade during one search."""
+
+    candidates: int = 0
+    pruned_kim: int = 0  # Dropped by LB_Kim
+    pruned_keogh: int = 0  # Dropped by LB_Keogh
+    infeasible: int = 0  # Length difference larger than the window (no warping path)
+    abandoned: int = 0  # DTW stopped early
+    dtw_completed: int = 0  # Full DTW distance computed
+    seconds: float = 0.0
+
+    @property
+    def pruning_rate(self) -> float:
+        """Fraction of feasible candidates dropped by a lower bound before DTW."""
+        feasible = self.candidates - self.infeasible
+        if feasible == 0:
+            return 0.0
+        return (self.pruned_kim + self.pruned_keogh) / feasible
+
+    def as_dict(self) -> dict:
+        """Return the statistics as a plain dictionary (for JSON)."""
+        return {
+            "candidates": self.candidates,
+            "pruned_kim": self.pruned_kim,
+            "pruned_keogh": self.pruned_keogh,
+            "infeasible": self.infeasible,
+            "abandoned": self.abandoned,
+            "dtw_completed": self.dtw_completed,
+            "pruning_rate": round(self.pruning_rate, 4),
+            "seconds": round(self.seconds, 4),
+        }
+
+
+def lb_kim(query: np.ndarray, first: np.ndarray, last: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """
+    LB_Kim of a query against many candidates.
+
+    Args:
+        query: Query sequence (n, d)
+        first: First frame of each candidate (k, d)
+        last: Last frame of each candidate (k, d)
+        lengths: Frame count of each candidate (k,)
+
+    Returns:
+        Lower bound of each candidate's DTW cost (k,)
+    """
+    bound = np.linalg.norm(first - query[0], axis=1)
+    # With a single frame on either side first and last cell coincide
+    distinct = (lengths > 1) & (len(query) > 1)
+    bound[distinct] += np.linalg.norm(last[distinct] - query[-1], axis=1)
+    return bound
+
+
+def keogh_envelope(sequence: np.ndarray, window: Optional[int]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Per-dimension min/max of a sequence over the Sakoe-Chiba window.
+
+    Row j covers frames [j - window, j + window] of the sequence. Rows run
+    up to m + window - 1, the last query frame a windowed path can reach.
+
+    Args:
+        sequence: Candidate sequence (m, d)
+        window: Window width (None = whole sequence, a single row)
+
+    Returns:
+        (lower, upper), each (m + window, d), or (1, d) without a window
+    """
+    if window is None:
+        return sequence.min(axis=0, keepdims=True), sequence.max(axis=0, keepdims=True)
+    # Repeating the last frame keeps the min/max of windows that run past the end
+    padded = np.concatenate([sequence, np.repeat(sequence[-1:], window, axis=0)])
+    size = 2 * window + 1
+    lower = minimum_filter1d(padded, size=size, axis=0, mode="nearest")
+    upper = maximum_filter1d(padded, size=size, axis=0, mode="nearest")
+    return lower, upper
+
+
+def keogh_excess(sequence: np.ndarray, lower: np.ndarray, upper: np.ndarray) -> np.ndarray:
+    """
+    Distance of each frame of a sequence to the other sequence's envelope.
+
+    Every frame is aligned to at least one frame of the other sequence inside
+    its window, which is no closer than the envelope box around it.
+
+    Args:
+        sequence: Sequence (n, d)
+        lower: Envelope lower bound of the other sequence from keogh_envelope
+        upper: Envelope upper bound of the other sequence from keogh_envelope
+
+    Returns:
+        Lower bound of the local cost of every cell of each frame (n,)
+    """
+    if len(lower) > 1:
+        lower, upper = lower[:len(sequence)], upper[:len(sequence)]
+    excess = np.maximum(sequence - upper, 0.0) + np.maximum(lower - sequence, 0.0)
+    return np.sqrt(np.einsum("ij,ij->i", excess, excess))
+
+
+def lb_keogh(query: np.ndarray, lower: np.ndarray, upper: np.ndarray) -> float:
+    """
+    LB_Keogh of a query against a candidate envelope.
+
+    Args:
+        query: Query sequence (n, d)
+        lower: Envelope lower bound from keogh_envelope
+        upper: Envelope upper bound from keogh_envelope
+
+    Returns:
+        Lower bound of the DTW cost
+    """
+    return float(keogh_excess(query, lower, upper).sum())
+
+
+def lb_keogh_normalized(query_excess: np.ndarray, candidate_excess: np.ndarray) -> float:
+    """
+    Two-sided LB_Keogh of the normalized DTW distance (cost per path cell).
+
+    Dividing a cost bound by the longest path (n + m - 1 cells) is valid but
+    loose, and dividing by the shortest (max(n, m)) is not a bound at all.
+    Counting cells instead: every cell of a warping path is the first cell of
+    its query frame, of its candidate frame, or of both (the start and every
+    diagonal step). With k cells of the last kind the path has n + m - k
+    cells and costs at least sum(e) + sum(f) minus the k overlaps, each at
+    most min(e_i, f_j), so shorter paths must pay for more of the excess.
+    The bound is the smallest ratio over all k.
+
+    Args:
+        query_excess: keogh_excess of the query against the candidate envelope (n,)
+        candidate_excess: keogh_excess of the candidate against the query envelope (m,)
+
+    Returns:
+        Lower bound of the normalized DTW distance
+    """
+    n, m = len(query_excess), len(candidate_excess)
+    k = min(n, m)
+    # Largest possible overlap of k cells: the k largest excesses on either side
+    overlap = np.minimum(
+        np.cumsum(-np.sort(-query_excess)[:k]),
+        np.cumsum(-np.sort(-candidate_excess)[:k])
+    )
+    cost = query_excess.sum() + candidate_excess.sum() - overlap
+    return float((cost / (n + m - np.arange(1, k + 1))).min())
+
+
+class DTWSearchIndex:
+    """Candidate feature matrices with their endpoints and LB_Keogh envelopes."""
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self._features: Dict[str, np.ndarray] = {}
+        self._envelopes: Dict[Tuple[str, Optional[int]], Tuple[np.ndarray, np.ndarray]] = {}
+        self._lock = threading.Lock()
+        self._revision: Optional[int] = None  # Store revision of the last refresh
+
+    def __len__(self) -> int:
+        return len(self._features)
+
+    def __contains__(self, candidate_id: str) -> bool:
+        return candidate_id in self._features
+
+    def ids(self) -> List[str]:
+        """IDs of the indexed candidates."""
+        return list(self._features)
+
+    def add(self, candidate_id: str, features: np.ndarray) -> None:
+        """
+        Add or replace a candidate.
+
+        Args:
+            candidate_id: Candidate identifier (session ID)
+            features: Feature matrix (m, d)
+        """
+        with self._lock:
+            self._features[candidate_id] = features
+            for key in [key for key in self._envelopes if key[0] == candidate_id]:
+                del self._envelopes[key]
+
+    def remove(self, candidate_id: str) -> bool:
+        """
+        Remove a candidate.
+
+        Args:
+            candidate_id: Candidate identifier
+
+        Returns:
+            True if it was indexed
+        """
+        with self._lock:
+            for key in [key for key in self._envelopes if key[0] == candidate_id]:
+                del self._envelopes[key]
+            return self._features.pop(candidate_id, None) is not None
+
+    def sync(self, candidate_ids: Iterable[str], load: Callable[[str], Optional[np.ndarray]]) -> None:
+        """
+        Make the index hold exactly the given candidates.
+
+        Args:
+            candidate_ids: IDs that should be indexed
+            load: Returns the feature matrix of a new ID (None = skip it)
+        """
+        wanted = set(candidate_ids)
+        for candidate_id in self.ids():
+            if candidate_id not in wanted:
+                self.remove(candidate_id)
+        for candidate_id in wanted:
+            if candidate_id not in self:
+                features = load(candidate_id)
+                if features is not None and len(features) > 0:
+                    self.add(candidate_id, features)
+
+    def refresh(
+        self,
+        revision: Optional[int],
+        list_ids: Callable[[], Iterable[str]],
+        load: Callable[[str], Optional[np.ndarray]]
+    ) -> None:
+        """
+        Sync with the session store unless it is unchanged since the last refresh.
+
+        Args:
+            revision: Store revision (SessionStorage.revision; None = unknown, always sync)
+            list_ids: Lists the IDs that should be indexed (only called when syncing)
+            load: Returns the feature matrix of a new ID (None = skip it)
+        """
+        if revision is not None and revision == self._revision:
+            return
+        self.sync(list_ids(), load)
+        self._revision = revision
+
+    def envelope(
+        self,
+        candidate_id: str,
+        window: Optional[int],
+        features: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        LB_Keogh envelope of a candidate for a window, computed once.
+
+        Args:
+            candidate_id: Candidate identifier
+            window: Window width (None = whole sequence)
+            features: The candidate's feature matrix from a search snapshot, so a
+                      concurrent remove cannot fail the lookup (None = current one)
+
+        Returns:
+            (lower, upper) from keogh_envelope
+        """
+        key = (candidate_id, window)
+        with self._lock:
+            envelope = self._envelopes.get(key)
+            if features is None:
+                features = self._features[candidate_id]
+        if envelope is None:
+            envelope = keogh_envelope(features, window)
+            with self._lock:
+                # Only cache it while the candidate is still indexed with these features
+                if self._features.get(candidate_id) is features:
+                    self._envelopes[key] = envelope
+        return envelope
+
+    def search(
+        self,
+        query: np.ndarray,
+        top_k: int = 5,
+        min_similarity: Optional[float] = None,
+        window_for_length: Optional[Callable[[int], Optional[int]]] = None,
+        exclude: Iterable[str] = ()
+    ) -> Tuple[List[Dict], SearchStats]:
+        """
+        Exact top-k candidates by DTW similarity to a query.
+
+        Args:
+            query: Query feature matrix (n, d)
+            top_k: Number of results
+            min_similarity: Drop candidates below this similarity (None = keep all)
+            window_for_length: Window size for the longer sequence length of each
+                               pair (e.g. DTWConfig.get_window_size; None = run_dtw default)
+            exclude: Candidate IDs to skip (e.g. the query's own session)
+
+        Returns:
+            (results sorted by similarity, highest first, each a run_dtw
+            distance-only result with "candidate_id"; cascade statistics)
+        """
+        start = time.perf_counter()
+        excluded = set(exclude)
+        with self._lock:
+            candidates = [(cid, f) for cid, f in self._features.items() if cid not in excluded]
+        stats = SearchStats(candidates=len(candidates))
+        if not candidates or len(query) == 0:
+            stats.seconds = time.perf_counter() - start
+            return [], stats
+
+        n = len(query)
+        lengths = np.array([len(features) for _, features in candidates])
+        path_limit = n + lengths - 1  # Longest possible warping path per candidate
+        kim = lb_kim(
+            query,
+            np.stack([features[0] for _, features in candidates]),
+            np.stack([features[-1] for _, features in candidates]),
+            lengths
+        ) / path_limit
+
+        max_normalized = np.inf
+        if min_similarity is not None and min_similarity > 0:
+            max_normalized = 1.0 / min_similarity - 1.0
+
+        kept: List[Tuple[float, int, Dict]] = []  # Sorted (normalized_distance, order, result)
+        query_envelopes: Dict[Optional[int], Tuple[np.ndarray, np.ndarray]] = {}
+        # Most promising candidates first, so the top-k bound tightens early
+        for order in np.argsort(kim, kind="stable"):
+            candidate_id, features = candidates[order]
+            m = lengths[order]
+            bound = max_normalized
+            if len(kept) >= top_k:
+                bound = min(bound, kept[-1][0])
+
+            # Checked first, so infeasible candidates never count as pruned
+            if window_for_length is not None:
+                window = window_for_length(max(n, m))
+            else:
+                window = int(0.15 * max(n, m)) if max(n, m) > 500 else None  # As run_dtw
+            if window is not None and abs(n - m) > window:
+                stats.infeasible += 1
+                continue
+
+            if kim[order] > bound:
+                stats.pruned_kim += 1
+                continue
+
+            if window not in query_envelopes:
+                query_envelopes[window] = keogh_envelope(query, window)
+            lower, upper = self.envelope(candidate_id, window, features)
+            query_lower, query_upper = query_envelopes[window]
+            if lb_keogh_normalized(
+                keogh_excess(query, lower, upper),
+                keogh_excess(features, query_lower, query_upper)
+            ) > bound:
+                stats.pruned_keogh += 1
+                continue
+
+            result = run_dtw(
+                features,
+                query,
+                window=window,
+                distance_only=True,
+                max_distance=bound * path_limit[order] if np.isfinite(bound) else None
+            )
+            if result["abandoned"]:
+                stats.abandoned += 1
+                continue
+            stats.dtw_completed += 1
+            if result["normalized_distance"] > bound:
+                continue
+
+            result["candidate_id"] = candidate_id
+            kept.append((result["normalized_distance"], int(order), result))
+            kept.sort(key=lambda item: (item[0], item[1]))
+            del kept[top_k:]
+
+        stats.seconds = time.perf_counter() - start
+        return [result for _, _, result in kept], stats
+
+
+# Global search indices, one per feature configuration
+_search_indices: Dict[Tuple[int, int], DTWSearchIndex] = {}
+
+
+def get_search_index(sample_rate: int = 1, smoothing_window: int = 1) -> DTWSearchIndex:
+    """
+    Get or create the search index for a feature configuration.
+
+    Args:
+        sample_rate: DTWConfig.frame_sample_rate of the indexed features
+        smoothing_window: DTWConfig.smoothing_window of the indexed features
+
+    Returns:
+        DTWSearchIndex
+    """
+    key = (sample_rate, smoothing_window)
+    index = _search_indices.get(key)
+    if index is None:
+        index = _search_indices.setdefault(key, DTWSearchIndex())
+    return index
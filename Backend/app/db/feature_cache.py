@@ -0,0 +1,140 @@
+"""
+Session Feature Matrix Cache
+Keeps the smoothed DTW feature matrix of each session so comparisons don't
+rebuild it from keypoints on every request.
+
+Matrices are keyed by (session, frame_sample_rate, smoothing_window,
+FEATURE_VERSION), stored as .npy files next to the session data and served
+from an in-memory LRU once loaded.
+"""
+
+import os
+import shutil
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from app.core.embedding import FEATURE_VERSION, keypoints_to_feature_matrix, temporal_smoothing
+from app.db.storage import get_storage
+
+
+class FeatureCache:
+    """Disk-backed LRU cache of per-session feature matrices."""
+
+    def __init__(self, cache_dir: str = "./session_data/features", max_entries: int = 128):
+        """
+        Initialize feature cache.
+
+        Args:
+            cache_dir: Directory holding one subdirectory of .npy files per session
+            max_entries: Feature matrices kept in memory
+        """
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self._memory: "OrderedDict[Tuple, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _get_session_dir(self, session_id: str) -> str:
+        """Get the directory of a session's feature files."""
+        return os.path.join(self.cache_dir, os.path.basename(session_id))
+
+    def _get_entry_path(self, session_id: str, sample_rate: int, smoothing_window: int) -> str:
+        """Get the file path of one feature matrix."""
+        filename = f"sr{sample_rate}_sw{smoothing_window}_v{FEATURE_VERSION}.npy"
+        return os.path.join(self._get_session_dir(session_id), filename)
+
+    def get_features(self, session: Dict, sample_rate: int = 1, smoothing_window: int = 1) -> np.ndarray:
+        """
+        Return the smoothed feature matrix of a session, computing it once.
+
+        Args:
+            session: Session data (needs "session_id" and "keypoints")
+            sample_rate: Use every Nth frame (DTWConfig.frame_sample_rate)
+            smoothing_window: Moving average window (DTWConfig.smoothing_window; 1 = none)
+
+        Returns:
+            Read-only feature matrix (n_sampled_frames, 42)
+        """
+        session_id = session["session_id"]
+        key = (session_id, sample_rate, smoothing_window, FEATURE_VERSION)
+
+        with self._lock:
+            features = self._memory.get(key)
+            if features is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return features
+
+        entry_path = self._get_entry_path(session_id, sample_rate, smoothing_window)
+        features = None
+        if os.path.exists(entry_path):
+            try:
+                features = np.load(entry_path)
+                self.disk_hits += 1
+            except (OSError, ValueError):
+                features = None
+
+        if features is None:
+            self.misses += 1
+            keypoints = np.array(session["keypoints"][::sample_rate], dtype=float)
+            features = temporal_smoothing(keypoints_to_feature_matrix(keypoints), window=smoothing_window)
+            self._save(entry_path, features)
+
+        features.flags.writeable = False
+        with self._lock:
+            self._memory[key] = features
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+        return features
+
+    def _save(self, entry_path: str, features: np.ndarray) -> None:
+        """Write a matrix atomically (temp file + rename)."""
+        os.makedirs(os.path.dirname(entry_path), exist_ok=True)
+        tmp_path = f"{entry_path}.{uuid.uuid4().hex}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                np.save(f, features)
+            os.replace(tmp_path, entry_path)
+        except OSError as e:
+            print(f"⚠ Could not persist feature matrix {entry_path}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def invalidate_session(self, session_id: str) -> int:
+        """
+        Drop every cached feature matrix of a session (call when it is deleted).
+
+        Args:
+            session_id: Session identifier
+
+        Returns:
+            Number of in-memory entries removed
+        """
+        with self._lock:
+            keys = [key for key in self._memory if key[0] == session_id]
+            for key in keys:
+                del self._memory[key]
+        session_dir = self._get_session_dir(session_id)
+        if os.path.isdir(session_dir):
+            shutil.rmtree(session_dir, ignore_errors=True)
+        return len(keys)
+
+
+# Global cache instance
+_feature_cache: Optional[FeatureCache] = None
+
+
+def get_feature_cache() -> FeatureCache:
+    """Get or create the global feature cache, stored next to the session data."""
+    global _feature_cache
+    if _feature_cache is None:
+        _feature_cache = FeatureCache(os.path.join(get_storage().storage_dir, "features"))
+    return _feature_cache
@@ -0,0 +1,137 @@
+"""
+Content-Addressed Keypoint Cache
+Maps uploaded video content (plus model and extraction settings) to the
+session that already holds its extracted keypoints.
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime
+from typing import Dict, Optional
+
+from app.core.config import MOVENET_VARIANTS, VideoProcessingConfig
+
+
+def _model_files_fingerprint(config: VideoProcessingConfig) -> str:
+    """Size and mtime of the local model file (changes when the model is replaced)."""
+    model_dir = MOVENET_VARIANTS[config.get_model_variant()]["model_dir"]
+    graph_path = os.path.join(model_dir, "saved_model.pb")
+    if config.inference_backend == "tflite":
+        graph_path = config.get_tflite_model_path()
+    if not os.path.exists(graph_path):
+        return "hub"
+    stat = os.stat(graph_path)
+    return f"{stat.st_size}:{int(stat.st_mtime)}"
+
+
+class KeypointCache:
+    """Local JSON file-based index from cache key to session ID."""
+
+    def __init__(self, cache_dir: str = "./keypoint_cache"):
+        """
+        Initialize keypoint cache.
+
+        Args:
+            cache_dir: Directory to store cache entry JSON files
+        """
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _get_entry_path(self, key: str) -> str:
+        """Get the file path for a cache entry."""
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    @staticmethod
+    def make_key(content_hash: str, config: VideoProcessingConfig) -> str:
+        """
+        Build the cache key for a video.
+
+        Args:
+            content_hash: SHA-256 hex digest of the uploaded file
+            config: Video processing config used for extraction
+
+        Returns:
+            SHA-256 hex digest over content, model identity and extraction settings
+        """
+        identity = {
+            "content": content_hash,
+            "model_files": _model_files_fingerprint(config),
+            "extraction": config.extraction_fingerprint(),
+        }
+        payload = json.dumps(identity, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def lookup(self, key: str) -> Optional[str]:
+        """
+        Return the session ID cached for a key.
+
+        Args:
+            key: Cache key from make_key
+
+        Returns:
+            Session ID or None if not cached
+        """
+        entry_path = self._get_entry_path(key)
+        if not os.path.exists(entry_path):
+            return None
+        try:
+            with open(entry_path, 'r') as f:
+                return json.load(f).get("session_id")
+        except Exception:
+            return None
+
+    def store(self, key: str, session_id: str, content_hash: str) -> None:
+        """
+        Record the session holding the extraction for a key.
+
+        Args:
+            key: Cache key from make_key
+            session_id: Session with the extracted keypoints
+            content_hash: SHA-256 of the video content (for reference)
+        """
+        entry: Dict = {
+            "session_id": session_id,
+            "content_hash": content_hash,
+            "timestamp": datetime.utcnow().isoformat()
+        }
+        with open(self._get_entry_path(key), 'w') as f:
+            json.dump(entry, f)
+
+    def invalidate(self, key: str) -> None:
+        """Remove a single cache entry."""
+        entry_path = self._get_entry_path(key)
+        if os.path.exists(entry_path):
+            os.remove(entry_path)
+
+    def invalidate_session(self, session_id: str) -> int:
+        """
+        Remove all cache entries pointing at a session.
+
+        Args:
+            session_id: Deleted session identifier
+
+        Returns:
+            Number of entries removed
+        """
+        removed = 0
+        for filename in os.listdir(self.cache_dir):
+            if not filename.endswith('.json'):
+                continue
+            key = filename[:-5]
+            if self.lookup(key) == session_id:
+                self.invalidate(key)
+                removed += 1
+        return removed
+
+
+# Global cache instance
+_keypoint_cache: Optional[KeypointCache] = None
+
+
+def get_keypoint_cache() -> KeypointCache:
+    """Get or create the global keypoint cache instance."""
+    global _keypoint_cache
+    if _keypoint_cache is None:
+        _keypoint_cache = KeypointCache()
+    return _keypoint_cache
@@ -5,6 +5,7 @@ Stores session metadata including keypoints and computed data.
 
 import json
 import os
+import time
 from typing import Dict, Optional, List
 from datetime import datetime
 import uuid
@@ -33,7 +34,9 @@ class SessionStorage:
         embedding: List[float],
         duration_seconds: float,
         video_path: Optional[str] = None,
-        user_id: Optional[str] = None
+        user_id: Optional[str] = None,
+        frame_timestamps: Optional[List[float]] = None,
+        inferred_mask: Optional[List[bool]] = None
     ) -> str:
         """
         Create a new session and store its data.
@@ -44,6 +47,8 @@ class SessionStorage:
             duration_seconds: Video duration
             video_path: Original video path
             user_id: Optional user identifier
+            frame_timestamps: Source time (seconds) of each keypoint frame
+            inferred_mask: Per frame, False where keypoints were interpolated
             
         Returns:
             Generated session_id
@@ -57,6 +62,8 @@ class SessionStorage:
             "video_path": video_path,
             "duration_seconds": duration_seconds,
             "keypoints": keypoints,
+            "frame_timestamps": frame_timestamps,
+            "inferred_mask": inferred_mask,
             "embedding": embedding,
             "step_segments": None  # Placeholder for future implementation
         }
@@ -158,6 +165,36 @@ class SessionStorage:
                         })
         
         return sessions
+    
+    def list_session_ids(self) -> List[str]:
+        """
+        List the IDs of all stored sessions without loading them.
+        
+        Returns:
+            List of session IDs
+        """
+        return [
+            filename[:-5]
+            for filename in os.listdir(self.storage_dir)
+            if filename.endswith('.json')
+        ]
+    
+    def revision(self) -> Optional[int]:
+        """
+        Token that changes whenever a session is added or deleted.
+        
+        Uses the storage directory's modification time, so it also sees
+        sessions written by other processes. A change within the same clock
+        tick would not move it, so a directory modified in the last two
+        seconds returns None (unknown).
+        
+        Returns:
+            Directory mtime in nanoseconds, or None if it may still change
+        """
+        mtime_ns = os.stat(self.storage_dir).st_mtime_ns
+        if time.time_ns() - mtime_ns < 2_000_000_000:
+            return None
+        return mtime_ns
 
 
 # Global storage instance
@@ -0,0 +1,259 @@
+"""
+Resumable Upload Store
+Keeps the partial state of chunked uploads on local disk so an interrupted
+upload can continue with the missing chunks instead of starting over.
+
+Each upload is a directory holding a meta.json and one file per received
+chunk. Chunks are written to a temporary file and renamed into place, so a
+chunk file only exists once it was received completely.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import time
+import uuid
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+import aiofiles
+
+from app.core.config import get_video_config
+
+
+CHUNK_PREFIX = "chunk_"
+
+
+class UploadError(ValueError):
+    """Invalid chunk or upload state (maps to HTTP 400/409)."""
+
+
+class UploadStore:
+    """Local file-based storage for in-progress resumable uploads."""
+
+    def __init__(self, upload_dir: str = "./resumable_uploads", expiry_seconds: float = 24 * 3600.0):
+        """
+        Initialize upload store.
+
+        Args:
+            upload_dir: Directory holding one subdirectory per upload
+            expiry_seconds: Uploads untouched for this long are removed
+        """
+        self.upload_dir = upload_dir
+        self.expiry_seconds = expiry_seconds
+        os.makedirs(upload_dir, exist_ok=True)
+
+    def _get_upload_path(self, upload_id: str) -> str:
+        """Get the directory of an upload (IDs are UUIDs, anything else is rejected)."""
+        try:
+            upload_id = str(uuid.UUID(upload_id))
+        except ValueError:
+            raise UploadError(f"Invalid upload ID: {upload_id}")
+        return os.path.join(self.upload_dir, upload_id)
+
+    def _get_chunk_path(self, upload_id: str, index: int) -> str:
+        """Get the file path of one chunk."""
+        return os.path.join(self._get_upload_path(upload_id), f"{CHUNK_PREFIX}{index:06d}")
+
+    def create(
+        self,
+        filename: str,
+        total_size: int,
+        chunk_size: int,
+        options: Optional[Dict] = None
+    ) -> Dict:
+        """
+        Register a new upload.
+
+        Args:
+            filename: Original filename of the video
+            total_size: Size of the complete file in bytes
+            chunk_size: Size of every chunk except the last
+            options: Extra request options to keep until finalize (model variant, preset)
+
+        Returns:
+            Upload metadata
+        """
+        self.prune()
+        upload_id = str(uuid.uuid4())
+        meta = {
+            "upload_id": upload_id,
+            "filename": filename,
+            "total_size": total_size,
+            "chunk_size": chunk_size,
+            "total_chunks": max(1, -(-total_size // chunk_size)),
+            "options": options or {},
+            "created_at": time.time(),
+        }
+        os.makedirs(self._get_upload_path(upload_id))
+        self._write_meta(meta)
+        return meta
+
+    def _write_meta(self, meta: Dict) -> None:
+        with open(os.path.join(self._get_upload_path(meta["upload_id"]), "meta.json"), 'w') as f:
+            json.dump(meta, f)
+
+    def get(self, upload_id: str) -> Optional[Dict]:
+        """
+        Return upload metadata.
+
+        Args:
+            upload_id: Upload identifier
+
+        Returns:
+            Metadata dict or None if unknown or expired
+        """
+        try:
+            meta_path = os.path.join(self._get_upload_path(upload_id), "meta.json")
+            with open(meta_path, 'r') as f:
+                return json.load(f)
+        except (UploadError, OSError, ValueError):
+            return None
+
+    def expected_chunk_size(self, meta: Dict, index: int) -> int:
+        """Exact byte size chunk `index` must have."""
+        if not 0 <= index < meta["total_chunks"]:
+            raise UploadError(f"Chunk index {index} out of range (0-{meta['total_chunks'] - 1})")
+        start = index * meta["chunk_size"]
+        return min(meta["chunk_size"], meta["total_size"] - start)
+
+    async def write_chunk(self, meta: Dict, index: int, body: AsyncIterator[bytes]) -> int:
+        """
+        Store one chunk from a stream of bytes.
+
+        Re-sending a chunk replaces it, so clients can simply retry.
+
+        Args:
+            meta: Upload metadata
+            index: Zero-based chunk number
+            body: Async iterator over the chunk's bytes
+
+        Returns:
+            Number of bytes stored
+        """
+        expected = self.expected_chunk_size(meta, index)
+        chunk_path = self._get_chunk_path(meta["upload_id"], index)
+        tmp_path = f"{chunk_path}.{uuid.uuid4().hex}.tmp"
+
+        written = 0
+        try:
+            async with aiofiles.open(tmp_path, "wb") as f:
+                async for data in body:
+                    written += len(data)
+                    if written > expected:
+                        raise UploadError(f"Chunk {index} exceeds its expected size of {expected} bytes")
+                    await f.write(data)
+            if written != expected:
+                raise UploadError(f"Chunk {index} has {written} bytes, expected {expected}")
+            os.replace(tmp_path, chunk_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        return written
+
+    def received_chunks(self, upload_id: str) -> List[int]:
+        """Sorted indices of the chunks stored so far."""
+        upload_path = self._get_upload_path(upload_id)
+        if not os.path.isdir(upload_path):
+            return []
+        return sorted(
+            int(name[len(CHUNK_PREFIX):])
+            for name in os.listdir(upload_path)
+            if name.startswith(CHUNK_PREFIX) and not name.endswith(".tmp")
+        )
+
+    def received_ranges(self, meta: Dict, chunks: List[int]) -> List[Tuple[int, int]]:
+        """
+        Merge received chunks into byte ranges.
+
+        Args:
+            meta: Upload metadata
+            chunks: Sorted received chunk indices
+
+        Returns:
+            List of [start, end) byte ranges
+        """
+        ranges: List[Tuple[int, int]] = []
+        for index in chunks:
+            start = index * meta["chunk_size"]
+            end = start + self.expected_chunk_size(meta, index)
+            if ranges and ranges[-1][1] == start:
+                ranges[-1] = (ranges[-1][0], end)
+            else:
+                ranges.append((start, end))
+        return ranges
+
+    async def assemble(self, meta: Dict, dest_path: str) -> str:
+        """
+        Concatenate all chunks into the final file, hashing it while it is written.
+
+        Args:
+            meta: Upload metadata
+            dest_path: Path of the assembled video
+
+        Returns:
+            SHA-256 hex digest of the assembled file
+        """
+        received = set(self.received_chunks(meta["upload_id"]))
+        missing = [i for i in range(meta["total_chunks"]) if i not in received]
+        if missing:
+            raise UploadError(f"Upload incomplete: {len(missing)} chunk(s) missing, first is {missing[0]}")
+
+        digest = hashlib.sha256()
+        try:
+            async with aiofiles.open(dest_path, "wb") as out:
+                for index in range(meta["total_chunks"]):
+                    async with aiofiles.open(self._get_chunk_path(meta["upload_id"], index), "rb") as f:
+                        data = await f.read()
+                    digest.update(data)
+                    await out.write(data)
+        except BaseException:
+            if os.path.exists(dest_path):
+                os.remove(dest_path)
+            raise
+        return digest.hexdigest()
+
+    def delete(self, upload_id: str) -> bool:
+        """
+        Remove an upload and its chunks.
+
+        Args:
+            upload_id: Upload identifier
+
+        Returns:
+            True if it existed
+        """
+        if self.get(upload_id) is None:
+            return False
+        shutil.rmtree(self._get_upload_path(upload_id), ignore_errors=True)
+        return True
+
+    def prune(self) -> int:
+        """
+        Remove uploads that were not touched within the expiry period.
+
+        Returns:
+            Number of uploads removed
+        """
+        cutoff = time.time() - self.expiry_seconds
+        removed = 0
+        for upload_id in os.listdir(self.upload_dir):
+            upload_path = os.path.join(self.upload_dir, upload_id)
+            if os.path.isdir(upload_path) and os.path.getmtime(upload_path) < cutoff:
+                shutil.rmtree(upload_path, ignore_errors=True)
+                removed += 1
+        return removed
+
+
+# Global upload store instance
+_upload_store: Optional[UploadStore] = None
+
+
+def get_upload_store() -> UploadStore:
+    """Get or create the global upload store instance."""
+    global _upload_store
+    if _upload_store is None:
+        _upload_store = UploadStore(
+            expiry_seconds=get_video_config().resumable_expiry_hours * 3600.0
+        )
+    return _upload_store
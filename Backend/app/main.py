@@ -1,13 +1,27 @@
 """
 AssemblyFlow Backend - Main Application Entry Point
 FastAPI application for motion analysis and pose comparison.
+
+The service role is chosen with the APP_ROLE environment variable:
+    all      - every endpoint (default)
+    ingest   - video upload / extraction endpoints and the pose model workers
+    compare  - comparison and session endpoints only; never imports the
+               ingest routers or starts pose model workers, so replicas
+               start quickly and stay small
 """
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
+import asyncio
+
+from app.core.config import get_app_role
+
 
-from app.api import process_video, compare, session
+# Service role of this process
+APP_ROLE = get_app_role()
+SERVES_INGEST = APP_ROLE in ("all", "ingest")
+SERVES_COMPARE = APP_ROLE in ("all", "compare")
 
 
 # Create FastAPI application
@@ -44,7 +58,8 @@ async def root():
     return {
         "status": "healthy",
         "service": "AssemblyFlow API",
-        "version": "1.0.0"
+        "version": "1.0.0",
+        "role": APP_ROLE
     }
 
 
@@ -79,24 +94,81 @@ async def health_check():
         )
 
 
-# Register API routers
-app.include_router(
-    process_video.router,
-    prefix="/api",
-    tags=["Process Video"]
-)
+@app.get("/ready", tags=["Health"])
+async def readiness_check():
+    """
+    Readiness probe for load balancers.
+    
+    Returns 503 until every extraction worker and the live ingestion model
+    in the API process have loaded and warmed up the pose model, so traffic
+    is never routed to a cold instance. Use /health for liveness.
+    Compare-only replicas have no model and are ready at once.
+    """
+    if not SERVES_INGEST:
+        return {"status": "ready", "role": APP_ROLE}
+    
+    from app.core.extraction_service import get_extraction_service
+    from app.core.live import live_models_ready, live_startup_error
+    
+    service = get_extraction_service()
+    if service.ready and live_models_ready():
+        return {"status": "ready", "extraction_workers": service.workers}
+    
+    content = {"status": "starting"}
+    error = service.startup_error or live_startup_error()
+    if error:
+        content = {"status": "failed", "error": error}
+    return JSONResponse(status_code=503, content=content)
 
-app.include_router(
-    compare.router,
-    prefix="/api",
-    tags=["Compare Sessions"]
-)
 
-app.include_router(
-    session.router,
-    prefix="/api",
-    tags=["Session Management"]
-)
+# Register API routers (imported per role so compare replicas skip the ingest stack)
+if SERVES_INGEST:
+    from app.api import process_video, jobs, uploads, live
+    
+    app.include_router(
+        process_video.router,
+        prefix="/api",
+        tags=["Process Video"]
+    )
+    
+    app.include_router(
+        jobs.router,
+        prefix="/api",
+        tags=["Processing Jobs"]
+    )
+    
+    app.include_router(
+        uploads.router,
+        prefix="/api",
+        tags=["Resumable Uploads"]
+    )
+    
+    app.include_router(
+        live.router,
+        prefix="/api",
+        tags=["Live Ingestion"]
+    )
+
+if SERVES_COMPARE:
+    from app.api import compare, session, search
+    
+    app.include_router(
+        compare.router,
+        prefix="/api",
+        tags=["Compare Sessions"]
+    )
+    
+    app.include_router(
+        search.router,
+        prefix="/api",
+        tags=["Similarity Search"]
+    )
+    
+    app.include_router(
+        session.router,
+        prefix="/api",
+        tags=["Session Management"]
+    )
 
 
 # Exception handlers
@@ -112,18 +184,43 @@ async def global_exception_handler(request, exc):
     )
 
 
+# Background warm-up of the extraction workers (kept referenced until done)
+_warmup_task = None
+
+
+async def _start_extraction_workers():
+    """Load and warm up the pose model in every worker and for live streams; /ready flips when done."""
+    from app.core.extraction_service import get_extraction_service
+    from app.core.live import get_live_executor, warm_up_live_models
+    
+    print("Loading pose estimation model...")
+    loop = asyncio.get_running_loop()
+    try:
+        await asyncio.gather(
+            get_extraction_service().start(),
+            loop.run_in_executor(get_live_executor(), warm_up_live_models)
+        )
+    except Exception as e:
+        print(f"✗ Pose model warm-up failed: {e}")
+        return
+    print("✓ Pose model loaded and warmed up")
+    print("\n🚀 AssemblyFlow API is ready!")
+
+
 # Startup event
 @app.on_event("startup")
 async def startup_event():
     """Initialize services on application startup."""
-    from app.core.pose_model import load_model
+    global _warmup_task
     from app.db.vector_db import get_vector_db
     from app.db.storage import get_storage
     
-    # Initialize pose model
-    print("Loading pose estimation model...")
-    load_model()
-    print("✓ Pose model loaded")
+    print(f"Starting AssemblyFlow API (role: {APP_ROLE})")
+    
+    # Start extraction workers in the background (each loads and warms up
+    # its own pose model); /health answers meanwhile, /ready waits for it
+    if SERVES_INGEST:
+        _warmup_task = asyncio.create_task(_start_extraction_workers())
     
     # Initialize vector database
     print("Connecting to vector database...")
@@ -135,7 +232,8 @@ async def startup_event():
     storage = get_storage()
     print(f"✓ Session storage ready ({len(storage.list_sessions())} sessions)")
     
-    print("\n🚀 AssemblyFlow API is ready!")
+    if not SERVES_INGEST:
+        print("\n🚀 AssemblyFlow API is ready!")
 
 
 # Shutdown event
@@ -143,6 +241,14 @@ async def startup_event():
 async def shutdown_event():
     """Cleanup on application shutdown."""
     print("\n👋 Shutting down AssemblyFlow API...")
+    if not SERVES_INGEST:
+        return
+    
+    from app.core.extraction_service import get_extraction_service
+    
+    if _warmup_task is not None and not _warmup_task.done():
+        _warmup_task.cancel()
+    get_extraction_service().shutdown()
 
 
 if __name__ == "__main__":
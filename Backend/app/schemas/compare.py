@@ -3,7 +3,7 @@ Pydantic schemas for comparison endpoints.
 """
 
 from pydantic import BaseModel, Field
-from typing import List
+from typing import List, Optional
 
 
 class CompareRequest(BaseModel):
@@ -60,3 +60,45 @@ class CompareResponse(BaseModel):
                 ]
             }
         }
+
+
+class RankRequest(BaseModel):
+    """Request model for ranking candidate sessions against a reference."""
+    
+    session_id_reference: str = Field(..., description="Reference session ID")
+    candidate_session_ids: List[str] = Field(..., description="Session IDs to rank", min_length=1)
+    top_k: Optional[int] = Field(None, description="Return only the k most similar candidates", ge=1)
+    min_similarity: Optional[float] = Field(
+        None,
+        description="Drop candidates below this similarity (0-1)",
+        ge=0.0,
+        le=1.0
+    )
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "session_id_reference": "123e4567-e89b-12d3-a456-426614174000",
+                "candidate_session_ids": [
+                    "987f6543-e21c-45d6-b789-123456789abc",
+                    "456e7890-a12b-34c5-d678-901234567def"
+                ],
+                "top_k": 1
+            }
+        }
+
+
+class RankedSession(BaseModel):
+    """One candidate in a ranking."""
+    
+    session_id: str = Field(..., description="Candidate session ID")
+    similarity_score: float = Field(..., description="DTW similarity to the reference (0-1)", ge=0.0, le=1.0)
+    normalized_distance: float = Field(..., description="DTW distance divided by warping path length")
+
+
+class RankResponse(BaseModel):
+    """Response model for candidate rankings."""
+    
+    results: List[RankedSession] = Field(..., description="Candidates, most similar first")
+    evaluated: int = Field(..., description="Number of candidates compared")
+    abandoned: int = Field(..., description="Candidates whose alignment was stopped early as out of the ranking")
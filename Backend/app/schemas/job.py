@@ -0,0 +1,38 @@
+"""
+Pydantic schemas for asynchronous processing job endpoints.
+"""
+
+from pydantic import BaseModel, Field
+from typing import Optional
+
+from app.schemas.pose import ProcessVideoResponse
+
+
+class JobStatusResponse(BaseModel):
+    """Status of an asynchronous video processing job."""
+    
+    job_id: str = Field(..., description="Unique job identifier")
+    status: str = Field(..., description="queued, running, completed or failed")
+    filename: str = Field(..., description="Original upload filename")
+    frames_processed: int = Field(0, description="Frames run through pose extraction so far")
+    total_frames: Optional[int] = Field(None, description="Expected number of frames to process")
+    progress: float = Field(0.0, description="Fraction of frames processed (0-1)", ge=0.0, le=1.0)
+    result: Optional[ProcessVideoResponse] = Field(
+        None,
+        description="Processing result once the job has completed"
+    )
+    error: Optional[str] = Field(None, description="Error message if the job failed")
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "job_id": "5f0c6a8e-2b1d-4e3f-9a7b-1c2d3e4f5a6b",
+                "status": "running",
+                "filename": "assembly_step.mp4",
+                "frames_processed": 420,
+                "total_frames": 1800,
+                "progress": 0.233,
+                "result": None,
+                "error": None
+            }
+        }
@@ -14,6 +14,14 @@ class ProcessVideoResponse(BaseModel):
         ..., 
         description="Extracted keypoints: [frame][joint][x, y, confidence]"
     )
+    frame_timestamps: Optional[List[float]] = Field(
+        None,
+        description="Source video time in seconds of each keypoint frame"
+    )
+    inferred_mask: Optional[List[bool]] = Field(
+        None,
+        description="Per frame: true if keypoints were inferred, false if interpolated by the motion gate (null = all inferred)"
+    )
     embedding: List[float] = Field(..., description="Fixed-length embedding vector")
     step_segments: Optional[List] = Field(
         None, 
@@ -26,6 +34,7 @@ class ProcessVideoResponse(BaseModel):
             "example": {
                 "session_id": "123e4567-e89b-12d3-a456-426614174000",
                 "keypoints": [[[0.5, 0.5, 0.9], [0.6, 0.4, 0.95]]],
+                "frame_timestamps": [0.0],
                 "embedding": [0.1, 0.2, 0.3],
                 "step_segments": None,
                 "duration_seconds": 15.5
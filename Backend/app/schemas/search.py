@@ -0,0 +1,49 @@
+"""
+Pydantic schemas for the similarity search endpoint.
+"""
+
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+from app.schemas.compare import RankedSession
+
+
+class SearchRequest(BaseModel):
+    """Request model for finding the stored sessions most similar to one session."""
+    
+    session_id_query: str = Field(..., description="Session to search with (e.g. a user execution)")
+    top_k: int = Field(5, description="Number of results", ge=1, le=100)
+    min_similarity: Optional[float] = Field(
+        None,
+        description="Drop sessions below this similarity (0-1)",
+        ge=0.0,
+        le=1.0
+    )
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "session_id_query": "987f6543-e21c-45d6-b789-123456789abc",
+                "top_k": 5
+            }
+        }
+
+
+class SearchStatistics(BaseModel):
+    """Where candidates left the lower-bound cascade."""
+    
+    candidates: int = Field(..., description="Sessions considered")
+    pruned_kim: int = Field(..., description="Dropped by LB_Kim (first/last frame)")
+    pruned_keogh: int = Field(..., description="Dropped by LB_Keogh (window envelope)")
+    infeasible: int = Field(..., description="Length difference larger than the DTW window (no warping path; not counted as pruned)")
+    abandoned: int = Field(..., description="DTW stopped early")
+    dtw_completed: int = Field(..., description="Full DTW distances computed")
+    pruning_rate: float = Field(..., description="Fraction of feasible sessions (all but infeasible) dropped by LB_Kim or LB_Keogh")
+    seconds: float = Field(..., description="Search time")
+
+
+class SearchResponse(BaseModel):
+    """Response model for similarity search."""
+    
+    results: List[RankedSession] = Field(..., description="Most similar sessions first")
+    statistics: SearchStatistics = Field(..., description="Lower-bound cascade statistics")
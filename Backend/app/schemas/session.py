@@ -18,6 +18,14 @@ class SessionResponse(BaseModel):
         ..., 
         description="Extracted keypoints"
     )
+    frame_timestamps: Optional[List[float]] = Field(
+        None,
+        description="Source video time in seconds of each keypoint frame"
+    )
+    inferred_mask: Optional[List[bool]] = Field(
+        None,
+        description="Per frame: true if keypoints were inferred, false if interpolated by the motion gate (null = all inferred)"
+    )
     embedding: List[float] = Field(..., description="Computed embedding vector")
     step_segments: Optional[List] = Field(
         None, 
@@ -33,6 +41,7 @@ class SessionResponse(BaseModel):
                 "video_path": "/uploads/video.mp4",
                 "duration_seconds": 15.5,
                 "keypoints": [[[0.5, 0.5, 0.9]]],
+                "frame_timestamps": [0.0],
                 "embedding": [0.1, 0.2, 0.3],
                 "step_segments": None
             }
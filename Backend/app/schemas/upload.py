@@ -0,0 +1,54 @@
+"""
+Pydantic schemas for resumable upload endpoints.
+"""
+
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+
+class CreateUploadRequest(BaseModel):
+    """Request model to start a resumable upload."""
+    
+    filename: str = Field(..., description="Original video filename (extension must be a supported type)")
+    total_size: int = Field(..., description="Size of the complete file in bytes", gt=0)
+    chunk_size: Optional[int] = Field(
+        None,
+        description="Bytes per chunk (all but the last chunk); server default if omitted",
+        ge=64 * 1024,
+        le=64 * 1024 * 1024  # Chunks are held in memory while assembling
+    )
+    model_variant: Optional[str] = Field(None, description="MoveNet variant: 'thunder' or 'lightning'")
+    preset: Optional[str] = Field(None, description="DTW preset whose paired variant to use")
+    
+    class Config:
+        protected_namespaces = ()
+
+
+class UploadStatusResponse(BaseModel):
+    """State of a resumable upload."""
+    
+    upload_id: str = Field(..., description="Unique upload identifier")
+    filename: str = Field(..., description="Original video filename")
+    total_size: int = Field(..., description="Size of the complete file in bytes")
+    chunk_size: int = Field(..., description="Bytes per chunk (the last chunk may be shorter)")
+    total_chunks: int = Field(..., description="Number of chunks that make up the file")
+    received_bytes: int = Field(0, description="Bytes stored so far")
+    received_ranges: List[List[int]] = Field(
+        default_factory=list,
+        description="Stored byte ranges as [start, end) pairs"
+    )
+    missing_chunks: List[int] = Field(default_factory=list, description="Chunk indices still to send")
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "upload_id": "0b6f3c1e-9d2a-4c7b-8e5f-1a2b3c4d5e6f",
+                "filename": "line3_shift.mp4",
+                "total_size": 25165824,
+                "chunk_size": 8388608,
+                "total_chunks": 3,
+                "received_bytes": 16777216,
+                "received_ranges": [[0, 8388608], [16777216, 25165824]],
+                "missing_chunks": [1]
+            }
+        }
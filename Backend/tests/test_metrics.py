@@ -0,0 +1,46 @@
+"""
+Tests for the DTW engines in app.core.metrics.
+Run from Backend/ with: python -m pytest tests
+"""
+
+import tracemalloc
+
+import numpy as np
+
+from app.core.metrics import dtw_banded, dtw_distance_only, pairwise_distances
+
+
+def _sequences(n: int, m: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    A = np.cumsum(rng.normal(size=(n, 42)), axis=0)
+    B = A[np.sort(rng.integers(0, n, m))] + rng.normal(0, 0.3, (m, 42))
+    return A, B
+
+
+def test_distance_only_narrow_band_memory():
+    """Strips follow the band: a narrow window must not allocate near n x m."""
+    A, B = _sequences(4000, 4000)
+    pairwise_distances(A[:2], B[:2])  # Keep lazy imports out of the measurement
+
+    for window in (10, 100):
+        tracemalloc.start()
+        result = dtw_distance_only(A, B, window=window)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        # The full n x m float64 matrix alone would be 128 MB
+        assert peak < 8 * 1024 * 1024, (window, peak)
+        assert result["distance"] == dtw_banded(A, B, window)[0]
+
+
+def test_distance_only_matches_banded():
+    """Strip sizes do not change the result."""
+    for n, m, window in ((300, 280, 5), (250, 260, 40), (120, 90, 0), (200, 200, 1)):
+        if abs(n - m) > window:
+            n = m
+        A, B = _sequences(n, m, seed=n + m)
+        expected = dtw_banded(A, B, window)
+        for max_cells in (1, 5000, 1 << 20):
+            result = dtw_distance_only(A, B, window=window, max_cells=max_cells)
+            assert result["distance"] == expected[0]
+            assert result["path_length"] == len(expected[1])
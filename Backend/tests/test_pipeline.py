@@ -0,0 +1,91 @@
+"""
+Tests for chunked extraction (frame ranges and seam verification).
+Run from Backend/ with: python -m pytest tests
+"""
+
+import cv2
+import numpy as np
+import pytest
+
+from app.core.config import VideoProcessingConfig
+from app.core.inference_backends import InferenceBackend
+from app.core.pipeline import ChunkBoundaryError, FrameSampler, stitch_results
+from app.core.pose_model import PoseModel
+
+FRAMES = 90
+RANGES = [(0, 30), (30, 60), (60, None)]
+
+
+class _BrightnessBackend(InferenceBackend):
+    """Stand-in for MoveNet: keypoints follow the frame content, so frames are told apart."""
+
+    name = "test"
+
+    def __init__(self):
+        super().__init__(input_size=64)
+
+    def infer(self, images, batch_size=1):
+        keypoints = np.zeros((len(images), 17, 3), dtype=np.float32)
+        for k, image in enumerate(images):
+            keypoints[k, :, 0] = np.linspace(0.2, 0.8, 17)
+            keypoints[k, :, 1] = image.mean() / 255.0
+            keypoints[k, :, 2] = 1.0
+        return keypoints
+
+
+class _OffTargetCapture:
+    """Capture whose seeks land `error` frames early while reporting the requested position."""
+
+    def __init__(self, capture_class, path, error):
+        self._cap = capture_class(path)
+        self._error = error
+        self._requested = None
+
+    def set(self, prop, value):
+        if prop == cv2.CAP_PROP_POS_FRAMES:
+            self._requested = value
+            return self._cap.set(prop, max(0, value - self._error))
+        return self._cap.set(prop, value)
+
+    def get(self, prop):
+        if prop == cv2.CAP_PROP_POS_FRAMES and self._requested is not None:
+            return self._requested
+        return self._cap.get(prop)
+
+    def __getattr__(self, name):
+        return getattr(self._cap, name)
+
+
+@pytest.fixture
+def video_path(tmp_path):
+    path = str(tmp_path / "frames.avi")
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 30.0, (64, 64))
+    rng = np.random.default_rng(0)
+    for _ in range(FRAMES):
+        writer.write(rng.integers(0, 256, (64, 64, 3), dtype=np.uint8))
+    writer.release()
+    return path
+
+
+def _extract_chunked(video_path):
+    config = VideoProcessingConfig(use_smart_crop=False, use_motion_gate=False)
+    model = PoseModel(config, backend=_BrightnessBackend())
+    results = [model.extract(video_path, config, frame_range=frame_range) for frame_range in RANGES]
+    return model, config, stitch_results(results, RANGES, FrameSampler(30.0), FRAMES / 30.0, 0.0)
+
+
+def test_chunked_matches_sequential(video_path):
+    model, config, stitched = _extract_chunked(video_path)
+    sequential = model.extract(video_path, config)
+
+    assert stitched.frame_indices == sequential.frame_indices
+    assert stitched.timestamps == sequential.timestamps
+    np.testing.assert_array_equal(stitched.keypoints, sequential.keypoints)
+
+
+def test_off_target_seek_is_detected(video_path, monkeypatch):
+    capture_class = cv2.VideoCapture
+    monkeypatch.setattr(cv2, "VideoCapture", lambda path: _OffTargetCapture(capture_class, path, error=3))
+
+    with pytest.raises(ChunkBoundaryError):
+        _extract_chunked(video_path)
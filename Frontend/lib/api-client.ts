@@ -21,11 +21,26 @@ const apiClient: AxiosInstance = axios.create({
 export interface ProcessVideoResponse {
   session_id: string;
   keypoints: number[][][]; // [frame][joint][x, y, confidence]
+  frame_timestamps?: number[] | null; // source time (s) of each frame
+  inferred_mask?: boolean[] | null; // false where keypoints were interpolated (null = all inferred)
   embedding: number[];
   step_segments: null | any; // Placeholder
   duration_seconds: number;
 }
 
+export type JobStatus = 'queued' | 'running' | 'completed' | 'failed';
+
+export interface JobStatusResponse {
+  job_id: string;
+  status: JobStatus;
+  filename: string;
+  frames_processed: number;
+  total_frames: number | null;
+  progress: number; // 0-1 fraction of frames processed
+  result: ProcessVideoResponse | null;
+  error: string | null;
+}
+
 export interface CompareRequest {
   session_id_reference: string;
   session_id_user: string;
@@ -48,6 +63,8 @@ export interface SessionResponse {
   video_path: string | null;
   duration_seconds: number;
   keypoints: number[][][];
+  frame_timestamps?: number[] | null;
+  inferred_mask?: boolean[] | null;
   embedding: number[];
   step_segments: null | any;
 }
@@ -106,6 +123,75 @@ export const api = {
     return response.data;
   },
 
+  /**
+   * Upload a video as an asynchronous processing job (returns immediately)
+   * @param videoFile - Video file to process
+   * @param onProgress - Optional upload progress callback (0-100)
+   */
+  async submitVideoJob(
+    videoFile: File,
+    onProgress?: (progress: number) => void
+  ): Promise<JobStatusResponse> {
+    const formData = new FormData();
+    formData.append('video', videoFile);
+
+    const response = await apiClient.post<JobStatusResponse>(
+      '/api/jobs',
+      formData,
+      {
+        headers: {
+          'Content-Type': 'multipart/form-data',
+        },
+        onUploadProgress: (progressEvent) => {
+          if (onProgress && progressEvent.total) {
+            onProgress(Math.round((progressEvent.loaded * 100) / progressEvent.total));
+          }
+        },
+      }
+    );
+
+    return response.data;
+  },
+
+  /**
+   * Get status of a processing job
+   * @param jobId - Job ID returned by submitVideoJob
+   */
+  async getJob(jobId: string): Promise<JobStatusResponse> {
+    const response = await apiClient.get<JobStatusResponse>(`/api/jobs/${jobId}`);
+    return response.data;
+  },
+
+  /**
+   * Upload and process a video through the job API.
+   * Avoids holding one HTTP request open for the whole extraction, so
+   * multi-minute recordings do not hit request timeouts.
+   * @param videoFile - Video file to process
+   * @param onProgress - Optional overall progress callback (0-100):
+   *                     upload is reported as 0-50, extraction as 50-100
+   * @param pollIntervalMs - Job status polling interval
+   */
+  async processVideoJob(
+    videoFile: File,
+    onProgress?: (progress: number) => void,
+    pollIntervalMs = 1000
+  ): Promise<ProcessVideoResponse> {
+    let job = await this.submitVideoJob(videoFile, (progress) => {
+      onProgress?.(Math.round(progress / 2));
+    });
+
+    while (job.status !== 'completed' && job.status !== 'failed') {
+      await new Promise((resolve) => setTimeout(resolve, pollIntervalMs));
+      job = await this.getJob(job.job_id);
+      onProgress?.(50 + Math.round(job.progress * 50));
+    }
+
+    if (job.status === 'failed' || !job.result) {
+      throw new Error(job.error || 'Video processing failed');
+    }
+    return job.result;
+  },
+
   /**
    * Compare two sessions using DTW
    * @param referenceId - Reference session ID
@@ -36,7 +36,7 @@ export function useProcessVideo() {
     setState({ data: null, loading: true, error: null, progress: 0 });
 
     try {
-      const result = await api.processVideo(videoFile, (progress) => {
+      const result = await api.processVideoJob(videoFile, (progress) => {
         setState((prev) => ({ ...prev, progress }));
       });
 